@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmark drawing a large point layer with and without the rasterizer.
+
+Usage: bench_point_layer.py [-h] [-n <points>] [-r <repeats>] [-t (OSM|GMT)]
+
+Draws the same random map-relative point layer with the wx painter and
+then with the numpy rasterizer, and prints the average frame time for each.
+Needs numpy.
+"""
+
+
+import time
+import random
+import wx
+import pyslip
+
+
+######
+# Various benchmark constants
+######
+
+DefaultAppSize = (800, 600)
+
+InitViewLevel = 3
+InitViewPosition = (133.87, -23.7)      # Alice Springs
+
+DefaultNumPoints = 100000
+DefaultRepeats = 5
+
+
+################################################################################
+# The benchmark frame
+################################################################################
+
+class BenchFrame(wx.Frame):
+    def __init__(self, num_points, repeats):
+        wx.Frame.__init__(self, None, size=DefaultAppSize,
+                          title=('PySlip %s - point layer benchmark'
+                                 % pyslip.__version__))
+        self.panel = wx.Panel(self, wx.ID_ANY)
+
+        # create the tile source object
+        self.tile_src = Tiles.Tiles()
+
+        # build the GUI
+        box = wx.BoxSizer(wx.HORIZONTAL)
+        self.panel.SetSizer(box)
+        self.pyslip = pyslip.PySlip(self.panel, tile_src=self.tile_src)
+        box.Add(self.pyslip, proportion=1, border=1, flag=wx.EXPAND)
+        self.panel.SetSizerAndFit(box)
+        self.panel.Layout()
+        self.Centre()
+        self.Show(True)
+
+        self.num_points = num_points
+        self.repeats = repeats
+
+        # random points around Australia, a few different colours
+        colours = ['red', 'blue', (0, 255, 0, 128)]
+        points = [(random.uniform(110.0, 155.0),
+                   random.uniform(-45.0, -10.0),
+                   {'colour': random.choice(colours)})
+                  for _ in range(num_points)]
+        self.layer = self.pyslip.AddPointLayer(points, map_rel=True,
+                                               radius=2,
+                                               name='<bench_points>')
+
+        self.pyslip.GotoLevelAndPosition(InitViewLevel, InitViewPosition)
+
+        # run the benchmark once the frame is up
+        wx.CallLater(500, self.run)
+
+    def time_frames(self):
+        """Return the average time in seconds to draw a frame."""
+
+        self.pyslip.Update()        # warm up any caches
+        start = time.time()
+        for _ in range(self.repeats):
+            self.pyslip.Update()
+        return (time.time() - start) / self.repeats
+
+    def run(self):
+        """Time both point drawing methods and report."""
+
+        self.pyslip.SetLayerRaster(self.layer, False)
+        painter = self.time_frames()
+
+        self.pyslip.SetLayerRaster(self.layer, True)
+        raster = self.time_frames()
+
+        print('%d points, %d frames each' % (self.num_points, self.repeats))
+        print('  wx painter:  %8.3f s/frame' % painter)
+        print('  rasterizer:  %8.3f s/frame' % raster)
+        print('  speedup:     %8.1f' % (painter / raster))
+
+        self.Close()
+
+################################################################################
+
+if __name__ == '__main__':
+    import sys
+    import getopt
+    import traceback
+
+    # print some usage information
+    def usage(msg=None):
+        if msg:
+            print(msg+'\n')
+        print(__doc__)        # module docstring used
+
+    # our own handler for uncaught exceptions
+    def excepthook(type, value, tb):
+        msg = '\n' + '=' * 80
+        msg += '\nUncaught exception:\n'
+        msg += ''.join(traceback.format_exception(type, value, tb))
+        msg += '=' * 80 + '\n'
+        print msg
+        sys.exit(1)
+
+    # plug our handler into the python system
+    sys.excepthook = excepthook
+
+    # decide which tiles to use, default is GMT
+    argv = sys.argv[1:]
+
+    try:
+        (opts, args) = getopt.getopt(argv, 'hn:r:t:',
+                                     ['help', 'points=', 'repeats=', 'tiles='])
+    except getopt.error:
+        usage()
+        sys.exit(1)
+
+    num_points = DefaultNumPoints
+    repeats = DefaultRepeats
+    tile_source = 'GMT'
+    for (opt, param) in opts:
+        if opt in ['-h', '--help']:
+            usage()
+            sys.exit(0)
+        elif opt in ('-n', '--points'):
+            num_points = int(param)
+        elif opt in ('-r', '--repeats'):
+            repeats = int(param)
+        elif opt in ('-t', '--tiles'):
+            tile_source = param
+    tile_source = tile_source.lower()
+
+    # set up the appropriate tile source
+    if tile_source == 'gmt':
+        import pyslip.gmt_local_tiles as Tiles
+    elif tile_source == 'osm':
+        import pyslip.osm_tiles as Tiles
+    else:
+        usage('Bad tile source: %s' % tile_source)
+        sys.exit(3)
+
+    # start wxPython app
+    app = wx.App()
+    BenchFrame(num_points, repeats).Show()
+    app.MainLoop()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+"""
+Test the pySlip vectorized geometry routines.
+
+The results are checked against the pure python versions.
+"""
+
+
+import random
+import unittest
+
+import numpy as np
+
+import pyslip.geometry as geometry
+import pyslip.point_segment_distance as psd
+
+
+def point_inside_polygon(point, poly):
+    """The pure python crossing number test from pySlip."""
+
+    (x, y) = point
+
+    l_poly = list(poly)
+    l_poly.append(l_poly[0])
+
+    inside = False
+
+    (p1x, p1y) = l_poly[0]
+
+    for (p2x, p2y) in l_poly:
+        if y > min(p1y, p2y):
+            if y <= max(p1y, p2y):
+                if x <= max(p1x, p2x):
+                    if p1y != p2y:
+                        xinters = (y-p1y)*(p2x-p1x)/float(p2y-p1y) + p1x
+                    if p1x == p2x or x <= xinters:
+                        inside = not inside
+        (p1x, p1y) = (p2x, p2y)
+
+    return inside
+
+
+class TestGeometry(unittest.TestCase):
+
+    def test_square(self):
+        """Points inside and outside a simple square."""
+
+        xs = np.array([0.0, 10.0, 10.0, 0.0])
+        ys = np.array([0.0, 0.0, 10.0, 10.0])
+        self.assertTrue(geometry.point_in_polygon(5, 5, xs, ys))
+        self.assertFalse(geometry.point_in_polygon(15, 5, xs, ys))
+        self.assertFalse(geometry.point_in_polygon(5, -5, xs, ys))
+        self.assertFalse(geometry.point_in_polygon(-1, 5, xs, ys))
+
+    def test_random_polygons(self):
+        """Random star shaped polygons against the python version."""
+
+        rand = random.Random(1)
+        for _ in range(200):
+            num = rand.randint(3, 30)
+            angles = sorted([rand.uniform(0, 6.283) for _ in range(num)])
+            poly = []
+            for a in angles:
+                r = rand.uniform(1, 10)
+                poly.append((r*np.cos(a), r*np.sin(a)))
+            xs = np.array([p[0] for p in poly])
+            ys = np.array([p[1] for p in poly])
+
+            for _ in range(20):
+                pt = (rand.uniform(-12, 12), rand.uniform(-12, 12))
+                expected = point_inside_polygon(pt, poly)
+                result = geometry.point_in_polygon(pt[0], pt[1], xs, ys)
+                self.assertEqual(result, expected)
+
+    def test_segment_distances(self):
+        """Random segments against point_segment_distance()."""
+
+        rand = random.Random(2)
+        segs = []
+        for _ in range(1000):
+            segs.append(((rand.uniform(-10, 10), rand.uniform(-10, 10)),
+                         (rand.uniform(-10, 10), rand.uniform(-10, 10))))
+        x1 = np.array([s[0][0] for s in segs])
+        y1 = np.array([s[0][1] for s in segs])
+        x2 = np.array([s[1][0] for s in segs])
+        y2 = np.array([s[1][1] for s in segs])
+
+        for _ in range(20):
+            pt = (rand.uniform(-12, 12), rand.uniform(-12, 12))
+            result = geometry.point_segment_distances(pt[0], pt[1],
+                                                      x1, y1, x2, y2)
+            for (i, (s1, s2)) in enumerate(segs):
+                expected = psd.point_segment_distance(pt, s1, s2)
+                self.assertAlmostEqual(result[i], expected, places=9)
+
+    def test_zero_length_segment(self):
+        """A zero length segment is treated as a point."""
+
+        zero = np.array([1.0])
+        result = geometry.point_segment_distances(4, 5, zero, zero, zero, zero)
+        self.assertAlmostEqual(result[0], 25.0)
+
+
+if __name__ == '__main__':
+    suite = unittest.makeSuite(TestGeometry,'test')
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
@@ -12,6 +12,7 @@ import os
 import glob
 import pickle
 import wx
+import numpy
 import pyslip.gmt_local_tiles as tiles
 
 import unittest
@@ -67,6 +68,26 @@ class TestGMTTiles(unittest.TestCase):
                         msg = "Can't find tile (%d,%d,%d)!?" % (level, x, y)
                         self.failIf(bmp is None, msg)
 
+    def testArrays(self):
+        """Check array conversions against the point conversions."""
+
+        cache = tiles.Tiles()
+        level = cache.levels[0]
+        cache.UseLevel(level)
+
+        xgeo = numpy.linspace(-60.0, 170.0, 101)
+        ygeo = numpy.linspace(-60.0, 60.0, 101)
+        (xtile, ytile) = cache.Geo2TileArray(xgeo, ygeo)
+        for (i, geo) in enumerate(zip(xgeo, ygeo)):
+            (xt, yt) = cache.Geo2Tile(geo)
+            self.assertAlmostEqual(xtile[i], xt)
+            self.assertAlmostEqual(ytile[i], yt)
+
+        (xback, yback) = cache.Tile2GeoArray(xtile, ytile)
+        for i in range(len(xgeo)):
+            self.assertAlmostEqual(xback[i], xgeo[i])
+            self.assertAlmostEqual(yback[i], ygeo[i])
+
     def testErrors(self):
         """Test possible errors."""
 
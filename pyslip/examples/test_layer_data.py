@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test converting user layer data into pySlip draw data.
+
+Requires a wxPython application to be created before use, and the GMT
+tiles in the 'gmt_tiles' directory.
+"""
+
+import unittest
+
+import numpy
+import wx
+import pyslip
+import pyslip.gmt_local_tiles as tiles
+
+
+DefaultAppSize = (512, 512)
+
+
+class TestLayerData(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = wx.Frame(None, size=DefaultAppSize)
+        self.tile_src = tiles.Tiles()
+        self.pyslip = pyslip.PySlip(self.frame, tile_src=self.tile_src)
+
+    def tearDown(self):
+        self.frame.Destroy()
+
+    def testColumnarIntUserData(self):
+        """Per-point user data given as an int numpy array."""
+
+        num = 10
+        points = {'x': numpy.linspace(100.0, 150.0, num),
+                  'y': numpy.linspace(-40.0, -10.0, num),
+                  'data': numpy.arange(num)}
+        id = self.pyslip.AddPointLayer(points, name='<columnar>')
+
+        layer = self.pyslip.layer_mapping[id]
+        self.assertEqual([p[6] for p in layer.data], list(range(num)))
+
+        # replace with one user data value changed
+        points['data'] = numpy.arange(num)
+        points['data'][3] = 99
+        self.pyslip.ReplaceLayerData(id, points)
+
+        layer = self.pyslip.layer_mapping[id]
+        expected = list(range(num))
+        expected[3] = 99
+        self.assertEqual([p[6] for p in layer.data], expected)
+
+    def testColumnarChangedObjects(self):
+        """Compare columnar point data with int user data arrays."""
+
+        num = 5
+        old = {'x': numpy.arange(num, dtype=float),
+               'y': numpy.arange(num, dtype=float),
+               'data': numpy.arange(num)}
+        new = dict(old, data=numpy.array([0, 1, 7, 3, 4]))
+        defaults = {}
+
+        old_data = self.pyslip._point_layer_data(old, True, defaults)
+        new_data = self.pyslip._point_layer_data(new, True, defaults)
+        self.assertEqual(self.pyslip._changed_objects(old_data, new_data), [2])
+        self.assertEqual(self.pyslip._changed_objects(old_data, old_data), [])
+
+    def testListColour(self):
+        """Colours given as lists are accepted and share styles."""
+
+        red_list = [255, 0, 0, 255]
+        red_tuple = (255, 0, 0, 255)
+        points = [(140.0, -30.0, {'colour': red_list}),
+                  (141.0, -31.0, {'colour': red_tuple})]
+        id = self.pyslip.AddPointLayer(points, colour=[0, 0, 255, 255],
+                                       name='<list colour>')
+        layer = self.pyslip.layer_mapping[id]
+        self.assertEqual(layer.data[0][3], layer.data[1][3])
+
+        polygons = [(((140.0, -30.0), (141.0, -30.0), (141.0, -31.0)),
+                     {'colour': red_list, 'fillcolour': [0, 255, 0, 128],
+                      'filled': True})]
+        self.pyslip.AddPolygonLayer(polygons, name='<list colour polygon>')
+
+        columns = {'x': numpy.array([140.0, 141.0]),
+                   'y': numpy.array([-30.0, -31.0]),
+                   'colour': [red_list, red_tuple]}
+        id = self.pyslip.AddPointLayer(columns, name='<list colour columns>')
+        layer = self.pyslip.layer_mapping[id]
+        self.assertEqual(layer.data[0][3], layer.data[1][3])
+
+    def testColumnarPlacement(self):
+        """Columnar placements accept the values list data accepts."""
+
+        places = ['CC', None, False, 'nw']
+        points = [(140.0, -30.0, {'placement': p}) for p in places]
+        self.pyslip.AddPointLayer(points, name='<list placement>')
+
+        columns = {'x': numpy.array([140.0]*4),
+                   'y': numpy.array([-30.0]*4),
+                   'placement': places}
+        id = self.pyslip.AddPointLayer(columns, name='<columnar placement>')
+        layer = self.pyslip.layer_mapping[id]
+        self.assertEqual([p[2] for p in layer.data], ['cc', '', '', 'nw'])
+
+        columns['placement'] = ['cc', 1.5, 'nw', 'cc']
+        self.assertRaises(Exception, self.pyslip.AddPointLayer, columns)
+
+    def testHoverColumnarPolygon(self):
+        """Hovering twice over one columnar polygon raises one event."""
+
+        (x, y) = self.pyslip.View2Geo((DefaultAppSize[0]//2,
+                                       DefaultAppSize[1]//2))
+        vertices = numpy.array([(x-5.0, y-5.0), (x+5.0, y-5.0),
+                                (x+5.0, y+5.0), (x-5.0, y+5.0)])
+        polygons = {'vertices': vertices,
+                    'offsets': numpy.array([0, 4]),
+                    'filled': True}
+        id = self.pyslip.AddPolygonLayer(polygons, selectable=True,
+                                         name='<columnar polygon>')
+
+        events = []
+        self.pyslip.Bind(pyslip.EVT_PYSLIP_HOVER,
+                         lambda event: events.append(event.layer_id))
+        self.pyslip.SetHoverEvent(True)
+
+        self.pyslip.hover_posn = self.pyslip.Geo2View((x, y))
+        self.pyslip._hover()
+        self.pyslip.hover_posn = self.pyslip.Geo2View((x+1.0, y))
+        self.pyslip._hover()
+        self.assertEqual(events, [id])
+
+        self.pyslip.hover_posn = self.pyslip.Geo2View((x+20.0, y))
+        self.pyslip._hover()
+        self.assertEqual(events, [id, None])
+
+
+if __name__ == '__main__':
+    app = wx.App()
+    suite = unittest.makeSuite(TestLayerData,'test')
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
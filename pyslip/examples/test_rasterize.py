@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test the pySlip numpy point rasterizer.
+
+The rasterizer output is checked against blending the points into the
+pixel buffer one at a time.
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+import pyslip
+
+
+def rasterize_slowly(job):
+    """Blend each point of a single style over the buffer in turn."""
+
+    width = job['width']
+    height = job['height']
+    buff = np.zeros((height, width, 4), dtype=np.float64)
+
+    for (x, y, style) in zip(job['x'], job['y'], job['style']):
+        (radius, rgba) = job['styles'][style]
+        (r, g, b, a) = [v / 255.0 for v in rgba]
+        src = np.array([r*a, g*a, b*a, a])
+        for dy in range(-radius, radius+1):
+            for dx in range(-radius, radius+1):
+                if dx*dx + dy*dy > radius*radius + radius:
+                    continue
+                (tx, ty) = (x + dx, y + dy)
+                if 0 <= tx < width and 0 <= ty < height:
+                    buff[ty, tx] = src + buff[ty, tx]*(1.0 - a)
+
+    alpha = buff[:,:,3:]
+    rgb = buff[:,:,:3] / np.maximum(alpha, 1.0e-6)
+    out = np.concatenate((rgb, alpha), axis=2)
+    return np.clip(out*255.0 + 0.5, 0, 255).astype(np.uint8)
+
+
+class TestRasterize(unittest.TestCase):
+
+    def make_job(self, points, radius, rgba):
+        """Make a rasterizer job for points of one style."""
+
+        return {'width': 20, 'height': 20,
+                'x': np.array([p[0] for p in points], dtype=np.int64),
+                'y': np.array([p[1] for p in points], dtype=np.int64),
+                'style': np.zeros(len(points), dtype=np.int32),
+                'styles': {0: (radius, rgba)}}
+
+    def test_same_place(self):
+        """Translucent points at one place build up alpha."""
+
+        job = self.make_job([(10, 10)]*3, 2, (255, 0, 0, 128))
+        pixels = pyslip.PySlip._rasterize_points(job)
+
+        a = 128 / 255.0
+        expected = int((1.0 - (1.0 - a)**3)*255.0 + 0.5)
+        self.assertEqual(pixels[10, 10, 3], expected)
+        self.assertEqual(pixels[10, 10, 0], 255)
+
+    def test_overlapping(self):
+        """Random overlapping points against one at a time blending."""
+
+        rand = random.Random(1)
+        for alpha in (40, 128, 255):
+            points = [(rand.randint(-2, 21), rand.randint(-2, 21))
+                      for _ in range(100)]
+            job = self.make_job(points, 3, (20, 200, 90, alpha))
+            pixels = pyslip.PySlip._rasterize_points(job)
+            expected = rasterize_slowly(job)
+            self.assertTrue(np.abs(pixels.astype(int)
+                                   - expected.astype(int)).max() <= 1)
+
+
+if __name__ == '__main__':
+    suite = unittest.makeSuite(TestRasterize,'test')
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+"""
+Test the pySlip spatial index.
+
+The index results are checked against a brute force search.
+"""
+
+
+import random
+import unittest
+
+import pyslip.spatial_index as spatial_index
+
+
+class TestGridIndex(unittest.TestCase):
+
+    def brute_force(self, bboxes, minx, maxx, miny, maxy):
+        """Find overlapping bounding boxes the slow way."""
+
+        result = []
+        for (i, (bminx, bmaxx, bminy, bmaxy)) in enumerate(bboxes):
+            if bminx <= maxx and minx <= bmaxx and bminy <= maxy and miny <= bmaxy:
+                result.append(i)
+        return result
+
+    def test_empty(self):
+        """An empty index finds nothing."""
+
+        index = spatial_index.GridIndex([])
+        self.assertEqual(index.query(-180, 180, -90, 90), [])
+        self.assertEqual(len(index), 0)
+
+    def test_points(self):
+        """Query random points with random boxes."""
+
+        rand = random.Random(1)
+        bboxes = []
+        for _ in range(5000):
+            x = rand.uniform(-180, 180)
+            y = rand.uniform(-90, 90)
+            bboxes.append((x, x, y, y))
+        index = spatial_index.GridIndex(bboxes)
+
+        for _ in range(100):
+            minx = rand.uniform(-200, 200)
+            maxx = minx + rand.uniform(0, 50)
+            miny = rand.uniform(-100, 100)
+            maxy = miny + rand.uniform(0, 25)
+            expected = self.brute_force(bboxes, minx, maxx, miny, maxy)
+            self.assertEqual(index.query(minx, maxx, miny, maxy), expected)
+
+    def test_boxes(self):
+        """Query boxes of mixed sizes, including some covering everything."""
+
+        rand = random.Random(2)
+        bboxes = []
+        for _ in range(2000):
+            x = rand.uniform(-180, 180)
+            y = rand.uniform(-90, 90)
+            size = rand.choice((0.1, 1.0, 10.0, 300.0))
+            bboxes.append((x, x+size, y, y+size/2))
+        index = spatial_index.GridIndex(bboxes)
+
+        for _ in range(100):
+            minx = rand.uniform(-200, 200)
+            maxx = minx + rand.uniform(0, 100)
+            miny = rand.uniform(-100, 100)
+            maxy = miny + rand.uniform(0, 50)
+            expected = self.brute_force(bboxes, minx, maxx, miny, maxy)
+            self.assertEqual(index.query(minx, maxx, miny, maxy), expected)
+
+        # query the whole world
+        expected = list(range(len(bboxes)))
+        self.assertEqual(index.query(-1000, 1000, -1000, 1000), expected)
+
+    def test_update(self):
+        """Move items about and query again."""
+
+        rand = random.Random(3)
+        bboxes = []
+        for _ in range(1000):
+            x = rand.uniform(-180, 180)
+            y = rand.uniform(-90, 90)
+            bboxes.append((x, x, y, y))
+        index = spatial_index.GridIndex(bboxes)
+
+        for _ in range(500):
+            item = rand.randrange(len(bboxes))
+            x = rand.uniform(-250, 250)
+            y = rand.uniform(-120, 120)
+            size = rand.choice((0.0, 1.0, 200.0))
+            bboxes[item] = (x, x+size, y, y+size)
+            index.update(item, bboxes[item])
+
+        for _ in range(100):
+            minx = rand.uniform(-260, 260)
+            maxx = minx + rand.uniform(0, 50)
+            miny = rand.uniform(-130, 130)
+            maxy = miny + rand.uniform(0, 25)
+            expected = self.brute_force(bboxes, minx, maxx, miny, maxy)
+            self.assertEqual(index.query(minx, maxx, miny, maxy), expected)
+
+    def test_outside(self):
+        """A query box outside all items finds nothing."""
+
+        bboxes = [(0, 1, 0, 1), (2, 3, 2, 3)]
+        index = spatial_index.GridIndex(bboxes)
+        self.assertEqual(index.query(10, 20, 10, 20), [])
+        self.assertEqual(index.query(1, 2, 1, 2), [0, 1])
+
+
+if __name__ == '__main__':
+    suite = unittest.makeSuite(TestGridIndex,'test')
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Vectorized geometry tests used by pySlip selection.
+
+The functions here work on numpy arrays of vertex coordinates so a polygon
+or polyline is tested in one pass instead of a python loop per vertex.
+"""
+
+import numpy as np
+
+
+def point_in_polygon(x, y, xs, ys):
+    """Decide if a point is inside a polygon.
+
+    x, y    coordinates of the point
+    xs, ys  numpy arrays of the polygon vertex coordinates
+
+    The polygon need not be closed.  Uses the same crossing number test as
+    PySlip.point_inside_polygon(), so a point on an edge may be inside or
+    outside.
+
+    Returns True if point is inside the polygon.
+    """
+
+    # edges go from vertex i to vertex i+1, wrapping around
+    x1 = xs
+    y1 = ys
+    x2 = np.roll(xs, -1)
+    y2 = np.roll(ys, -1)
+
+    # edges crossed by a ray from the point in the +X direction
+    crosses = ((y > np.minimum(y1, y2)) & (y <= np.maximum(y1, y2))
+               & (x <= np.maximum(x1, x2)))
+    if not crosses.any():
+        return False
+
+    (x1, y1, x2, y2) = (x1[crosses], y1[crosses], x2[crosses], y2[crosses])
+    xinters = (y - y1) * (x2 - x1) / (y2 - y1).astype(np.float64) + x1
+    hits = (x1 == x2) | (x <= xinters)
+
+    return bool(np.count_nonzero(hits) % 2)
+
+
+def point_segment_distances(x, y, x1, y1, x2, y2):
+    """Get the distances from a point to many line segments.
+
+    x, y            coordinates of the point
+    x1, y1, x2, y2  numpy arrays of the segment endpoint coordinates
+
+    Uses the same method as PySlip.point_segment_distance().  A segment of
+    zero length is treated as a point.
+
+    Returns a numpy array of the distances squared.
+    """
+
+    px = (x2 - x1).astype(np.float64)
+    py = (y2 - y1).astype(np.float64)
+    length = px*px + py*py
+
+    # position of nearest point along each segment, clipped to the segment
+    u = (x - x1)*px + (y - y1)*py
+    u = np.divide(u, length, out=np.zeros_like(u), where=length > 0)
+    u = np.clip(u, 0.0, 1.0)
+
+    dx = x1 + u*px - x
+    dy = y1 + u*py - y
+
+    return dx*dx + dy*dy
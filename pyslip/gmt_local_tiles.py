@@ -9,6 +9,11 @@ Uses pyCacheBack to provide in-memory and on-disk caching.
 
 import os
 import pickle
+try:
+    import numpy as np
+except ImportError:
+    # numpy is only needed for the array conversions
+    np = None
 
 import tiles
 
@@ -170,3 +175,45 @@ class Tiles(tiles.BaseTiles):
 
         return (xgeo, ygeo)
 
+    def Geo2TileArray(self, xgeo, ygeo):
+        """Convert arrays of geo to tile fractional coordinates for level in use.
+
+        xgeo  numpy array of geo X coordinates
+        ygeo  numpy array of geo Y coordinates
+
+        Returns a tuple of numpy arrays (xtile, ytile), converted as in
+        Geo2Tile() but all at once.
+        """
+
+        # get extent information
+        (min_xgeo, max_xgeo, min_ygeo, max_ygeo) = self.extent
+
+        # get 'geo-like' coords with origin at top-left
+        x = np.asarray(xgeo, dtype=np.float64) - min_xgeo
+        y = max_ygeo - np.asarray(ygeo, dtype=np.float64)
+
+        tdeg_x = self.tile_size_x / self.ppd_x
+        tdeg_y = self.tile_size_y / self.ppd_y
+
+        return (x/tdeg_x, y/tdeg_y)
+
+    def Tile2GeoArray(self, xtile, ytile):
+        """Convert arrays of tile fractional coordinates to geo for level in use.
+
+        xtile  numpy array of tile fractional X coordinates
+        ytile  numpy array of tile fractional Y coordinates
+
+        Returns a tuple of numpy arrays (xgeo, ygeo), converted as in
+        Tile2Geo() but all at once.
+        """
+
+        # get extent information
+        (min_xgeo, max_xgeo, min_ygeo, max_ygeo) = self.extent
+
+        # compute tile degree sizes and position in the coordinate system
+        tdeg_x = self.tile_size_x / self.ppd_x
+        tdeg_y = self.tile_size_y / self.ppd_y
+        xgeo = np.asarray(xtile, dtype=np.float64)*tdeg_x + min_xgeo
+        ygeo = max_ygeo - np.asarray(ytile, dtype=np.float64)*tdeg_y
+
+        return (xgeo, ygeo)
@@ -8,6 +8,11 @@ Uses pyCacheBack to provide in-memory and on-disk caching.
 """
 
 import math
+try:
+    import numpy as np
+except ImportError:
+    # numpy is only needed for the array conversions
+    np = None
 
 import tiles
 
@@ -125,3 +130,36 @@ class Tiles(tiles.BaseTiles):
 
         return (xgeo, ygeo)
 
+    def Geo2TileArray(self, xgeo, ygeo):
+        """Convert arrays of geo to tile fractional coordinates for level in use.
+
+        xgeo  numpy array of geo X coordinates
+        ygeo  numpy array of geo Y coordinates
+
+        Returns a tuple of numpy arrays (xtile, ytile), converted as in
+        Geo2Tile() but all at once.
+        """
+
+        lat_rad = np.radians(ygeo)
+        n = 2.0 ** self.level
+        xtile = (np.asarray(xgeo, dtype=np.float64) + 180.0) / 360.0 * n
+        ytile = ((1.0 - np.log(np.tan(lat_rad) + (1.0/np.cos(lat_rad))) / np.pi) / 2.0) * n
+
+        return (xtile, ytile)
+
+    def Tile2GeoArray(self, xtile, ytile):
+        """Convert arrays of tile fractional coordinates to geo for level in use.
+
+        xtile  numpy array of tile fractional X coordinates
+        ytile  numpy array of tile fractional Y coordinates
+
+        Returns a tuple of numpy arrays (xgeo, ygeo), converted as in
+        Tile2Geo() but all at once.
+        """
+
+        n = 2.0 ** self.level
+        xgeo = np.asarray(xtile, dtype=np.float64) / n * 360.0 - 180.0
+        yrad = np.arctan(np.sinh(np.pi * (1 - 2 * np.asarray(ytile, dtype=np.float64) / n)))
+        ygeo = np.degrees(yrad)
+
+        return (xgeo, ygeo)
@@ -27,12 +27,29 @@ import os
 import sys
 import glob
 import json
+import math
+import time
+import operator
+import itertools
+import collections
 try:
     import cPickle as pickle
 except ImportError:
     import pickle
 import traceback
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import wx
+try:
+    import numpy as np
+    from . import geometry
+except ImportError:
+    # numpy is only needed for raster layers and fast selection
+    np = None
+    geometry = None
+
+from . import pycacheback
+from . import spatial_index
 
 try:
     from . import log
@@ -52,7 +69,8 @@ except ImportError as e:
 
 # type of SELECT events
 (EventLevel, EventPosition, EventSelect, EventBoxSelect,
-    EventPolySelect, EventPolyBoxSelect, EventRightSelect) = range(7)
+    EventPolySelect, EventPolyBoxSelect, EventRightSelect,
+    EventHover) = range(8)
 
 # diiferent cursors for different states
 DefaultCursor = wx.CURSOR_DEFAULT
@@ -72,6 +90,15 @@ class _BufferedCanvas(wx.Panel):
     # The backing buffer
     buffer = None
 
+    # default maximum rate (frames/second) of scheduled updates
+    DefaultMaxFPS = 50
+
+    # pixels of spare width and height added when the buffer grows
+    BufferSlack = 128
+
+    # seconds without a size event before a resize is handled
+    ResizeSettleTime = 0.15
+
     def __init__(self, parent, id=wx.ID_ANY, pos=wx.DefaultPosition,
                  size=wx.DefaultSize, style=wx.NO_FULL_REPAINT_ON_RESIZE):
         """Initialise the canvas.
@@ -97,6 +124,15 @@ class _BufferedCanvas(wx.Panel):
         # set callback upon onSize event
         self.on_size_callback = None
 
+        # state for coalescing scheduled updates
+        self.max_fps = self.DefaultMaxFPS
+        self.update_pending = False     # True if the canvas needs a redraw
+        self.update_scheduled = False   # True if a scheduled redraw is queued
+        self.last_update_time = 0.0     # time of the last redraw
+
+        # timer that fires when a burst of size events ends
+        self.resize_timer = None
+
         # allocate bitmap buffer for display
         (width, height) = size
         self.buffer = wx.EmptyBitmap(width, height)
@@ -107,7 +143,14 @@ class _BufferedCanvas(wx.Panel):
         pass
 
     def Update(self):
-        """Causes the canvas to be updated."""
+        """Causes the canvas to be updated immediately.
+
+        Internal code calls ScheduleUpdate() instead, use this only
+        when the display must be correct before returning.
+        """
+
+        self.update_pending = False
+        self.last_update_time = time.time()
 
         dc = wx.BufferedDC(wx.ClientDC(self), self.buffer)
         dc.BeginDrawing()
@@ -115,6 +158,44 @@ class _BufferedCanvas(wx.Panel):
         self.Draw(dc)
         dc.EndDrawing()
 
+    def ScheduleUpdate(self):
+        """Mark the canvas as needing a redraw.
+
+        Redraws are coalesced: any number of calls before the next frame
+        result in a single Update(), and frames are limited to .max_fps
+        per second.
+        """
+
+        self.update_pending = True
+        if self.update_scheduled:
+            return
+        self.update_scheduled = True
+
+        delay = self.last_update_time + 1.0/self.max_fps - time.time()
+        if delay > 0:
+            wx.CallLater(int(delay*1000) + 1, self._scheduled_update)
+        else:
+            wx.CallAfter(self._scheduled_update)
+
+    def _scheduled_update(self):
+        """Do a scheduled redraw, if still required."""
+
+        # the widget may have been destroyed while we waited
+        if not self:
+            return
+
+        self.update_scheduled = False
+        if self.update_pending:
+            self.Update()
+
+    def SetMaxFPS(self, fps):
+        """Set the maximum rate of scheduled updates.
+
+        fps  maximum number of frames per second
+        """
+
+        self.max_fps = fps
+
     def OnPaint(self, event):
         """Paint the canvas to the screen."""
 
@@ -122,7 +203,37 @@ class _BufferedCanvas(wx.Panel):
         wx.BufferedPaintDC(self, self.buffer)
 
     def OnSize(self, event=None):
-        """Create a new off-screen buffer to hold drawn data."""
+        """Handle a change of canvas size.
+
+        event  the size event, None if called directly
+
+        The off-screen buffer only ever grows, with BufferSlack pixels to
+        spare, so it is rarely reallocated.  Size events come in bursts
+        while the user resizes the window, so the view is only set up and
+        redrawn once no size event has been seen for ResizeSettleTime
+        seconds.  Until then the previous frame is shown, cropped.  Direct
+        calls are handled at once.
+        """
+
+        (width, height) = self.GetClientSizeTuple()
+        self._grow_buffer(width, height)
+
+        if event is None:
+            self._resize_settled()
+            return
+
+        delay = int(self.ResizeSettleTime * 1000)
+        if self.resize_timer and self.resize_timer.IsRunning():
+            self.resize_timer.Restart(delay)
+        else:
+            self.resize_timer = wx.CallLater(delay, self._resize_settled)
+
+    def _resize_settled(self):
+        """Set up the view for the new canvas size and redraw."""
+
+        # the widget may have been destroyed while we waited
+        if not self:
+            return
 
         (width, height) = self.GetClientSizeTuple()
         if width == 0:
@@ -131,16 +242,45 @@ class _BufferedCanvas(wx.Panel):
             height = 1      # during startup, can be 0
         self.view_width = width
         self.view_height = height
-
-        # new off-screen buffer
-        self.buffer = wx.EmptyBitmap(width, height)
+        self._grow_buffer(width, height)
 
         # call onSize callback, if registered
         if self.on_size_callback:
             self.on_size_callback()
 
-            # Now update the screen
-            self.Update()
+        # Now update the screen
+        self.ScheduleUpdate()
+
+    def _grow_buffer(self, width, height):
+        """Make sure the off-screen buffer is at least the given size.
+
+        width, height  required buffer size in pixels
+
+        The current buffer contents are copied into any new buffer.
+        """
+
+        width = max(width, 1)
+        height = max(height, 1)
+
+        if self.buffer is not None and self.buffer.IsOk():
+            (buf_width, buf_height) = self.buffer.GetSize()
+            if width <= buf_width and height <= buf_height:
+                return
+            width = max(width + self.BufferSlack, buf_width)
+            height = max(height + self.BufferSlack, buf_height)
+        else:
+            width += self.BufferSlack
+            height += self.BufferSlack
+
+        buffer = wx.EmptyBitmap(width, height)
+        dc = wx.MemoryDC(buffer)
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        dc.Clear()
+        if self.buffer is not None and self.buffer.IsOk():
+            dc.DrawBitmap(self.buffer, 0, 0, False)
+        dc.SelectObject(wx.NullBitmap)
+
+        self.buffer = buffer
 
 ######
 # A layer class - encapsulates all layer data.
@@ -153,7 +293,7 @@ class _Layer(object):
 
     def __init__(self, id=0, painter=None, data=None, map_rel=True,
                  visible=False, show_levels=None, selectable=False,
-                 name="<no name given>", type=None):
+                 name="<no name given>", type=None, defaults=None):
         """Initialise the Layer object.
 
         id           unique layer ID
@@ -165,6 +305,7 @@ class _Layer(object):
         selectable   True if select operates on this layer, else False
         name         the name of the layer (for debug)
         type         a layer 'type' flag
+        defaults     the layer-specific attributes dictionary (or None)
         """
 
         self.painter = painter          # routine to draw layer
@@ -177,11 +318,434 @@ class _Layer(object):
         self.name = name                # name of this layer
         self.type = type                # type of layer
         self.id = id                    # ID of this layer
+        self.defaults = defaults or {}  # layer-specific attribute defaults
+        self.cached = False             # True if layer drawn from a raster cache
+        self.tile_cached = False        # True if layer drawn from overlay tiles
+        self.cache = None               # cached raster: (level, x, y, bitmap)
+        self.view_cache = None          # cached raster of view-relative layer
+        self.raster = False             # True if drawn by the numpy rasterizer
+        self.columns = None             # numpy arrays of the layer data
+        self.index = None               # spatial index of map-relative data
+        self.index_margin = 0           # pixels objects extend past geo bbox
+
+    def invalidate(self):
+        """Discard any cached raster and index of the layer."""
+
+        self.cache = None
+        self.view_cache = None
+        self.columns = None
+        self.index = None
 
     def __str__(self):
         return ('<pyslip Layer: id=%d, name=%s, map_rel=%s, visible=%s'
                 % (self.id, self.name, str(self.map_rel), str(self.visible)))
 
+######
+# A cache for tile-aligned layer overlay bitmaps.
+######
+
+class _OverlayCache(pycacheback.pyCacheBack):
+    """LRU cache of layer overlay tiles, optionally backed by disk.
+
+    Keys are tuples (layer_id, level, x, y).  A layer only has an on-disk
+    store if a directory was registered for it with set_layer_dir().
+    """
+
+    # overlay tiles stored on disk at <layer dir>/<TilePath>
+    TilePath = '{Z}/{X}/{Y}.png'
+
+    def __init__(self, *args, **kwargs):
+        self._layer_dirs = {}
+        super(_OverlayCache, self).__init__(*args, **kwargs)
+
+    def set_layer_dir(self, layer_id, layer_dir):
+        """Set (or remove, if None) the on-disk store for a layer."""
+
+        if layer_dir is None:
+            self._layer_dirs.pop(layer_id, None)
+        else:
+            self._layer_dirs[layer_id] = layer_dir
+
+    def forget_layer(self, layer_id, disk=True):
+        """Discard all overlay tiles of a layer.
+
+        layer_id  ID of the layer
+        disk      if True also remove the layer's on-disk overlay tiles
+        """
+
+        for key in [k for k in self.keys() if k[0] == layer_id]:
+            del self[key]
+
+        layer_dir = self._layer_dirs.get(layer_id, None)
+        if disk and layer_dir:
+            pattern = os.path.join(layer_dir,
+                                   self.TilePath.format(Z='*', X='*', Y='*'))
+            for path in glob.glob(pattern):
+                os.remove(path)
+
+    def tile_path(self, key):
+        """Return on-disk path of an overlay tile, None if not on disk."""
+
+        (layer_id, level, x, y) = key
+        layer_dir = self._layer_dirs.get(layer_id, None)
+        if layer_dir is None:
+            return None
+        return os.path.join(layer_dir, self.TilePath.format(Z=level, X=x, Y=y))
+
+    def _get_from_back(self, key):
+        """Retrieve an overlay tile from the on-disk store.
+
+        Raises KeyError if tile not found.
+        """
+
+        tile_path = self.tile_path(key)
+        if tile_path is None or not os.path.exists(tile_path):
+            raise KeyError("Overlay tile '%s' not found in on-disk cache"
+                           % str(key))
+
+        bmp = wx.Image(tile_path, wx.BITMAP_TYPE_PNG).ConvertToBitmap()
+
+        # keep it in memory, we don't want to go to disk for it again,
+        # but don't go through __setitem__() which writes it back to disk
+        dict.__setitem__(self, key, bmp)
+        self._reorder_lru(key)
+        self._enforce_lru_size()
+
+        return bmp
+
+    def _put_to_back(self, key, bmp):
+        """Put an overlay tile into the on-disk store, if the layer has one."""
+
+        tile_path = self.tile_path(key)
+        if tile_path is None:
+            return
+
+        dir_path = os.path.dirname(tile_path)
+        try:
+            os.makedirs(dir_path)
+        except OSError:
+            # we assume it's a "directory exists' error, which we ignore
+            pass
+
+        bmp.SaveFile(tile_path, wx.BITMAP_TYPE_PNG)
+
+######
+# A small LRU cache of pre-rendered bitmaps.
+######
+
+class _BitmapCache(object):
+    """An LRU limited dictionary of bitmaps, such as point sprites.
+
+    Unlike pycacheback.pyCacheBack the LRU order is kept in an OrderedDict,
+    so lookups stay cheap when drawing many objects.
+    """
+
+    def __init__(self, max_lru):
+        """Initialise the cache.
+
+        max_lru  maximum number of bitmaps kept
+        """
+
+        self._max_lru = max_lru
+        self._cache = collections.OrderedDict()
+
+    def __getitem__(self, key):
+        value = self._cache.pop(key)
+        self._cache[key] = value        # now most recently used
+        return value
+
+    def __setitem__(self, key, value):
+        self._cache.pop(key, None)
+        self._cache[key] = value
+        while len(self._cache) > self._max_lru:
+            self._cache.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+
+######
+# A pool of drawing styles shared by layer objects.
+######
+
+class _StylePool(object):
+    """The drawing styles used by layer objects.
+
+    A style is a tuple of attribute values, such as (radius, colour) for a
+    point.  Each distinct style is stored once and the layer draw data
+    holds a small integer index into the pool.  The wx pens, brushes and
+    fonts used to draw styles are also made once and shared.
+    """
+
+    def __init__(self):
+        self._styles = []       # style tuples, indexed by style index
+        self._index = {}        # maps style key to style index
+        self._pens = {}
+        self._brushes = {}
+        self._fonts = {}
+
+    @staticmethod
+    def colour_key(colour):
+        """Get a hashable key for a colour string, tuple, list or wx.Colour.
+
+        Other values are returned unchanged.
+        """
+
+        if isinstance(colour, wx.Colour):
+            return colour.Get(True)
+        if isinstance(colour, list):
+            return tuple(colour)
+        return colour
+
+    def intern(self, style):
+        """Get the index of a style tuple, adding it to the pool if new."""
+
+        key = tuple([self.colour_key(value) for value in style])
+        try:
+            return self._index[key]
+        except KeyError:
+            self._styles.append(style)
+            index = len(self._styles) - 1
+            self._index[key] = index
+            return index
+
+    def __getitem__(self, index):
+        return self._styles[index]
+
+    def __len__(self):
+        return len(self._styles)
+
+    def rgba(self, colour):
+        """Get a colour as a tuple (red, green, blue, alpha) of 0-255 ints."""
+
+        if isinstance(colour, wx.Colour):
+            return colour.Get(True)
+        if isinstance(colour, basestring):
+            return wx.NamedColour(colour).Get(True)
+        return wx.Colour(*colour).Get(True)
+
+    def pen(self, colour, width=1):
+        """Get the shared pen for a colour and line width."""
+
+        key = (self.colour_key(colour), width)
+        try:
+            return self._pens[key]
+        except KeyError:
+            pen = self._pens[key] = wx.Pen(colour, width=width)
+            return pen
+
+    def brush(self, colour):
+        """Get the shared solid brush for a colour."""
+
+        key = self.colour_key(colour)
+        try:
+            return self._brushes[key]
+        except KeyError:
+            brush = self._brushes[key] = wx.Brush(colour)
+            return brush
+
+    def font(self, fontname, fontsize):
+        """Get the shared font for a face name and point size."""
+
+        key = (fontname, fontsize)
+        try:
+            return self._fonts[key]
+        except KeyError:
+            font = self._fonts[key] = wx.Font(fontsize, wx.SWISS, wx.NORMAL,
+                                              wx.NORMAL, False, fontname)
+            return font
+
+######
+# Columnar layer draw data.
+######
+
+class _LayerColumns(object):
+    """Layer draw data held in numpy arrays, one element per object.
+
+    Behaves as a sequence of the draw data tuples of the layer type, so code
+    written for the list form works unchanged, while the fast paths use the
+    arrays directly.  Slices share the arrays of the original.
+    """
+
+    # placement strings, indexed by the placement codes
+    Placements = ['cc', 'nw', 'cn', 'ne', 'ce', 'se', 'cs', 'sw', 'cw', '']
+
+    def __len__(self):
+        return len(self.place)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.take(key)
+        return self.row(key)
+
+    def user_data(self):
+        """Get a list of the user data of every object."""
+
+        if self.udata is None:
+            return [self.default_udata] * len(self)
+        return list(self.udata)
+
+    def take_udata(self, indices):
+        """Get the user data array for some of the objects, or None."""
+
+        if self.udata is None:
+            return None
+        return self.udata[indices]
+
+
+class _PointColumns(_LayerColumns):
+    """Point layer draw data held in numpy arrays.
+
+    The draw data tuples are (x, y, place, style, x_off, y_off, udata).
+    """
+
+    def __init__(self, x, y, place, style, x_off, y_off,
+                 udata=None, default_udata=None):
+        """Initialise the columns.
+
+        x, y           float64 arrays of point coordinates
+        place          int8 array of placement codes
+        style          int32 array of style pool indices
+        x_off, y_off   arrays of point offsets in pixels
+        udata          object array of point user data, or None
+        default_udata  user data of every point if 'udata' is None
+        """
+
+        self.x = x
+        self.y = y
+        self.place = place
+        self.style = style
+        self.x_off = x_off
+        self.y_off = y_off
+        self.udata = udata
+        self.default_udata = default_udata
+
+    def row(self, i):
+        """Get the draw data tuple of one point."""
+
+        udata = self.default_udata
+        if self.udata is not None:
+            udata = self.udata[i]
+        return (self.x[i].item(), self.y[i].item(),
+                self.Placements[self.place[i]], self.style[i].item(),
+                self.x_off[i].item(), self.y_off[i].item(), udata)
+
+    def __iter__(self):
+        places = [self.Placements[p] for p in self.place.tolist()]
+        return iter(zip(self.x.tolist(), self.y.tolist(), places,
+                        self.style.tolist(), self.x_off.tolist(),
+                        self.y_off.tolist(), self.user_data()))
+
+    def take(self, indices):
+        """Get some of the points.
+
+        indices  a slice, or a sequence of point indices
+
+        Returns a new _PointColumns object.
+        """
+
+        return _PointColumns(self.x[indices], self.y[indices],
+                             self.place[indices], self.style[indices],
+                             self.x_off[indices], self.y_off[indices],
+                             self.take_udata(indices), self.default_udata)
+
+
+class _ShapeColumns(_LayerColumns):
+    """Polygon or polyline layer draw data held in numpy arrays.
+
+    The vertices of all shapes are in one (M, 2) float64 array, shape i
+    using rows starts[i] to ends[i].  The draw data tuples are
+    (p, place, style, x_off, y_off, udata) where 'p' is a view of the
+    shape rows of the vertex array.
+    """
+
+    def __init__(self, vertices, starts, ends, place, style, x_off, y_off,
+                 udata=None, default_udata=None, bbox=None, cache=None):
+        """Initialise the columns.
+
+        vertices       (M, 2) float64 array of all shape vertices
+        starts, ends   arrays of first and after-last vertex row of shapes
+        place          int8 array of placement codes
+        style          int32 array of style pool indices
+        x_off, y_off   arrays of shape offsets in pixels
+        udata          object array of shape user data, or None
+        default_udata  user data of every shape if 'udata' is None
+        bbox           (N, 4) array of shape bounding boxes, rows of
+                       (minx, maxx, miny, maxy), computed if None
+        cache          dictionary of values computed from the vertices,
+                       shared with shapes taken from these
+        """
+
+        self.vertices = vertices
+        self.starts = starts
+        self.ends = ends
+        self.place = place
+        self.style = style
+        self.x_off = x_off
+        self.y_off = y_off
+        self.udata = udata
+        self.default_udata = default_udata
+
+        if bbox is None:
+            bbox = np.empty((len(starts), 4), dtype=np.float64)
+            if len(starts):
+                # shapes are packed in order, reduce over each shape
+                xs = vertices[:,0]
+                ys = vertices[:,1]
+                bbox[:,0] = np.minimum.reduceat(xs, starts)
+                bbox[:,1] = np.maximum.reduceat(xs, starts)
+                bbox[:,2] = np.minimum.reduceat(ys, starts)
+                bbox[:,3] = np.maximum.reduceat(ys, starts)
+        self.bbox = bbox
+
+        if cache is None:
+            cache = {}
+        self.cache = cache
+
+    def shape(self, i):
+        """Get the (k, 2) vertex array of one shape."""
+
+        return self.vertices[self.starts[i]:self.ends[i]]
+
+    def row(self, i):
+        """Get the draw data tuple of one shape."""
+
+        udata = self.default_udata
+        if self.udata is not None:
+            udata = self.udata[i]
+        return (self.shape(i), self.Placements[self.place[i]],
+                self.style[i].item(), self.x_off[i].item(),
+                self.y_off[i].item(), udata)
+
+    def __iter__(self):
+        vertices = self.vertices
+        shapes = [vertices[first:last] for (first, last)
+                  in zip(self.starts.tolist(), self.ends.tolist())]
+        places = [self.Placements[p] for p in self.place.tolist()]
+        return iter(zip(shapes, places, self.style.tolist(),
+                        self.x_off.tolist(), self.y_off.tolist(),
+                        self.user_data()))
+
+    def take(self, indices):
+        """Get some of the shapes, sharing the vertex array.
+
+        indices  a slice, or a sequence of shape indices
+
+        Returns a new _ShapeColumns object.
+        """
+
+        return _ShapeColumns(self.vertices,
+                             self.starts[indices], self.ends[indices],
+                             self.place[indices], self.style[indices],
+                             self.x_off[indices], self.y_off[indices],
+                             self.take_udata(indices), self.default_udata,
+                             self.bbox[indices], self.cache)
+
 ###############################################################################
 # Define the events that are raised by the pySlip widget.
 ###############################################################################
@@ -214,6 +778,10 @@ EVT_PYSLIP_POLYBOXSELECT = wx.PyEventBinder(_myEVT_PYSLIP_POLYBOXSELECT, 1)
 _myEVT_PYSLIP_RIGHTSELECT = wx.NewEventType()
 EVT_PYSLIP_RIGHTSELECT = wx.PyEventBinder(_myEVT_PYSLIP_RIGHTSELECT, 1)
 
+# object under the mouse changed
+_myEVT_PYSLIP_HOVER = wx.NewEventType()
+EVT_PYSLIP_HOVER = wx.PyEventBinder(_myEVT_PYSLIP_HOVER, 1)
+
 
 class _PySlipEvent(wx.PyCommandEvent):
     """Event sent from the pySlip widget."""
@@ -243,6 +811,56 @@ class PySlip(_BufferedCanvas):
     # panel background colour
     BackgroundColour = '#808080'
 
+    # margin (pixels) around the view rendered into cached layer rasters
+    LayerCacheMargin = 256
+
+    # True if view-relative layers are drawn from a view-sized raster cache
+    ViewLayerCache = True
+
+    # maximum number of in-memory layer overlay tiles
+    OverlayMaxLRU = 500
+
+    # True if points are drawn by stamping pre-rendered sprites, and
+    # the maximum number of sprites kept
+    UsePointSprites = True
+    SpriteMaxLRU = 1000
+
+    # True if text is drawn from pre-rendered label bitmaps, and the
+    # maximum number of label bitmaps kept
+    UseLabelSprites = True
+    LabelMaxLRU = 5000
+
+    # progressive rendering: seconds of drawing per idle event and
+    # number of layer objects drawn per chunk
+    ProgressiveSliceTime = 0.02
+    ProgressiveChunkSize = 500
+
+    # raster point placement: maps placement to (cx, sx, cy, sy) where a
+    # point moves by cx*view_width + sx*offset_x in X, likewise in Y
+    RasterPlacement = {'cc': (0.5, 0, 0.5, 0),
+                       'nw': (0, 1, 0, 1),
+                       'cn': (0.5, 0, 0, 1),
+                       'ne': (1, -1, 0, 1),
+                       'ce': (1, -1, 0.5, 0),
+                       'se': (1, -1, 1, -1),
+                       'cs': (0.5, 0, 1, -1),
+                       'sw': (0, 1, 1, -1),
+                       'cw': (0, 1, 0.5, 0)}
+
+    # draft rendering: seconds after the last drag or zoom before a full
+    # quality redraw, and the most objects a layer draws in a draft
+    DraftSettleTime = 0.25
+    DraftMaxObjects = 2000
+
+    # map-relative layers with at least this many objects are culled to
+    # the view through a spatial index before drawing
+    IndexMinObjects = 500
+
+    # dirty rectangle redraws: pixels added around changed objects and
+    # fraction of the view above which the whole view is redrawn
+    DirtyRectMargin = 2
+    DirtyRectMaxFraction = 0.5
+
     # default point attributes - map relative
     DefaultPointPlacement = 'cc'
     DefaultPointRadius = 3
@@ -373,12 +991,34 @@ class PySlip(_BufferedCanvas):
         self.max_x_offset = None                # max view X offset (set in ResizeCallback())
         self.max_y_offset = None                # max view Y offset (set in ResizeCallback())
         self.mouse_position_event = True        # True if we send event to report mouse position in view
+        self.hover_event = False                # True if we send event when object under mouse changes
+        self.hover_posn = None                  # view position still to hover test
+        self.hover_hit = None                   # (layer ID, selection key) last hovered
+        self.hover_scheduled = False            # True if a hover test is scheduled
+        self.last_hover_time = 0.0              # time of the last hover test
+        self.motion = None                      # latest (view posn, dragging, left down) of mouse
+        self.motion_scheduled = False           # True if handling of mouse motion is scheduled
+        self.position_rate = None               # max position events per second, None if no limit
+        self.position_posn = None               # view position of next position event
+        self.position_scheduled = False         # True if a position event is scheduled
+        self.last_position_time = 0.0           # time of the last position event
         self.next_layer_id = 1                  # source of unique layer IDs
+        self.overlay_cache = _OverlayCache(max_lru=self.OverlayMaxLRU)
+        self.sprite_cache = _BitmapCache(self.SpriteMaxLRU)
+        self.label_cache = _BitmapCache(self.LabelMaxLRU)
+        self.style_pool = _StylePool()
+        self.progressive = False                # True if layers drawn in idle time
+        self.draft = False                      # True if drafts drawn while interacting
+        self.drafting = False                   # True while drawing draft frames
+        self.draft_timer = None                 # timer ending draft frames
+        self.raster_pool = None                 # threads rasterizing layers, if parallel
+        self.render_job = None                  # queue of layer chunks still to draw
         self.on_size_callback = self.ResizeCallback # set callback when parent resizes
         self.right_click_event = False          # True if event on right mouse click (right button up event)
         self.sbox_1_x = None                    # selection box X size
         self.sbox_1_y = None                    # selection box Y size
         self.sbox_h = None
+        self.sbox_snapshot = None               # rendered view under the selection box
         self.sbox_w = None
         self.shift_down = False                 # state of the SHIFT key
         self.tile_src = None                    # source of tiles
@@ -390,6 +1030,7 @@ class PySlip(_BufferedCanvas):
         self.view_offset_x = None               # map pixel offset at left of view
         self.view_offset_y = None               # map pixel offset at top of view
         self.view_rlon = None                   # view right lon (set in OnSize())
+        self.view_stack = []                    # saved views, see _push_view()
         self.view_tlat = None                   # view top lat (set in OnSize())
         self.view_width = None                  # view size in pixels, set in OnSize()
         self.was_dragging = False               # True if dragging map
@@ -406,6 +1047,13 @@ class PySlip(_BufferedCanvas):
                                  self.TypePolygon: self.GetPolygonInLayer,
                                  self.TypePolyline: self.GetPolylineInLayer}
 
+        # for converting user data to draw data
+        self.layerDataHandler = {self.TypePoint: self._point_layer_data,
+                                 self.TypeImage: self._image_layer_data,
+                                 self.TypeText: self._text_layer_data,
+                                 self.TypePolygon: self._polygon_layer_data,
+                                 self.TypePolyline: self._polyline_layer_data}
+
         # for box select
         self.layerBSelHandler = {self.TypePoint: self.GetBoxSelPointsInLayer,
                                  self.TypeImage: self.GetBoxSelImagesInLayer,
@@ -426,6 +1074,7 @@ class PySlip(_BufferedCanvas):
         self.Bind(wx.EVT_MOUSEWHEEL, self.OnMouseWheel)
         self.Bind(wx.EVT_ENTER_WINDOW, self.OnEnterWindow)
         self.Bind(wx.EVT_LEAVE_WINDOW, self.OnLeaveWindow)
+        self.Bind(wx.EVT_IDLE, self.OnIdle)
 
         # we also check KEY events, mostly for SHIFT key
         self.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
@@ -475,7 +1124,7 @@ class PySlip(_BufferedCanvas):
         On a slow display we could just redraw the new tile.
         """
 
-        self.Update()
+        self.ScheduleUpdate()
 
     def OnEnterWindow(self, event):
         """Event handler when mouse enters widget."""
@@ -485,8 +1134,201 @@ class PySlip(_BufferedCanvas):
     def OnLeaveWindow(self, event):
         """Event handler when mouse leaves widget."""
 
+        self.position_posn = None
         self.RaiseEventPosition(None, None)
 
+        # nothing is under the mouse now
+        self.hover_posn = None
+        if self.hover_hit:
+            self.hover_hit = None
+            self.RaiseEventHover(None, None)
+
+    def _schedule_hover(self, vposn):
+        """Arrange a hover test of a mouse position.
+
+        vposn  the mouse position in view coordinates
+
+        Tests are coalesced and limited to .max_fps per second, only the
+        latest mouse position is tested.
+        """
+
+        self.hover_posn = vposn
+        if self.hover_scheduled:
+            return
+        self.hover_scheduled = True
+
+        delay = self.last_hover_time + 1.0/self.max_fps - time.time()
+        if delay > 0:
+            wx.CallLater(int(delay*1000) + 1, self._hover)
+        else:
+            wx.CallAfter(self._hover)
+
+    def _hover(self):
+        """Find the object under the mouse, raise an event if it changed.
+
+        Selectable layers are tested top down with the layer point select
+        handlers, which use the layer spatial indices.
+        """
+
+        # the widget may have been destroyed while we waited
+        if not self:
+            return
+
+        self.hover_scheduled = False
+        vposn = self.hover_posn
+        if vposn is None or self.is_box_select:
+            return
+        self.last_hover_time = time.time()
+
+        mposn = self.View2Geo(vposn)
+        hit = None
+        for id in reversed(self.layer_z_order):
+            l = self.layer_mapping[id]
+            if l.selectable and l.visible and self.level in l.show_levels:
+                if l.map_rel:
+                    sel = self.layerPSelHandler[l.type](l, mposn)
+                else:
+                    sel = self.layerPSelHandler[l.type](l, vposn)
+                if sel:
+                    hit = (l, sel)
+                    break
+
+        key = None
+        if hit:
+            (l, sel) = hit
+            key = (l.id, self._hover_key(sel[0]))
+        if key != self.hover_hit:
+            self.hover_hit = key
+            if hit:
+                self.RaiseEventHover(mposn, vposn, *hit)
+            else:
+                self.RaiseEventHover(mposn, vposn)
+
+    @staticmethod
+    def _hover_key(value):
+        """Make a hashable key from a hover selection.
+
+        value  the selection, or part of it
+
+        Columnar shape layers select numpy vertex arrays, which can't be
+        compared with '!='.  Arrays become (shape, bytes) tuples, lists and
+        tuples become tuples and dictionaries become sorted item tuples.
+        """
+
+        if np is not None and isinstance(value, np.ndarray):
+            return (value.shape, value.tobytes())
+        if isinstance(value, dict):
+            return tuple(sorted((k, PySlip._hover_key(v))
+                                for (k, v) in value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(PySlip._hover_key(v) for v in value)
+        return value
+
+    def OnIdle(self, event):
+        """Event handler when the event loop is idle.
+
+        Continues any progressive render, drawing layer chunks for up to
+        ProgressiveSliceTime seconds and showing the result.
+        """
+
+        if not self.render_job:
+            return
+
+        dc = wx.BufferedDC(wx.ClientDC(self), self.buffer)
+        dc.BeginDrawing()
+
+        start = time.time()
+        while (self.render_job
+                and time.time() - start < self.ProgressiveSliceTime):
+            (layer, chunk) = self.render_job.popleft()
+            if chunk is None:
+                self._draw_layer(dc, layer)
+            else:
+                layer.painter(dc, chunk, map_rel=layer.map_rel)
+
+        if self.render_job:
+            event.RequestMore()
+        else:
+            self.render_job = None
+            self._finish_frame(dc)
+
+        dc.EndDrawing()
+
+    def SetProgressiveRender(self, progressive=True):
+        """Set progressive rendering on or off.
+
+        progressive  True if layers are to be drawn during idle time
+
+        In progressive mode a redraw draws the tiles at once and the layers
+        in chunks of ProgressiveChunkSize objects over following idle
+        events, so the widget stays responsive with very large layers.
+        Any change to the view abandons an unfinished redraw.
+        """
+
+        self.progressive = progressive
+        self.ScheduleUpdate()
+
+    def SetDraftRender(self, draft=True):
+        """Set draft rendering during drags and wheel zooms on or off.
+
+        draft  True if fast draft frames are drawn while interacting
+
+        Draft frames are drawn with a plain DC (no antialiasing or alpha),
+        leave out text layers and draw at most DraftMaxObjects objects of
+        any other layer.  Raster cached layers are drawn as usual.  A full
+        quality frame is drawn DraftSettleTime seconds after the last drag
+        or zoom.
+        """
+
+        self.draft = draft
+        if not draft and self.drafting:
+            self._end_draft()
+
+    def QualityDC(self, dc):
+        """Get the device context a layer painter should draw on.
+
+        dc  the device context passed to the painter
+
+        Returns 'dc' wrapped in an antialiasing, alpha capable wx.GCDC,
+        or 'dc' itself when drawing a draft frame.
+        """
+
+        if self.drafting:
+            return dc
+        return wx.GCDC(dc)
+
+    def _start_draft(self):
+        """Draw draft frames until the user stops interacting."""
+
+        if not self.draft:
+            return
+
+        self.drafting = True
+        delay = int(self.DraftSettleTime * 1000)
+        if self.draft_timer and self.draft_timer.IsRunning():
+            self.draft_timer.Restart(delay)
+        else:
+            self.draft_timer = wx.CallLater(delay, self._end_draft)
+
+    def _end_draft(self):
+        """Stop drawing draft frames and redraw at full quality."""
+
+        # the widget may have been destroyed while we waited
+        if not self:
+            return
+
+        self.drafting = False
+        self.ScheduleUpdate()
+
+    def ScheduleUpdate(self):
+        """Mark the widget as needing a redraw.
+
+        Abandons any unfinished progressive render, as it is now stale.
+        """
+
+        self.render_job = None
+        _BufferedCanvas.ScheduleUpdate(self)
+
     ######
     # Change the tileset
     ######
@@ -498,7 +1340,8 @@ class PySlip(_BufferedCanvas):
 
         Returns the old tileset object, None if none.
         Refreshes the display and tries to maintain the same position
-        and zoom level.
+        and zoom level.  Tile cached layers lose their overlay tile
+        directory, see SetLayerTileCached().
         """
 
         # get level and geo position of view centre
@@ -540,6 +1383,12 @@ class PySlip(_BufferedCanvas):
         # set callback from Tile source object when tile(s) available
         self.tile_src.SetAvailableCallback(self.OnTileAvailable)
 
+        # cached layer rasters were drawn with the old tileset projection,
+        # on-disk overlay tiles belong to the old tileset so detach them
+        for layer in self.layer_mapping.values():
+            self._invalidate_layer(layer)
+            self.overlay_cache.set_layer_dir(layer.id, None)
+
         # back to old level+centre, and refresh the display
         self.GotoLevelAndPosition(level, geo)
 
@@ -565,6 +1414,13 @@ class PySlip(_BufferedCanvas):
                          'offset_x'   X offset
                          'offset_y'   Y offset
                          'data'       point user data object
+                     or, with numpy, columnar data: a numpy array of shape
+                     (N, 2) holding x & y, or a dictionary of per-point
+                     columns with keys 'x' and 'y' and any of the attribute
+                     keys above.  A column is a numpy array or list with
+                     one value per point, a missing key or single value
+                     applies to all points.  Per-point colours must be a
+                     list.
         map_rel      points are map relative if True, else view relative
         visible      True if the layer is visible
         show_levels  list of levels at which layer is auto-shown (or None==all)
@@ -579,68 +1435,17 @@ class PySlip(_BufferedCanvas):
                          'data'       point user data object
         """
 
-        # merge global and layer defaults
-        if map_rel:
-            default_placement = kwargs.get('placement', self.DefaultPointPlacement)
-            default_radius = kwargs.get('radius', self.DefaultPointRadius)
-            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
-                                              self.DefaultPointColour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultPointOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultPointOffsetY)
-            default_data = kwargs.get('data', self.DefaultPointData)
-        else:
-            default_placement = kwargs.get('placement', self.DefaultPointViewPlacement)
-            default_radius = kwargs.get('radius', self.DefaultPointViewRadius)
-            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
-                                              self.DefaultPointViewColour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultPointViewOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultPointViewOffsetY)
-            default_data = kwargs.get('data', self.DefaultPointData)
+        draw_data = self._point_layer_data(points, map_rel, kwargs)
 
-        # create draw data iterable for draw method
-        draw_data = []              # list to hold draw data
+        return self.AddLayer(self.DrawPointLayer, draw_data, map_rel,
+                             visible=visible, show_levels=show_levels,
+                             selectable=selectable, name=name,
+                             type=self.TypePoint, defaults=kwargs)
 
-        for pt in points:
-            if len(pt) == 3:
-                (x, y, attributes) = pt
-            elif len(pt) == 2:
-                (x, y) = pt
-                attributes = {}
-            else:
-                msg = ('Point data must be iterable of tuples: '
-                       '(x, y[, dict])\n'
-                       'Got: %s' % str(pt))
-                raise Exception(msg)
-
-            # plug in any required polygon values (override globals+layer)
-            placement = attributes.get('placement', default_placement)
-            radius = attributes.get('radius', default_radius)
-            colour = self.get_i18n_kw(attributes, ('colour', 'color'),
-                                      default_colour)
-            offset_x = attributes.get('offset_x', default_offset_x)
-            offset_y = attributes.get('offset_y', default_offset_y)
-            udata = attributes.get('data', default_data)
-
-            # check values that can be wrong
-            placement = placement.lower()
-            if placement not in self.valid_placements:
-                msg = ("Point placement value is invalid, got '%s'"
-                       % str(placement))
-                raise Exception(msg)
-
-            # append another point to draw data list
-            draw_data.append((float(x), float(y), placement,
-                              radius, colour, offset_x, offset_y, udata))
-
-        return self.AddLayer(self.DrawPointLayer, draw_data, map_rel,
-                             visible=visible, show_levels=show_levels,
-                             selectable=selectable, name=name,
-                             type=self.TypePoint)
-
-    def AddImageLayer(self, data, map_rel=True, visible=True,
-                      show_levels=None, selectable=False,
-                      name='<image_layer>', **kwargs):
-        """Add a layer of images, map or view relative.
+    def AddImageLayer(self, data, map_rel=True, visible=True,
+                      show_levels=None, selectable=False,
+                      name='<image_layer>', **kwargs):
+        """Add a layer of images, map or view relative.
 
         data         list of (lon, lat, fname[, attributes]) (map_rel)
                      or list of (x, y, fname[, attributes]) (view relative)
@@ -668,76 +1473,12 @@ class PySlip(_BufferedCanvas):
         where the image is displayed relative to the hotspot.
         """
 
-        # merge global and layer defaults
-        if map_rel:
-            default_placement = kwargs.get('placement', self.DefaultImagePlacement)
-            default_radius = kwargs.get('radius', self.DefaultImageRadius)
-            default_colour = kwargs.get('colour', self.DefaultImageColour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultImageOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultImageOffsetY)
-            default_data = kwargs.get('data', self.DefaultImageData)
-        else:
-            default_placement = kwargs.get('placement', self.DefaultImageViewPlacement)
-            default_radius = kwargs.get('radius', self.DefaultImageViewRadius)
-            default_colour = kwargs.get('colour', self.DefaultImageViewColour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultImageViewOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultImageViewOffsetY)
-            default_data = kwargs.get('data', self.DefaultImageViewData)
-
-        # define cache variables for the image informtion
-        # used to minimise file access - just caches previous file informtion
-        fname_cache = None
-        bmp_cache = None
-        w_cache = None
-        h_cache = None
-
-        # load all image files, convert to bitmaps, create draw_data iterable
-        draw_data = []
-        for d in data:
-            if len(d) == 4:
-                (lon, lat, fname, attributes) = d
-            elif len(d) == 3:
-                (lon, lat, fname) = d
-                attributes = {}
-            else:
-                msg = ('Image data must be iterable of tuples: '
-                       '(x, y, fname[, dict])\nGot: %s' % str(d))
-                raise Exception(msg)
-
-            # get image specific values, if any
-            placement = attributes.get('placement', default_placement)
-            radius = attributes.get('radius', default_radius)
-            colour = attributes.get('colour', default_colour)
-            offset_x = attributes.get('offset_x', default_offset_x)
-            offset_y = attributes.get('offset_y', default_offset_y)
-            udata = attributes.get('data', None)
-
-            if fname == fname_cache:
-                bmap = bmp_cache
-                w = w_cache
-                h = h_cache
-            else:
-                fname_cache = fname
-                img = wx.Image(fname, wx.BITMAP_TYPE_ANY)
-                bmp_cache = bmap = img.ConvertToBitmap()
-                (w, h) = bmap.GetSize()
-                w_cache = w
-                h_cache = h
-
-            # check values that can be wrong
-            placement = placement.lower()
-            if placement not in self.valid_placements:
-                msg = ("Image placement value is invalid, got '%s'"
-                       % str(placement))
-                raise Exception(msg)
-
-            draw_data.append((float(lon), float(lat), bmap, w, h, placement,
-                              offset_x, offset_y, radius, colour, udata))
+        draw_data = self._image_layer_data(data, map_rel, kwargs)
 
         return self.AddLayer(self.DrawImageLayer, draw_data, map_rel,
                              visible=visible, show_levels=show_levels,
                              selectable=selectable, name=name,
-                             type=self.TypeImage)
+                             type=self.TypeImage, defaults=kwargs)
 
     def AddTextLayer(self, text, map_rel=True, visible=True, show_levels=None,
                      selectable=False, name='<text_layer>', **kwargs):
@@ -755,77 +1496,12 @@ class PySlip(_BufferedCanvas):
                      these supply any data missing in 'data'
         """
 
-        # merge global and layer defaults
-        if map_rel:
-            default_placement = kwargs.get('placement', self.DefaultTextPlacement)
-            default_radius = kwargs.get('radius', self.DefaultTextRadius)
-            default_fontname = kwargs.get('fontname', self.DefaultTextFontname)
-            default_fontsize = kwargs.get('fontsize', self.DefaultTextFontSize)
-            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
-                                              self.DefaultTextColour)
-            default_textcolour = self.get_i18n_kw(kwargs,
-                                                  ('textcolour', 'textcolor'),
-                                                  self.DefaultTextTextColour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultTextOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultTextOffsetY)
-            default_data = kwargs.get('data', self.DefaultTextData)
-        else:
-            default_placement = kwargs.get('placement', self.DefaultTextViewPlacement)
-            default_radius = kwargs.get('radius', self.DefaultTextViewRadius)
-            default_fontname = kwargs.get('fontname', self.DefaultTextViewFontname)
-            default_fontsize = kwargs.get('fontsize', self.DefaultTextViewFontSize)
-            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
-                                              self.DefaultTextViewColour)
-            default_textcolour = self.get_i18n_kw(kwargs,
-                                                  ('textcolour', 'textcolor'),
-                                                  self.DefaultTextViewTextColour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultTextViewOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultTextViewOffsetY)
-            default_data = kwargs.get('data', self.DefaultTextData)
-
-        # create data iterable ready for drawing
-        draw_data = []
-        for t in text:
-            if len(t) == 4:
-                (lon, lat, tdata, attributes) = t
-            elif len(t) == 3:
-                (lon, lat, tdata) = t
-                attributes = {}
-            else:
-                msg = ('Text data must be iterable of tuples: '
-                       '(lon, lat, text, [dict])\n'
-                       'Got: %s' % str(t))
-                raise Exception(msg)
-
-            # plug in any required defaults
-            placement = attributes.get('placement', default_placement)
-            radius = attributes.get('radius', default_radius)
-            fontname = attributes.get('fontname', default_fontname)
-            fontsize = attributes.get('fontsize', default_fontsize)
-            colour = self.get_i18n_kw(attributes, ('colour', 'color'),
-                                      default_colour)
-            textcolour = self.get_i18n_kw(attributes,
-                                          ('textcolour', 'textcolor'),
-                                          default_textcolour)
-            offset_x = attributes.get('offset_x', default_offset_x)
-            offset_y = attributes.get('offset_y', default_offset_y)
-            udata = attributes.get('data', default_data)
-
-            # check values that can be wrong
-            placement = placement.lower()
-            if placement not in self.valid_placements:
-                msg = ("Text placement value is invalid, got '%s'"
-                       % str(placement))
-                raise Exception(msg)
-
-            draw_data.append((float(lon), float(lat), tdata, placement.lower(),
-                              radius, colour, textcolour, fontname, fontsize,
-                              offset_x, offset_y, udata))
+        draw_data = self._text_layer_data(text, map_rel, kwargs)
 
         return self.AddLayer(self.DrawTextLayer, draw_data, map_rel,
                              visible=visible, show_levels=show_levels,
                              selectable=selectable, name=name,
-                             type=self.TypeText)
+                             type=self.TypeText, defaults=kwargs)
 
     def AddPolygonLayer(self, data, map_rel=True, visible=True,
                         show_levels=None, selectable=False,
@@ -845,6 +1521,14 @@ class PySlip(_BufferedCanvas):
                          offset_x    X offset
                          offset_y    Y offset
                          data        polygon user data object
+                     or, with numpy, columnar data: a dictionary with key
+                     'vertices', an array of shape (M, 2) holding the x & y
+                     of all polygons one after the other, key 'offsets',
+                     N+1 increasing indices into 'vertices' where polygon
+                     i is rows offsets[i] to offsets[i+1], and any of the
+                     attribute keys above ('closed' for close) holding a
+                     column of N values or a single value.  Per-polygon
+                     colours must be a list.
         map_rel      points drawn relative to map if True, else view relative
         visible      True if the layer is to be immediately visible
         show_levels  list of levels at which layer is auto-shown (or None)
@@ -862,85 +1546,12 @@ class PySlip(_BufferedCanvas):
                          data        polygon user data object
         """
 
-        # merge global and layer defaults
-        if map_rel:
-            default_placement = kwargs.get('placement',
-                                           self.DefaultPolygonPlacement)
-            default_width = kwargs.get('width', self.DefaultPolygonWidth)
-            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
-                                              self.DefaultPolygonColour)
-            default_close = kwargs.get('closed', self.DefaultPolygonClose)
-            default_filled = kwargs.get('filled', self.DefaultPolygonFilled)
-            default_fillcolour = self.get_i18n_kw(kwargs,
-                                                  ('fillcolour', 'fillcolor'),
-                                                  self.DefaultPolygonFillcolour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultPolygonOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultPolygonOffsetY)
-            default_data = kwargs.get('data', self.DefaultPolygonData)
-        else:
-            default_placement = kwargs.get('placement',
-                                           self.DefaultPolygonViewPlacement)
-            default_width = kwargs.get('width', self.DefaultPolygonViewWidth)
-            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
-                                              self.DefaultPolygonViewColour)
-            default_close = kwargs.get('closed', self.DefaultPolygonViewClose)
-            default_filled = kwargs.get('filled', self.DefaultPolygonViewFilled)
-            default_fillcolour = self.get_i18n_kw(kwargs,
-                                                  ('fillcolour', 'fillcolor'),
-                                                  self.DefaultPolygonViewFillcolour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultPolygonViewOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultPolygonViewOffsetY)
-            default_data = kwargs.get('data', self.DefaultPolygonViewData)
-
-        # create draw_data iterable
-        draw_data = []
-        for d in data:
-            if len(d) == 2:
-                (p, attributes) = d
-            elif len(d) == 1:
-                p = d
-                attributes = {}
-            else:
-                msg = ('Polygon data must be iterable of tuples: '
-                       '(polygon, [attributes])\n'
-                       'Got: %s' % str(d))
-                raise Exception(msg)
-
-            # get polygon attributes
-            placement = attributes.get('placement', default_placement)
-            width = attributes.get('width', default_width)
-            colour = self.get_i18n_kw(attributes, ('colour', 'color'),
-                                      default_colour)
-            close = attributes.get('closed', default_close)
-            filled = attributes.get('filled', default_filled)
-            if filled:
-                close = True
-            fillcolour = self.get_i18n_kw(attributes,
-                                          ('fillcolour', 'fillcolor'),
-                                          default_fillcolour)
-            offset_x = attributes.get('offset_x', default_offset_x)
-            offset_y = attributes.get('offset_y', default_offset_y)
-            udata = attributes.get('data', default_data)
-
-            # if polygon is to be filled, ensure closed
-            if close:
-                p = list(p)     # must get a *copy*
-                p.append(p[0])
-
-            # check values that can be wrong
-            placement = placement.lower()
-            if placement not in self.valid_placements:
-                msg = ("Polygon placement value is invalid, got '%s'"
-                       % str(placement))
-                raise Exception(msg)
-
-            draw_data.append((p, placement, width, colour, close,
-                              filled, fillcolour, offset_x, offset_y, udata))
+        draw_data = self._polygon_layer_data(data, map_rel, kwargs)
 
         return self.AddLayer(self.DrawPolygonLayer, draw_data, map_rel,
                              visible=visible, show_levels=show_levels,
                              selectable=selectable, name=name,
-                             type=self.TypePolygon)
+                             type=self.TypePolygon, defaults=kwargs)
 
     def AddPolylineLayer(self, data, map_rel=True, visible=True,
                         show_levels=None, selectable=False,
@@ -957,6 +1568,13 @@ class PySlip(_BufferedCanvas):
                          offset_x    X offset
                          offset_y    Y offset
                          data        polyline user data object
+                     or, with numpy, columnar data: a dictionary with key
+                     'vertices', an array of shape (M, 2) holding the x & y
+                     of all polylines one after the other, key 'offsets',
+                     N+1 increasing indices into 'vertices' where polyline
+                     i is rows offsets[i] to offsets[i+1], and any of the
+                     attribute keys above holding a column of N values or
+                     a single value.  Per-polyline colours must be a list.
         map_rel      points drawn relative to map if True, else view relative
         visible      True if the layer is to be immediately visible
         show_levels  list of levels at which layer is auto-shown (or None)
@@ -971,66 +1589,15 @@ class PySlip(_BufferedCanvas):
                          data        polygon user data object
         """
 
-        # merge global and layer defaults
-        if map_rel:
-            default_placement = kwargs.get('placement',
-                                           self.DefaultPolygonPlacement)
-            default_width = kwargs.get('width', self.DefaultPolygonWidth)
-            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
-                                              self.DefaultPolygonColour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultPolygonOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultPolygonOffsetY)
-            default_data = kwargs.get('data', self.DefaultPolygonData)
-        else:
-            default_placement = kwargs.get('placement',
-                                           self.DefaultPolygonViewPlacement)
-            default_width = kwargs.get('width', self.DefaultPolygonViewWidth)
-            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
-                                              self.DefaultPolygonViewColour)
-            default_offset_x = kwargs.get('offset_x', self.DefaultPolygonViewOffsetX)
-            default_offset_y = kwargs.get('offset_y', self.DefaultPolygonViewOffsetY)
-            default_data = kwargs.get('data', self.DefaultPolygonViewData)
-
-        # create draw_data iterable
-        draw_data = []
-        for d in data:
-            if len(d) == 2:
-                (p, attributes) = d
-            elif len(d) == 1:
-                p = d
-                attributes = {}
-            else:
-                msg = ('Polyline data must be iterable of tuples: '
-                       '(polyline, [attributes])\n'
-                       'Got: %s' % str(d))
-                raise Exception(msg)
+        draw_data = self._polyline_layer_data(data, map_rel, kwargs)
 
-            # get polygon attributes
-            placement = attributes.get('placement', default_placement)
-            width = attributes.get('width', default_width)
-            colour = self.get_i18n_kw(attributes, ('colour', 'color'),
-                                      default_colour)
-            offset_x = attributes.get('offset_x', default_offset_x)
-            offset_y = attributes.get('offset_y', default_offset_y)
-            udata = attributes.get('data', default_data)
-
-            # check values that can be wrong
-            placement = placement.lower()
-            if placement not in self.valid_placements:
-                msg = ("Polyline placement value is invalid, got '%s'"
-                       % str(placement))
-                raise Exception(msg)
-
-            draw_data.append((p, placement, width, colour,
-                              offset_x, offset_y, udata))
-
-        return self.AddLayer(self.DrawPolylineLayer, draw_data, map_rel,
-                             visible=visible, show_levels=show_levels,
-                             selectable=selectable, name=name,
-                             type=self.TypePolyline)
+        return self.AddLayer(self.DrawPolylineLayer, draw_data, map_rel,
+                             visible=visible, show_levels=show_levels,
+                             selectable=selectable, name=name,
+                             type=self.TypePolyline, defaults=kwargs)
 
     def AddLayer(self, painter, data, map_rel, visible, show_levels,
-                 selectable, name, type):
+                 selectable, name, type, defaults=None):
         """Add a generic layer to the system.
 
         painter      the function used to paint the layer
@@ -1041,6 +1608,7 @@ class PySlip(_BufferedCanvas):
         selectable   True if select operates on this layer
         name         name for this layer
         type         flag for layer 'type'
+        defaults     the layer-specific attributes dictionary, if any
 
         Returns unique ID of the new layer.
         """
@@ -1056,1129 +1624,3200 @@ class PySlip(_BufferedCanvas):
         # create layer, add unique ID to Z order list
         l = _Layer(id=id, painter=painter, data=data, map_rel=map_rel,
                    visible=visible, show_levels=show_levels,
-                   selectable=selectable, name=name, type=type)
+                   selectable=selectable, name=name, type=type,
+                   defaults=defaults)
 
         self.layer_mapping[id] = l
         self.layer_z_order.append(id)
 
         # force display of new layer if it's visible
         if visible:
-            self.Update()
+            self.ScheduleUpdate()
 
         return id
 
     ######
-    # Layer manipulation routines.
+    # Convert user layer data into layer draw data
     ######
 
-    def ShowLayer(self, id):
-        """Show a layer.
+    def _point_layer_data(self, points, map_rel, kwargs):
+        """Convert point layer data into draw data for DrawPointLayer().
 
-        id  the layer id
-        """
+        points   the layer data, as given to AddPointLayer()
+        map_rel  True if the layer is map-relative
+        kwargs   the layer-specific attributes dictionary
 
-        self.layer_mapping[id].visible = True
-        self.Update()
+        Returns the draw data list, or a _PointColumns object for columnar data.
+        """
 
-    def HideLayer(self, id):
-        """Hide a layer.
+        # merge global and layer defaults
+        if map_rel:
+            default_placement = kwargs.get('placement', self.DefaultPointPlacement)
+            default_radius = kwargs.get('radius', self.DefaultPointRadius)
+            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
+                                              self.DefaultPointColour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultPointOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultPointOffsetY)
+            default_data = kwargs.get('data', self.DefaultPointData)
+        else:
+            default_placement = kwargs.get('placement', self.DefaultPointViewPlacement)
+            default_radius = kwargs.get('radius', self.DefaultPointViewRadius)
+            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
+                                              self.DefaultPointViewColour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultPointViewOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultPointViewOffsetY)
+            default_data = kwargs.get('data', self.DefaultPointData)
 
-        id  the layer id
-        """
+        defaults = {'placement': default_placement,
+                    'radius': default_radius,
+                    'colour': default_colour,
+                    'offset_x': default_offset_x,
+                    'offset_y': default_offset_y,
+                    'data': default_data}
+        if isinstance(points, dict) or (np and isinstance(points, np.ndarray)):
+            return self._point_column_data(points, defaults)
 
-        self.layer_mapping[id].visible = False
-        self.Update()
+        # create draw data iterable for draw method
+        draw_data = []              # list to hold draw data
 
-    def DeleteLayer(self, id):
-        """Delete a layer.
+        for pt in points:
+            if len(pt) == 3:
+                (x, y, attributes) = pt
+            elif len(pt) == 2:
+                (x, y) = pt
+                attributes = {}
+            else:
+                msg = ('Point data must be iterable of tuples: '
+                       '(x, y[, dict])\n'
+                       'Got: %s' % str(pt))
+                raise Exception(msg)
 
-        id  the layer id
-        """
+            # plug in any required polygon values (override globals+layer)
+            placement = attributes.get('placement', default_placement)
+            radius = attributes.get('radius', default_radius)
+            colour = self.get_i18n_kw(attributes, ('colour', 'color'),
+                                      default_colour)
+            offset_x = attributes.get('offset_x', default_offset_x)
+            offset_y = attributes.get('offset_y', default_offset_y)
+            udata = attributes.get('data', default_data)
 
-        # just in case we got None
-        if id:
-            # see if what we are about to remove might be visible
-            layer = self.layer_mapping[id]
-            visible = layer.visible
+            # check values that can be wrong
+            placement = self._check_placement(placement, 'Point')
 
-            del layer
-            self.layer_z_order.remove(id)
+            # append another point to draw data list
+            style = self.style_pool.intern((radius, colour))
+            draw_data.append((float(x), float(y), placement,
+                              style, offset_x, offset_y, udata))
 
-            # if layer was visible, refresh display
-            if visible:
-                self.Update()
+        return draw_data
 
-    def SetLayerShowLevels(self, id, show_levels=None):
-        """Update the show_levels list for a layer.
+    def _point_column_data(self, points, defaults):
+        """Convert columnar point layer data into draw data.
 
-        id           ID of the layer we are going to update
-        show_levels  new layer show list
+        points    a numpy (N, 2) array or a dictionary of columns, as given
+                  to AddPointLayer()
+        defaults  dictionary of attribute values for missing columns
 
-        If 'show_levels' is None reset the displayable levels to
-        all levels in the current tileset.
+        Returns the draw data as a _PointColumns object.
         """
 
-        # if we actually got an 'id' change the .show_levels value
-        if id:
-            layer = self.layer_mapping[id]
+        if np is None:
+            raise Exception('Columnar point data needs numpy')
 
-            # if not given a 'show_levels' show all levels available
-            if not show_levels:
-                show_levels = range(self.tiles_min_level,
-                                    self.tiles_max_level+1)[:]
+        if isinstance(points, dict):
+            columns = self._merge_columns(points, defaults)
+        else:
+            points = np.asarray(points)
+            columns = dict(defaults, x=points[:,0], y=points[:,1])
+
+        x = self._column(columns, 'x', len(columns['x']), np.float64)
+        num = len(x)
+        y = self._column(columns, 'y', num, np.float64)
+        place = self._column_placements(columns, num, 'Point')
+        style = self._column_styles(columns, ('radius', 'colour'), num)
+        (udata, default_udata) = self._column_udata(columns, num)
+
+        return _PointColumns(x, y, place, style,
+                             self._column(columns, 'offset_x', num),
+                             self._column(columns, 'offset_y', num),
+                             udata, default_udata)
+
+    def _shape_column_data(self, shapes, defaults, style_keys, kind):
+        """Convert columnar polygon or polyline layer data into draw data.
+
+        shapes      a dictionary of columns, as given to AddPolygonLayer()
+                    or AddPolylineLayer()
+        defaults    dictionary of attribute values for missing columns
+        style_keys  the column keys making up a style tuple
+        kind        'Polygon' or 'Polyline', for error messages
+
+        Returns the draw data as a _ShapeColumns object.
+        """
 
-            layer.show_levels = show_levels
+        if np is None:
+            raise Exception('Columnar %s data needs numpy' % kind.lower())
+
+        columns = self._merge_columns(shapes, defaults)
+
+        vertices = np.asarray(columns['vertices'], dtype=np.float64)
+        offsets = np.asarray(columns['offsets'])
+        if vertices.ndim != 2 or vertices.shape[1] != 2:
+            msg = '%s vertices must be an array of shape (M, 2)' % kind
+            raise Exception(msg)
+        if (len(offsets) < 1 or offsets[0] != 0
+                or offsets[-1] != len(vertices)
+                or np.any(offsets[1:] <= offsets[:-1])):
+            msg = ('%s offsets must rise from 0 to the number of vertices'
+                   % kind)
+            raise Exception(msg)
+        num = len(offsets) - 1
+
+        if 'filled' in style_keys:
+            # a filled polygon is closed
+            columns['closed'] = np.logical_or(
+                                    self._column(columns, 'closed', num),
+                                    self._column(columns, 'filled', num))
+
+        place = self._column_placements(columns, num, kind)
+        style = self._column_styles(columns, style_keys, num)
+        (udata, default_udata) = self._column_udata(columns, num)
+
+        return _ShapeColumns(vertices, offsets[:-1], offsets[1:], place, style,
+                             self._column(columns, 'offset_x', num),
+                             self._column(columns, 'offset_y', num),
+                             udata, default_udata)
 
-            # always update the display, there may be a change
-            self.Update()
+    @staticmethod
+    def _merge_columns(columns, defaults):
+        """Fill in missing columns of columnar layer data from defaults.
 
-    def SetLayerSelectable(self, id, selectable=False):
-        """Update the .selectable attribute for a layer.
+        columns   dictionary of columns given by the user
+        defaults  dictionary of attribute default values
 
-        id          ID of the layer we are going to update
-        selectable  new .selectable attribute value (True or False)
+        Returns a new dictionary.  American spellings of colour keys are
+        accepted.
         """
 
-        # just in case id is None
-        if id:
-            layer = self.layer_mapping[id]
-            layer.selectable = selectable
-
-    ######
-    # Play with layers Z order
-    ######
-
-    def PushLayerToBack(self, id):
-        """Make layer specified be drawn at back of Z order.
+        result = dict(defaults)
+        result.update(columns)
+        for (key, alias) in (('colour', 'color'), ('fillcolour', 'fillcolor')):
+            if alias in columns:
+                result[key] = columns[alias]
 
-        id  ID of the layer to push to the back
-        """
+        return result
 
-        self.layer_z_order.remove(id)
-        self.layer_z_order.insert(0, id)
-        self.Update()
+    @staticmethod
+    def _column(columns, key, num, dtype=None):
+        """Get one column of columnar layer data as a numpy array.
 
-    def PopLayerToFront(self, id):
-        """Make layer specified be drawn at front of Z order.
+        columns  dictionary of columns, with defaults filled in
+        key      the column key
+        num      the number of layer objects
+        dtype    the numpy type of the array, None to keep the given type
 
-        id  ID of the layer to pop to the front
+        A single value is repeated for all objects without using memory.
+        Raises an exception if a column has the wrong length.
         """
 
-        self.layer_z_order.remove(id)
-        self.layer_z_order.append(id)
-        self.Update()
-
-    def PlaceLayerBelowLayer(self, id, top_id):
-        """Place a layer so it will be drawn behind another layer.
+        value = columns[key]
+        if not isinstance(value, (list, np.ndarray)):
+            return np.broadcast_to(np.array([value], dtype=dtype), (num,))
 
-        id      ID of layer to place underneath 'top_id'
-        top_id  ID of layer to be drawn *above* 'id'
-        """
+        if len(value) != num:
+            msg = ("'%s' column has %d values, expected %d"
+                   % (key, len(value), num))
+            raise Exception(msg)
+        if dtype is object:
+            return value
+        return np.asarray(value, dtype=dtype)
 
-        self.layer_z_order.remove(id)
-        i = self.layer_z_order.index(top_id)
-        self.layer_z_order.insert(i, id)
-        self.Update()
+    def _column_placements(self, columns, num, kind):
+        """Get the placement codes of columnar layer data.
 
-    ######
-    # Layer drawing routines
-    ######
+        columns  dictionary of columns, with defaults filled in
+        num      the number of layer objects
+        kind     'Point', 'Polygon', etc, for error messages
 
-    def DrawPointLayer(self, dc, data, map_rel):
-        """Draw a points layer.
+        Each distinct placement is checked once, as for list data.
 
-        dc       the device context to draw on
-        data     an iterable of point tuples:
-                     (x, y, place, radius, colour, x_off, y_off, udata)
-        map_rel  points relative to map if True, else relative to view
+        Returns an int8 array of _LayerColumns.Placements indices.
         """
 
-        # allow transparent colours
-        dc = wx.GCDC(dc)
+        placement = columns['placement']
+        if isinstance(placement, (list, np.ndarray)):
+            column = np.asarray(self._column(columns, 'placement', num))
+            if column.dtype.kind in 'SU':
+                (places, place) = np.unique(column, return_inverse=True)
+            else:
+                # mixed values such as None, number them as they appear
+                seen = {}
+                place = np.array([seen.setdefault(p, len(seen))
+                                  for p in column.tolist()], dtype=np.int64)
+                places = sorted(seen, key=seen.get)
+        else:
+            (places, place) = ([placement], np.zeros(num, dtype=np.int64))
 
-        # get correct pex function
-        pex = self.PexPointView
-        if map_rel:
-            pex = self.PexPoint
+        codes = []
+        for placement in places:
+            # None and False mean no placement, stored as ''
+            placement = self._check_placement(placement, kind) or ''
+            codes.append(_LayerColumns.Placements.index(placement))
 
-        # draw points on map/view
-        cache_colour = None     # speed up drawing mostly not changing colours
+        return np.array(codes, dtype=np.int8)[place]
 
-        for (x, y, place, radius, colour, x_off, y_off, udata) in data:
-            (pt, ex) = pex(place, (x,y), x_off, y_off, radius)
-            if ex and radius:  # don't draw if not on screen or zero radius
-                if cache_colour != colour:
-                    dc.SetPen(wx.Pen(colour))
-                    cache_colour = colour
-                    dc.SetBrush(wx.Brush(colour))
-                (x, _, y, _) = ex
-                dc.DrawCircle(x+radius, y+radius, radius)
+    def _check_placement(self, placement, kind):
+        """Normalise and check a placement value.
 
-    def DrawImageLayer(self, dc, images, map_rel):
-        """Draw an image Layer on the view.
+        placement  the placement value from the layer data
+        kind       'Point', 'Polygon', etc, for error messages
 
-        dc       the device context to draw on
-        images   a sequence of image tuple sequences
-                   (x,y,bmap,w,h,placement,offset_x,offset_y,idata)
-        map_rel  points relative to map if True, else relative to view
+        Returns the lowercase placement, or None or False unchanged.
+        Raises an exception if the placement is invalid.
         """
 
-        # allow transparent colours
-        dc = wx.GCDC(dc)
-
-        # get correct pex function
-        pex = self.PexExtentView
-        if map_rel:
-            pex = self.PexExtent
+        if isinstance(placement, basestring):
+            placement = placement.lower()
+        if placement not in self.valid_placements:
+            msg = ("%s placement value is invalid, got '%s'"
+                   % (kind, str(placement)))
+            raise Exception(msg)
+        return placement
 
-        # draw the images
-        cache_colour = None     # speed up drawing mostly unchanging colours
+    def _column_styles(self, columns, keys, num):
+        """Get the style pool indices of columnar layer data.
 
-        for (lon, lat, bmap, w, h, place,
-                 x_off, y_off, radius, colour, idata) in images:
-            (pt, ex) = pex(place, (lon, lat), x_off, y_off, w, h)
-            if ex:
-                (ix, _, iy, _) = ex
-                dc.DrawBitmap(bmap, ix, iy, False)
+        columns  dictionary of columns, with defaults filled in
+        keys     the column keys making up a style tuple, in order
+        num      the number of layer objects
 
-            if pt and radius:
-                if cache_colour != colour:
-                    dc.SetPen(wx.Pen(colour))
-                    dc.SetBrush(wx.Brush(colour))
-                    cache_colour = colour
-                (px, py) = pt
-                dc.DrawCircle(px, py, radius)
+        Each column is reduced to codes of its distinct values, and each
+        distinct combination of codes is interned once.  Colour columns
+        must be lists.
 
-    def DrawTextLayer(self, dc, text, map_rel):
-        """Draw a text Layer on the view.
+        Returns an int32 array of style indices.
+        """
 
-        dc       the device context to draw on
-        text     a sequence of tuples:
-                     (lon, lat, tdata, placement, radius, colour, fontname,
-                      fontsize, offset_x, offset_y, tdata)
-        map_rel  points relative to map if True, else relative to view
+        if num == 0:
+            return np.zeros(0, dtype=np.int32)
+
+        codes = []
+        values = []
+        for key in keys:
+            value = columns[key]
+            if isinstance(value, np.ndarray) and value.dtype != object:
+                (distinct, code) = np.unique(self._column(columns, key, num),
+                                             return_inverse=True)
+                distinct = distinct.tolist()
+            elif isinstance(value, (list, np.ndarray)):
+                value = self._column(columns, key, num, object)
+                index = {}
+                distinct = []
+                code = np.empty(num, dtype=np.int64)
+                for (i, v) in enumerate(value):
+                    k = _StylePool.colour_key(v)
+                    if k not in index:
+                        index[k] = len(distinct)
+                        distinct.append(v)
+                    code[i] = index[k]
+            else:
+                (distinct, code) = ([value], np.zeros(num, dtype=np.int64))
+            codes.append(code)
+            values.append(distinct)
+
+        # number the distinct combinations of codes
+        combined = np.zeros(num, dtype=np.int64)
+        for code in codes:
+            (_, combined) = np.unique(combined*(code.max() + 1) + code,
+                                      return_inverse=True)
+        (_, first, style) = np.unique(combined, return_index=True,
+                                      return_inverse=True)
+
+        styles = []
+        for i in first.tolist():
+            style_tuple = tuple([distinct[code[i]]
+                                 for (code, distinct) in zip(codes, values)])
+            styles.append(self.style_pool.intern(style_tuple))
+
+        return np.array(styles, dtype=np.int32)[style]
+
+    def _column_udata(self, columns, num):
+        """Get the user data of columnar layer data.
+
+        columns  dictionary of columns, with defaults filled in
+        num      the number of layer objects
+
+        A list or numpy array, or a tuple with one value per object, holds
+        per-object user data.  Anything else is the user data of all
+        objects.
+
+        Returns a tuple (udata, default_udata) where 'udata' is an object
+        array of per-object user data or None, and 'default_udata' the user
+        data of all objects if 'udata' is None.
         """
 
-        # we need the size of the DC
-        dc = wx.GCDC(dc)		# allow transparent colours
+        udata = columns['data']
+        if isinstance(udata, tuple) and len(udata) == num:
+            udata = list(udata)
+        elif not isinstance(udata, (list, np.ndarray)):
+            return (None, udata)
 
-        # get correct pex function for mode (map/view)
-        pex = self.PexExtentView
-        if map_rel:
-            pex = self.PexExtent
+        values = self._column({'data': udata}, 'data', num, object)
+        if isinstance(values, np.ndarray):
+            if values.dtype == object and values.ndim == 1:
+                return (values, None)
+            values = values.tolist()    # python values, not numpy scalars
 
-        # draw text on map/view
-        cache_textcolour = None # speed up mostly unchanging data
-        cache_font = None
-        cache_colour = None
+        udata = np.empty(num, dtype=object)
+        for (i, value) in enumerate(values):
+            udata[i] = value
 
-        for (lon, lat, tdata, place, radius, colour,
-                textcolour, fontname, fontsize, x_off, y_off, data) in text:
+        return (udata, None)
 
-            # set font characteristics so we calculate text width/height
-            if cache_textcolour != textcolour:
-                dc.SetTextForeground(textcolour)
-                cache_textcolour = textcolour
+    def _image_layer_data(self, data, map_rel, kwargs):
+        """Convert image layer data into draw data for DrawImageLayer().
 
-            if cache_font != (fontname, fontsize):
-                font = wx.Font(fontsize, wx.SWISS, wx.NORMAL, wx.NORMAL,
-                               False, fontname)
-                dc.SetFont(font)
-                cache_font = (fontname, fontsize)
+        data     the layer data, as given to AddImageLayer()
+        map_rel  True if the layer is map-relative
+        kwargs   the layer-specific attributes dictionary
 
-            (w, h, _, _) = dc.GetFullTextExtent(tdata)
+        Returns the draw data list.
+        """
 
-            # get point + extent information (each can be None if off-view)
-            (pt, ex) = pex(place, (lon, lat), x_off, y_off, w, h)
-            if ex:
-                (lx, _, ty, _) = ex
-                dc.DrawText(tdata, lx, ty)
+        # merge global and layer defaults
+        if map_rel:
+            default_placement = kwargs.get('placement', self.DefaultImagePlacement)
+            default_radius = kwargs.get('radius', self.DefaultImageRadius)
+            default_colour = kwargs.get('colour', self.DefaultImageColour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultImageOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultImageOffsetY)
+            default_data = kwargs.get('data', self.DefaultImageData)
+        else:
+            default_placement = kwargs.get('placement', self.DefaultImageViewPlacement)
+            default_radius = kwargs.get('radius', self.DefaultImageViewRadius)
+            default_colour = kwargs.get('colour', self.DefaultImageViewColour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultImageViewOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultImageViewOffsetY)
+            default_data = kwargs.get('data', self.DefaultImageViewData)
 
-            if pt and radius:
-                (x, y) = pt
-                if cache_colour != colour:
-                    dc.SetPen(wx.Pen(colour))
-                    dc.SetBrush(wx.Brush(colour))
-                dc.DrawCircle(x, y, radius)
+        # define cache variables for the image informtion
+        # used to minimise file access - just caches previous file informtion
+        fname_cache = None
+        bmp_cache = None
+        w_cache = None
+        h_cache = None
 
-    def DrawPolygonLayer(self, dc, data, map_rel):
-        """Draw a polygon layer.
+        # load all image files, convert to bitmaps, create draw_data iterable
+        draw_data = []
+        for d in data:
+            if len(d) == 4:
+                (lon, lat, fname, attributes) = d
+            elif len(d) == 3:
+                (lon, lat, fname) = d
+                attributes = {}
+            else:
+                msg = ('Image data must be iterable of tuples: '
+                       '(x, y, fname[, dict])\nGot: %s' % str(d))
+                raise Exception(msg)
 
-        dc       the device context to draw on
-        data     an iterable of polygon tuples:
-                     (p, placement, width, colour, closed,
-                      filled, fillcolour, offset_x, offset_y, udata)
-                 where p is an iterable of points: (x, y)
-        map_rel  points relative to map if True, else relative to view
-        """
+            # get image specific values, if any
+            placement = attributes.get('placement', default_placement)
+            radius = attributes.get('radius', default_radius)
+            colour = attributes.get('colour', default_colour)
+            offset_x = attributes.get('offset_x', default_offset_x)
+            offset_y = attributes.get('offset_y', default_offset_y)
+            udata = attributes.get('data', None)
 
-        # allow transparent colours
-        dc = wx.GCDC(dc)
+            if fname == fname_cache:
+                bmap = bmp_cache
+                w = w_cache
+                h = h_cache
+            else:
+                fname_cache = fname
+                img = wx.Image(fname, wx.BITMAP_TYPE_ANY)
+                bmp_cache = bmap = img.ConvertToBitmap()
+                (w, h) = bmap.GetSize()
+                w_cache = w
+                h_cache = h
 
-        # get the correct pex function for mode (map/view)
-        pex = self.PexPolygonView
-        if map_rel:
-            pex = self.PexPolygon
+            # check values that can be wrong
+            placement = self._check_placement(placement, 'Image')
 
-        # draw polygons
-        cache_colour_width = None     # speed up mostly unchanging data
-        cache_fillcolour = None
+            style = self.style_pool.intern((radius, colour))
+            draw_data.append((float(lon), float(lat), bmap, w, h, placement,
+                              offset_x, offset_y, style, udata))
 
-        for (p, place, width, colour, closed,
-                 filled, fillcolour, x_off, y_off, udata) in data:
-            (poly, extent) = pex(place, p, x_off, y_off)
-            if poly:
-                if cache_colour_width != (colour, width):
-                    dc.SetPen(wx.Pen(colour, width=width))
-                    cache_colour = (colour, width)
-
-                if filled:
-                    if cache_fillcolour != fillcolour:
-                        dc.SetBrush(wx.Brush(fillcolour))
-                        cache_fillcolour = fillcolour
-                else:
-                    dc.SetBrush(wx.TRANSPARENT_BRUSH)
+        return draw_data
 
-                if closed:
-                    dc.DrawPolygon(poly)
-                else:
-                    dc.DrawLines(poly)
+    def _text_layer_data(self, text, map_rel, kwargs):
+        """Convert text layer data into draw data for DrawTextLayer().
 
-    def DrawPolylineLayer(self, dc, data, map_rel):
-        """Draw a polyline layer.
+        text     the layer data, as given to AddTextLayer()
+        map_rel  True if the layer is map-relative
+        kwargs   the layer-specific attributes dictionary
 
-        dc       the device context to draw on
-        data     an iterable of polyline tuples:
-                     (p, placement, width, colour, offset_x, offset_y, udata)
-                 where p is an iterable of points: (x, y)
-        map_rel  points relative to map if True, else relative to view
+        Returns the draw data list.
         """
 
-        # allow transparent colours
-        dc = wx.GCDC(dc)
-
-        # get the correct pex function for mode (map/view)
-        pex = self.PexPolygonView
+        # merge global and layer defaults
         if map_rel:
-            pex = self.PexPolygon
+            default_placement = kwargs.get('placement', self.DefaultTextPlacement)
+            default_radius = kwargs.get('radius', self.DefaultTextRadius)
+            default_fontname = kwargs.get('fontname', self.DefaultTextFontname)
+            default_fontsize = kwargs.get('fontsize', self.DefaultTextFontSize)
+            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
+                                              self.DefaultTextColour)
+            default_textcolour = self.get_i18n_kw(kwargs,
+                                                  ('textcolour', 'textcolor'),
+                                                  self.DefaultTextTextColour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultTextOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultTextOffsetY)
+            default_data = kwargs.get('data', self.DefaultTextData)
+        else:
+            default_placement = kwargs.get('placement', self.DefaultTextViewPlacement)
+            default_radius = kwargs.get('radius', self.DefaultTextViewRadius)
+            default_fontname = kwargs.get('fontname', self.DefaultTextViewFontname)
+            default_fontsize = kwargs.get('fontsize', self.DefaultTextViewFontSize)
+            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
+                                              self.DefaultTextViewColour)
+            default_textcolour = self.get_i18n_kw(kwargs,
+                                                  ('textcolour', 'textcolor'),
+                                                  self.DefaultTextViewTextColour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultTextViewOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultTextViewOffsetY)
+            default_data = kwargs.get('data', self.DefaultTextData)
 
-        # draw polyline(s)
-        cache_colour_width = None       # speed up mostly unchanging data
+        # DC used to measure text extents
+        measure_mdc = wx.MemoryDC(wx.EmptyBitmap(1, 1))
+        measure_dc = wx.GCDC(measure_mdc)
+        measure_font = None
 
-        for (p, place, width, colour, x_off, y_off, udata) in data:
-            (poly, extent) = pex(place, p, x_off, y_off)
-            if poly:
-                if cache_colour_width != (colour, width):
-                    dc.SetPen(wx.Pen(colour, width=width))
-                    cache_colour_width = (colour, width)
-                dc.SetBrush(wx.TRANSPARENT_BRUSH)
-                dc.DrawLines(poly)
+        # create data iterable ready for drawing
+        draw_data = []
+        for t in text:
+            if len(t) == 4:
+                (lon, lat, tdata, attributes) = t
+            elif len(t) == 3:
+                (lon, lat, tdata) = t
+                attributes = {}
+            else:
+                msg = ('Text data must be iterable of tuples: '
+                       '(lon, lat, text, [dict])\n'
+                       'Got: %s' % str(t))
+                raise Exception(msg)
 
-######
-# Positioning methods
-######
+            # plug in any required defaults
+            placement = attributes.get('placement', default_placement)
+            radius = attributes.get('radius', default_radius)
+            fontname = attributes.get('fontname', default_fontname)
+            fontsize = attributes.get('fontsize', default_fontsize)
+            colour = self.get_i18n_kw(attributes, ('colour', 'color'),
+                                      default_colour)
+            textcolour = self.get_i18n_kw(attributes,
+                                          ('textcolour', 'textcolor'),
+                                          default_textcolour)
+            offset_x = attributes.get('offset_x', default_offset_x)
+            offset_y = attributes.get('offset_y', default_offset_y)
+            udata = attributes.get('data', default_data)
 
-    def GotoLevel(self, level):
-        """Use a new tile level.
+            # check values that can be wrong
+            placement = self._check_placement(placement, 'Text')
 
-        level  the new tile level to use.
+            # text extent doesn't change, so get it now
+            if measure_font != (fontname, fontsize):
+                measure_dc.SetFont(self.TextFont(fontname, fontsize))
+                measure_font = (fontname, fontsize)
+            (w, h, _, _) = measure_dc.GetFullTextExtent(tdata)
 
-        Returns True if all went well.
+            style = self.style_pool.intern((radius, colour, textcolour,
+                                            fontname, fontsize))
+            draw_data.append((float(lon), float(lat), tdata, placement,
+                              style, offset_x, offset_y, w, h, udata))
+
+        return draw_data
+
+    def _polygon_layer_data(self, data, map_rel, kwargs):
+        """Convert polygon layer data into draw data for DrawPolygonLayer().
+
+        data     the layer data, as given to AddPolygonLayer()
+        map_rel  True if the layer is map-relative
+        kwargs   the layer-specific attributes dictionary
+
+        Returns the draw data list, or a _ShapeColumns object for columnar data.
         """
 
-        if not self.tile_src.UseLevel(level):
-            return False        # couldn't change level
+        # merge global and layer defaults
+        if map_rel:
+            default_placement = kwargs.get('placement',
+                                           self.DefaultPolygonPlacement)
+            default_width = kwargs.get('width', self.DefaultPolygonWidth)
+            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
+                                              self.DefaultPolygonColour)
+            default_close = kwargs.get('closed', self.DefaultPolygonClose)
+            default_filled = kwargs.get('filled', self.DefaultPolygonFilled)
+            default_fillcolour = self.get_i18n_kw(kwargs,
+                                                  ('fillcolour', 'fillcolor'),
+                                                  self.DefaultPolygonFillcolour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultPolygonOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultPolygonOffsetY)
+            default_data = kwargs.get('data', self.DefaultPolygonData)
+        else:
+            default_placement = kwargs.get('placement',
+                                           self.DefaultPolygonViewPlacement)
+            default_width = kwargs.get('width', self.DefaultPolygonViewWidth)
+            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
+                                              self.DefaultPolygonViewColour)
+            default_close = kwargs.get('closed', self.DefaultPolygonViewClose)
+            default_filled = kwargs.get('filled', self.DefaultPolygonViewFilled)
+            default_fillcolour = self.get_i18n_kw(kwargs,
+                                                  ('fillcolour', 'fillcolor'),
+                                                  self.DefaultPolygonViewFillcolour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultPolygonViewOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultPolygonViewOffsetY)
+            default_data = kwargs.get('data', self.DefaultPolygonViewData)
 
-        self.level = level
-        self.map_width = self.tile_src.num_tiles_x * self.tile_src.tile_size_x
-        self.map_height = self.tile_src.num_tiles_y * self.tile_src.tile_size_y
-        (self.map_llon, self.map_rlon,
-         self.map_blat, self.map_tlat) = self.tile_src.extent
+        if isinstance(data, dict):
+            defaults = {'placement': default_placement,
+                        'width': default_width,
+                        'colour': default_colour,
+                        'closed': default_close,
+                        'filled': default_filled,
+                        'fillcolour': default_fillcolour,
+                        'offset_x': default_offset_x,
+                        'offset_y': default_offset_y,
+                        'data': default_data}
+            return self._shape_column_data(data, defaults,
+                                           ('width', 'colour', 'closed',
+                                            'filled', 'fillcolour'),
+                                           'Polygon')
 
-        # to set some state variables
-        self.OnSize()
+        # create draw_data iterable
+        draw_data = []
+        for d in data:
+            if len(d) == 2:
+                (p, attributes) = d
+            elif len(d) == 1:
+                p = d
+                attributes = {}
+            else:
+                msg = ('Polygon data must be iterable of tuples: '
+                       '(polygon, [attributes])\n'
+                       'Got: %s' % str(d))
+                raise Exception(msg)
 
-        # raise level change event
-        self.RaiseEventLevel(level)
+            # get polygon attributes
+            placement = attributes.get('placement', default_placement)
+            width = attributes.get('width', default_width)
+            colour = self.get_i18n_kw(attributes, ('colour', 'color'),
+                                      default_colour)
+            close = attributes.get('closed', default_close)
+            filled = attributes.get('filled', default_filled)
+            if filled:
+                close = True
+            fillcolour = self.get_i18n_kw(attributes,
+                                          ('fillcolour', 'fillcolor'),
+                                          default_fillcolour)
+            offset_x = attributes.get('offset_x', default_offset_x)
+            offset_y = attributes.get('offset_y', default_offset_y)
+            udata = attributes.get('data', default_data)
 
-        return True
+            # if polygon is to be filled, ensure closed
+            if close:
+                p = list(p)     # must get a *copy*
+                p.append(p[0])
 
-    def GotoPosition(self, geo):
-        """Set view to centre on a geo position in the current level.
+            # check values that can be wrong
+            placement = self._check_placement(placement, 'Polygon')
 
-        geo  a tuple (xgeo,ygeo) to centre view on
+            style = self.style_pool.intern((width, colour, close,
+                                            filled, fillcolour))
+            draw_data.append((p, placement, style, offset_x, offset_y, udata))
 
-        Sets self.view_offset_x and self.view_offset_y and then calls
-        RecalcViewLimits(), redraws widget.
+        return draw_data
+
+    def _polyline_layer_data(self, data, map_rel, kwargs):
+        """Convert polyline layer data into draw data for DrawPolylineLayer().
+
+        data     the layer data, as given to AddPolylineLayer()
+        map_rel  True if the layer is map-relative
+        kwargs   the layer-specific attributes dictionary
+
+        Returns the draw data list, or a _ShapeColumns object for columnar data.
         """
 
-        # get fractional tile coords of required centre of view
-        (xtile, ytile) = self.tile_src.Geo2Tile(geo)
+        # merge global and layer defaults
+        if map_rel:
+            default_placement = kwargs.get('placement',
+                                           self.DefaultPolygonPlacement)
+            default_width = kwargs.get('width', self.DefaultPolygonWidth)
+            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
+                                              self.DefaultPolygonColour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultPolygonOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultPolygonOffsetY)
+            default_data = kwargs.get('data', self.DefaultPolygonData)
+        else:
+            default_placement = kwargs.get('placement',
+                                           self.DefaultPolygonViewPlacement)
+            default_width = kwargs.get('width', self.DefaultPolygonViewWidth)
+            default_colour = self.get_i18n_kw(kwargs, ('colour', 'color'),
+                                              self.DefaultPolygonViewColour)
+            default_offset_x = kwargs.get('offset_x', self.DefaultPolygonViewOffsetX)
+            default_offset_y = kwargs.get('offset_y', self.DefaultPolygonViewOffsetY)
+            default_data = kwargs.get('data', self.DefaultPolygonViewData)
 
-        # now calculate view offsets, top, left, bottom and right
-        half_width = self.view_width / 2
-        centre_pixels_from_map_left = int(xtile * self.tile_size_x)
-        self.view_offset_x = centre_pixels_from_map_left - half_width
+        if isinstance(data, dict):
+            defaults = {'placement': default_placement,
+                        'width': default_width,
+                        'colour': default_colour,
+                        'offset_x': default_offset_x,
+                        'offset_y': default_offset_y,
+                        'data': default_data}
+            return self._shape_column_data(data, defaults,
+                                           ('width', 'colour'), 'Polyline')
 
-        half_height = self.view_height / 2
-        centre_pixels_from_map_top = int(ytile * self.tile_size_y)
-        self.view_offset_y = centre_pixels_from_map_top - half_height
+        # create draw_data iterable
+        draw_data = []
+        for d in data:
+            if len(d) == 2:
+                (p, attributes) = d
+            elif len(d) == 1:
+                p = d
+                attributes = {}
+            else:
+                msg = ('Polyline data must be iterable of tuples: '
+                       '(polyline, [attributes])\n'
+                       'Got: %s' % str(d))
+                raise Exception(msg)
 
-        # set the left/right/top/bottom lon/lat extents and redraw view
-        self.RecalcViewLimits()
-        self.Update()
+            # get polygon attributes
+            placement = attributes.get('placement', default_placement)
+            width = attributes.get('width', default_width)
+            colour = self.get_i18n_kw(attributes, ('colour', 'color'),
+                                      default_colour)
+            offset_x = attributes.get('offset_x', default_offset_x)
+            offset_y = attributes.get('offset_y', default_offset_y)
+            udata = attributes.get('data', default_data)
 
-    def GotoLevelAndPosition(self, level, geo):
-        """Goto a map level and set view to centre on a position.
+            # check values that can be wrong
+            placement = self._check_placement(placement, 'Polyline')
 
-        level  the map level to use
-        geo    a tuple (xgeo,ygeo) to centre view on
+            style = self.style_pool.intern((width, colour))
+            draw_data.append((p, placement, style, offset_x, offset_y, udata))
+
+        return draw_data
+
+    ######
+    # Layer manipulation routines.
+    ######
+
+    def ShowLayer(self, id):
+        """Show a layer.
+
+        id  the layer id
+        """
+
+        self.layer_mapping[id].visible = True
+        self.ScheduleUpdate()
+
+    def HideLayer(self, id):
+        """Hide a layer.
+
+        id  the layer id
+        """
+
+        self.layer_mapping[id].visible = False
+        self.ScheduleUpdate()
+
+    def DeleteLayer(self, id):
+        """Delete a layer.
+
+        id  the layer id
+        """
+
+        # just in case we got None
+        if id:
+            # see if what we are about to remove might be visible
+            layer = self.layer_mapping[id]
+            visible = layer.visible
+
+            # keep any on-disk overlay tiles for the next session
+            self.overlay_cache.forget_layer(id, disk=False)
+            self.overlay_cache.set_layer_dir(id, None)
+
+            del layer
+            self.layer_z_order.remove(id)
+
+            # if layer was visible, refresh display
+            if visible:
+                self.ScheduleUpdate()
+
+    def SetLayerShowLevels(self, id, show_levels=None):
+        """Update the show_levels list for a layer.
+
+        id           ID of the layer we are going to update
+        show_levels  new layer show list
+
+        If 'show_levels' is None reset the displayable levels to
+        all levels in the current tileset.
+        """
+
+        # if we actually got an 'id' change the .show_levels value
+        if id:
+            layer = self.layer_mapping[id]
+
+            # if not given a 'show_levels' show all levels available
+            if not show_levels:
+                show_levels = range(self.tiles_min_level,
+                                    self.tiles_max_level+1)[:]
+
+            layer.show_levels = show_levels
+
+            # always update the display, there may be a change
+            self.ScheduleUpdate()
+
+    def SetLayerSelectable(self, id, selectable=False):
+        """Update the .selectable attribute for a layer.
+
+        id          ID of the layer we are going to update
+        selectable  new .selectable attribute value (True or False)
+        """
+
+        # just in case id is None
+        if id:
+            layer = self.layer_mapping[id]
+            layer.selectable = selectable
+
+    def SetLayerCached(self, id, cached=True):
+        """Update the .cached attribute for a layer.
+
+        id      ID of the layer we are going to update
+        cached  True if the layer is drawn from a raster cache
+
+        A cached map-relative layer is rendered once into a bitmap covering
+        the view plus a margin of LayerCacheMargin pixels.  That bitmap is
+        reused while panning inside the margin and re-rendered only on a
+        level change, a change to the layer data or when the view leaves the
+        cached area.  Ignored for view-relative layers.
+        """
+
+        # just in case id is None
+        if id:
+            layer = self.layer_mapping[id]
+            layer.cached = cached
+            self._invalidate_layer(layer)
+
+    def SetLayerTileCached(self, id, cached=True, cache_dir=None):
+        """Update the .tile_cached attribute for a layer.
+
+        id         ID of the layer we are going to update
+        cached     True if the layer is drawn from overlay tiles
+        cache_dir  directory to persist overlay tiles in (None: memory only)
+
+        A tile cached map-relative layer is rasterized into transparent
+        bitmaps aligned with the map tiles, one per (layer, level, x, y).
+        These are kept in an LRU cache like the map tiles and, if
+        'cache_dir' is given, saved on disk for use in later sessions.  The
+        directory must be specific to the layer data and the tileset.
+        ChangeTileset() detaches the directory, call this again with a
+        directory for the new tileset to keep persisting overlay tiles.
+        Ignored for view-relative layers.
+        """
+
+        # just in case id is None
+        if id:
+            layer = self.layer_mapping[id]
+            self.overlay_cache.forget_layer(id, disk=False)
+            self.overlay_cache.set_layer_dir(id, cache_dir)
+            layer.tile_cached = cached
+
+    def SetLayerRaster(self, id, raster=True):
+        """Update the .raster attribute for a point layer.
+
+        id      ID of the layer we are going to update
+        raster  True if the layer is drawn by the numpy rasterizer
+
+        A raster layer is projected with numpy and its points stamped into
+        one RGBA buffer that is drawn as a single bitmap.  This is much
+        faster than the wx painter for very large point layers.  Needs
+        numpy.
+        """
+
+        # just in case id is None
+        if id:
+            layer = self.layer_mapping[id]
+            if raster:
+                if np is None:
+                    raise Exception('Raster point layers need numpy')
+                if layer.type != self.TypePoint:
+                    raise Exception('Only point layers can be raster layers')
+            layer.raster = raster
+            self._invalidate_layer(layer)
+            self.ScheduleUpdate()
+
+    def SetParallelRaster(self, parallel=True, threads=None):
+        """Set parallel rasterizing of raster layers on or off.
+
+        parallel  True if raster layers are rasterized in parallel
+        threads   number of worker threads (default: number of CPUs)
+
+        When on, a redraw rasterizes all visible map-relative raster layers
+        at the same time in a pool of threads and then draws them in Z
+        order.  The rasterizer spends its time in numpy, which releases
+        the GIL for much of the work.
+        """
+
+        if self.raster_pool:
+            self.raster_pool.close()
+            self.raster_pool = None
+
+        if parallel:
+            if np is None:
+                raise Exception('Raster point layers need numpy')
+            self.raster_pool = ThreadPool(threads or multiprocessing.cpu_count())
+
+        self.ScheduleUpdate()
+
+    def ReplaceLayerData(self, id, data):
+        """Replace the data of an existing layer.
+
+        id    ID of the layer we are going to update
+        data  the new layer data, in the form given to the Add*Layer() call
+
+        The layer attribute defaults of the original Add*Layer() call
+        are used.  If the number of objects is unchanged the old and new
+        data are compared object by object and only the view areas covered
+        by changed objects are redrawn, otherwise the whole view is redrawn.
+        The spatial index of the layer, if built, is then updated in place
+        rather than rebuilt.
+        """
+
+        # just in case id is None
+        if id:
+            layer = self.layer_mapping[id]
+            new_data = self.layerDataHandler[layer.type](data, layer.map_rel,
+                                                         layer.defaults)
+            old_data = layer.data
+            index = layer.index
+            layer.data = new_data
+            self._invalidate_layer(layer, disk=True)
+
+            if len(old_data) != len(new_data):
+                if layer.visible and self.level in layer.show_levels:
+                    self.ScheduleUpdate()
+                return
+
+            changed = self._changed_objects(old_data, new_data)
+            if index is not None:
+                layer.index = index
+                self._update_index(layer, changed)
+
+            if not (layer.visible and self.level in layer.show_levels):
+                return
+
+            rects = []
+            for i in changed:
+                for obj in (old_data[i], new_data[i]):
+                    extent = self._object_extent(layer, obj)
+                    if extent:
+                        rects.append(extent)
+
+            self._redraw_rects(rects)
+
+    @staticmethod
+    def _changed_objects(old_data, new_data):
+        """Compare two equal length layer draw data, object by object.
+
+        old_data  the old draw data
+        new_data  the new draw data
+
+        Columnar data is compared column by column, columnar shapes also
+        vertex array by vertex array.
+
+        Returns a list of the indices of objects that differ.
+        """
+
+        if (isinstance(old_data, _ShapeColumns)
+                and isinstance(new_data, _ShapeColumns)):
+            differ = (old_data.ends - old_data.starts
+                      != new_data.ends - new_data.starts)
+            for i in np.nonzero(~differ)[0].tolist():
+                if not np.array_equal(old_data.shape(i), new_data.shape(i)):
+                    differ[i] = True
+        elif (isinstance(old_data, _PointColumns)
+                and isinstance(new_data, _PointColumns)):
+            differ = (old_data.x != new_data.x) | (old_data.y != new_data.y)
+        elif (isinstance(old_data, _ShapeColumns)
+                or isinstance(new_data, _ShapeColumns)):
+            # vertex arrays don't compare with vertex lists
+            return list(range(len(new_data)))
+        else:
+            return [i for i in range(len(new_data))
+                    if old_data[i] != new_data[i]]
+
+        differ = (differ | (old_data.place != new_data.place)
+                  | (old_data.style != new_data.style)
+                  | (old_data.x_off != new_data.x_off)
+                  | (old_data.y_off != new_data.y_off))
+        changed = set(np.nonzero(differ)[0].tolist())
+
+        # user data objects need a python compare
+        if old_data.udata is not None or new_data.udata is not None:
+            old_udata = old_data.user_data()
+            new_udata = new_data.user_data()
+            for i in range(len(new_data)):
+                if old_udata[i] != new_udata[i]:
+                    changed.add(i)
+        elif old_data.default_udata != new_data.default_udata:
+            changed = range(len(new_data))
+
+        return sorted(changed)
+
+    ######
+    # Play with layers Z order
+    ######
+
+    def PushLayerToBack(self, id):
+        """Make layer specified be drawn at back of Z order.
+
+        id  ID of the layer to push to the back
+        """
+
+        self.layer_z_order.remove(id)
+        self.layer_z_order.insert(0, id)
+        self.ScheduleUpdate()
+
+    def PopLayerToFront(self, id):
+        """Make layer specified be drawn at front of Z order.
+
+        id  ID of the layer to pop to the front
+        """
+
+        self.layer_z_order.remove(id)
+        self.layer_z_order.append(id)
+        self.ScheduleUpdate()
+
+    def PlaceLayerBelowLayer(self, id, top_id):
+        """Place a layer so it will be drawn behind another layer.
+
+        id      ID of layer to place underneath 'top_id'
+        top_id  ID of layer to be drawn *above* 'id'
+        """
+
+        self.layer_z_order.remove(id)
+        i = self.layer_z_order.index(top_id)
+        self.layer_z_order.insert(i, id)
+        self.ScheduleUpdate()
+
+    ######
+    # Layer drawing routines
+    ######
+
+    def PointSprite(self, radius, colour):
+        """Get the pre-rendered sprite for a point symbol.
+
+        radius  radius of the point in pixels
+        colour  colour of the point
+
+        Returns a tuple (bitmap, centre) where 'centre' is the offset in
+        pixels of the point centre from the bitmap top-left corner, in
+        both X and Y.  Sprites are rendered once, antialiased, and kept in
+        an LRU cache.
+        """
+
+        key = (radius, self.style_pool.colour_key(colour))
+
+        try:
+            return self.sprite_cache[key]
+        except KeyError:
+            pass
+
+        # leave room for the antialiased edge
+        centre = radius + 1
+        size = 2*radius + 3
+        bmp = wx.EmptyBitmapRGBA(size, size, 0, 0, 0, 0)
+        mdc = wx.MemoryDC(bmp)
+        dc = wx.GCDC(mdc)
+        dc.SetPen(self.style_pool.pen(colour))
+        dc.SetBrush(self.style_pool.brush(colour))
+        dc.DrawCircle(centre, centre, radius)
+        del dc
+        mdc.SelectObject(wx.NullBitmap)
+
+        self.sprite_cache[key] = (bmp, centre)
+        return (bmp, centre)
+
+    def DrawPointLayer(self, dc, data, map_rel):
+        """Draw a points layer.
+
+        dc       the device context to draw on
+        data     an iterable of point tuples:
+                     (x, y, place, style, x_off, y_off, udata)
+                 where 'style' indexes a (radius, colour) style
+        map_rel  points relative to map if True, else relative to view
+        """
+
+        # get correct pex function
+        pex = self.PexPointView
+        if map_rel:
+            pex = self.PexPoint
+
+        styles = self.style_pool
+
+        if self.UsePointSprites:
+            # stamp a pre-rendered sprite for each point
+            cache_style = None  # speed up drawing mostly unchanging styles
+
+            for (x, y, place, style, x_off, y_off, udata) in data:
+                if cache_style != style:
+                    (radius, colour) = styles[style]
+                    if radius:
+                        (sprite, c) = self.PointSprite(radius, colour)
+                    cache_style = style
+                if radius:
+                    (pt, ex) = pex(place, (x,y), x_off, y_off, radius)
+                    if ex:
+                        (x, _, y, _) = ex
+                        dc.DrawBitmap(sprite, x+radius-c, y+radius-c, True)
+            return
+
+        # allow transparent colours
+        dc = self.QualityDC(dc)
+
+        # gather visible points in order, draw runs of a style in one call
+        ops = []
+        for (x, y, place, style, x_off, y_off, udata) in data:
+            (radius, colour) = styles[style]
+            if radius:      # don't draw if zero radius
+                (pt, ex) = pex(place, (x,y), x_off, y_off, radius)
+                if ex:      # don't draw if not on screen
+                    (x, _, y, _) = ex
+                    ops.append(('ellipse', style,
+                                (x, y, 2*radius, 2*radius)))
+
+        self._draw_runs(dc, ops)
+
+    def DrawImageLayer(self, dc, images, map_rel):
+        """Draw an image Layer on the view.
+
+        dc       the device context to draw on
+        images   a sequence of image tuple sequences
+                   (x,y,bmap,w,h,placement,offset_x,offset_y,style,idata)
+                 where 'style' indexes a (radius, colour) marker style
+        map_rel  points relative to map if True, else relative to view
+        """
+
+        # allow transparent colours
+        dc = self.QualityDC(dc)
+
+        # get correct pex function
+        pex = self.PexExtentView
+        if map_rel:
+            pex = self.PexExtent
+
+        styles = self.style_pool
+
+        # gather the images and markers in order, then draw them
+        ops = []
+
+        for (lon, lat, bmap, w, h, place,
+                 x_off, y_off, style, idata) in images:
+            (pt, ex) = pex(place, (lon, lat), x_off, y_off, w, h)
+            if ex:
+                (ix, _, iy, _) = ex
+                ops.append(('bitmap', None, (bmap, ix, iy, False)))
+
+            (radius, colour) = styles[style]
+            if pt and radius:
+                (px, py) = pt
+                if self.UsePointSprites:
+                    (sprite, c) = self.PointSprite(radius, colour)
+                    ops.append(('bitmap', None, (sprite, px-c, py-c, True)))
+                else:
+                    ops.append(('ellipse', style, (px-radius, py-radius,
+                                                   2*radius, 2*radius)))
+
+        self._draw_runs(dc, ops)
+
+    def TextFont(self, fontname, fontsize):
+        """Get the font used for text objects.
+
+        fontname  name of the font face
+        fontsize  font size in points
+
+        Returns a wx.Font object.
+        """
+
+        return self.style_pool.font(fontname, fontsize)
+
+    def LabelSprite(self, tdata, fontname, fontsize, textcolour):
+        """Get the pre-rendered bitmap of a text label.
+
+        tdata       the label text
+        fontname    name of the font face
+        fontsize    font size in points
+        textcolour  colour of the text
+
+        Label bitmaps are rendered once, with a transparent background,
+        and kept in an LRU cache.
+        """
+
+        key = (tdata, fontname, fontsize, self.style_pool.colour_key(textcolour))
+        try:
+            return self.label_cache[key]
+        except KeyError:
+            pass
+
+        mdc = wx.MemoryDC(wx.EmptyBitmap(1, 1))
+        dc = wx.GCDC(mdc)
+        dc.SetFont(self.TextFont(fontname, fontsize))
+        (w, h, _, _) = dc.GetFullTextExtent(tdata)
+        del dc
+
+        bmp = wx.EmptyBitmapRGBA(max(w, 1), max(h, 1), 0, 0, 0, 0)
+        mdc.SelectObject(bmp)
+        dc = wx.GCDC(mdc)
+        dc.SetFont(self.TextFont(fontname, fontsize))
+        dc.SetTextForeground(textcolour)
+        dc.DrawText(tdata, 0, 0)
+        del dc
+        mdc.SelectObject(wx.NullBitmap)
+
+        self.label_cache[key] = bmp
+        return bmp
+
+    def DrawTextLayer(self, dc, text, map_rel):
+        """Draw a text Layer on the view.
+
+        dc       the device context to draw on
+        text     a sequence of tuples:
+                     (lon, lat, tdata, placement, style,
+                      offset_x, offset_y, w, h, udata)
+                 where 'style' indexes a (radius, colour, textcolour,
+                 fontname, fontsize) style and (w, h) is the size of the
+                 text in pixels
+        map_rel  points relative to map if True, else relative to view
+        """
+
+        # allow transparent colours if not drawing sprites
+        if not (self.UseLabelSprites and self.UsePointSprites):
+            dc = self.QualityDC(dc)
+
+        # get correct pex function for mode (map/view)
+        pex = self.PexExtentView
+        if map_rel:
+            pex = self.PexExtent
+
+        styles = self.style_pool
+
+        # gather labels and markers in order, then draw them
+        ops = []
+
+        for (lon, lat, tdata, place, style, x_off, y_off, w, h, data) in text:
+            (radius, colour, textcolour, fontname, fontsize) = styles[style]
+
+            # get point + extent information (each can be None if off-view)
+            (pt, ex) = pex(place, (lon, lat), x_off, y_off, w, h)
+            if ex:
+                (lx, _, ty, _) = ex
+                if self.UseLabelSprites:
+                    bmp = self.LabelSprite(tdata, fontname, fontsize,
+                                           textcolour)
+                    ops.append(('bitmap', None, (bmp, lx, ty, True)))
+                else:
+                    ops.append(('text', style, (tdata, (lx, ty))))
+
+            if pt and radius:
+                (x, y) = pt
+                if self.UsePointSprites:
+                    (sprite, c) = self.PointSprite(radius, colour)
+                    ops.append(('bitmap', None, (sprite, x-c, y-c, True)))
+                else:
+                    ops.append(('ellipse', style, (x-radius, y-radius,
+                                                   2*radius, 2*radius)))
+
+        self._draw_runs(dc, ops)
+
+    def DrawPolygonLayer(self, dc, data, map_rel):
+        """Draw a polygon layer.
+
+        dc       the device context to draw on
+        data     an iterable of polygon tuples:
+                     (p, placement, style, offset_x, offset_y, udata)
+                 where p is an iterable of points: (x, y) and 'style'
+                 indexes a (width, colour, closed, filled, fillcolour) style
+        map_rel  points relative to map if True, else relative to view
+        """
+
+        # allow transparent colours
+        dc = self.QualityDC(dc)
+
+        # get the correct pex function for mode (map/view)
+        pex = self.PexPolygonView
+        if map_rel:
+            pex = self.PexPolygon
+
+        styles = self.style_pool
+
+        # draw each run of visible polygons of a style with one pen and
+        # brush, keeping the layer order
+        shapes = self._view_shapes(data, pex, map_rel)
+        for (style, run) in itertools.groupby(shapes, operator.itemgetter(0)):
+            polys = [poly for (_, poly) in run]
+            (width, colour, closed, filled, fillcolour) = styles[style]
+            dc.SetPen(styles.pen(colour, width))
+            if filled:
+                dc.SetBrush(styles.brush(fillcolour))
+            else:
+                dc.SetBrush(wx.TRANSPARENT_BRUSH)
+
+            if closed:
+                dc.DrawPolygonList(polys)
+            else:
+                self._draw_lines_group(dc, polys, width)
+
+    def DrawPolylineLayer(self, dc, data, map_rel):
+        """Draw a polyline layer.
+
+        dc       the device context to draw on
+        data     an iterable of polyline tuples:
+                     (p, placement, style, offset_x, offset_y, udata)
+                 where p is an iterable of points: (x, y) and 'style'
+                 indexes a (width, colour) style
+        map_rel  points relative to map if True, else relative to view
+        """
+
+        # allow transparent colours
+        dc = self.QualityDC(dc)
+
+        # get the correct pex function for mode (map/view)
+        pex = self.PexPolygonView
+        if map_rel:
+            pex = self.PexPolygon
+
+        styles = self.style_pool
+
+        # draw each run of visible polylines of a style with one pen,
+        # keeping the layer order
+        dc.SetBrush(wx.TRANSPARENT_BRUSH)
+        shapes = self._view_shapes(data, pex, map_rel)
+        for (style, run) in itertools.groupby(shapes, operator.itemgetter(0)):
+            polys = [poly for (_, poly) in run]
+            (width, colour) = styles[style]
+            dc.SetPen(styles.pen(colour, width))
+            self._draw_lines_group(dc, polys, width)
+
+    def _view_shapes(self, data, pex, map_rel):
+        """Get the view points of the on-view shapes of polygon/line data.
+
+        data     polygon or polyline draw data
+        pex      the PexPolygon() or PexPolygonView() method
+        map_rel  points relative to map if True, else relative to view
+
+        Returns a list of (style, points) tuples in draw order, 'points' a
+        list of (x, y) view coordinates.
+        """
+
+        if isinstance(data, _ShapeColumns):
+            return self._view_shape_columns(data, map_rel)
+
+        shapes = []
+        for (p, place, style, x_off, y_off, _) in data:
+            (poly, _) = pex(place, p, x_off, y_off)
+            if poly:
+                shapes.append((style, poly))
+
+        return shapes
+
+    def _view_shape_columns(self, data, map_rel):
+        """Get the view points of the on-view shapes of columnar data.
+
+        data     a _ShapeColumns object
+        map_rel  points relative to map if True, else relative to view
+
+        All vertices are placed in the view with numpy, map-relative
+        vertices through tile coordinates cached per level.  A shape is
+        off-view if its bounding box is, the tile sources projecting each
+        geo axis on its own.
+
+        Returns a list of (style, points) tuples as from _view_shapes().
+        """
+
+        (width, height) = (self.view_width, self.view_height)
+
+        if map_rel:
+            (xtile, ytile) = self._shape_tiles(data)
+            xs = xtile*self.tile_size_x - self.view_offset_x
+            ys = ytile*self.tile_size_y - self.view_offset_y
+
+            bbox = data.bbox
+            (x1, y1) = self.Geo2ViewArray(bbox[:,0], bbox[:,2])
+            (x2, y2) = self.Geo2ViewArray(bbox[:,1], bbox[:,3])
+            (elx, erx) = (np.minimum(x1, x2), np.maximum(x1, x2))
+            (ety, eby) = (np.minimum(y1, y2), np.maximum(y1, y2))
+            (dcw, dch) = (0, 0)
+        else:
+            xs = data.vertices[:,0]
+            ys = data.vertices[:,1]
+            (elx, erx, ety, eby) = data.bbox.T
+            (dcw, dch) = (width, height)
+
+        # move each shape by its placement, as point_placement() does
+        place = [self.RasterPlacement.get(p, (0, 0, 0, 0))
+                 for p in _LayerColumns.Placements]
+        place = np.array(place, dtype=np.float64)[data.place]
+        dx = np.floor(place[:,0]*dcw) + place[:,1]*data.x_off
+        dy = np.floor(place[:,2]*dch) + place[:,3]*data.y_off
+
+        on = ((erx + dx >= 0) & (elx + dx <= width)
+              & (eby + dy >= 0) & (ety + dy <= height))
+
+        starts = data.starts.tolist()
+        ends = data.ends.tolist()
+        styles = data.style.tolist()
+        (dx, dy) = (dx.tolist(), dy.tolist())
+
+        shapes = []
+        for i in np.nonzero(on)[0].tolist():
+            (first, last) = (starts[i], ends[i])
+            points = zip((xs[first:last] + dx[i]).tolist(),
+                         (ys[first:last] + dy[i]).tolist())
+            shapes.append((styles[i], points))
+
+        return shapes
+
+    def _shape_tiles(self, data):
+        """Get the tile coordinates of all vertices of columnar shape data.
+
+        data  a _ShapeColumns object
+
+        The vertices are converted once per level, the result is shared
+        by all draw data taken from the same layer data.
+
+        Returns a tuple of numpy arrays (xtile, ytile).
+        """
+
+        cache = data.cache
+        if cache.get('tile') is None or cache['tile'][0] != self.level:
+            vertices = data.vertices
+            (xtile, ytile) = self._geo2tile_array(vertices[:,0],
+                                                  vertices[:,1])
+            cache['tile'] = (self.level, xtile, ytile)
+        (_, xtile, ytile) = cache['tile']
+
+        return (xtile, ytile)
+
+    def _draw_runs(self, dc, ops):
+        """Draw objects in layer order, one list call per run of a style.
+
+        dc   the device context to draw on
+        ops  list of (kind, style, item) tuples in drawing order:
+                 ('bitmap', None, (bitmap, x, y, use_mask))
+                 ('ellipse', style, (x, y, w, h))
+                 ('text', style, (text, (x, y)))
+             ellipse styles start (radius, colour), text styles are
+             (radius, colour, textcolour, fontname, fontsize)
+
+        Only consecutive objects of the same kind and style are batched,
+        so overlapping objects stack as they are ordered in the layer.
+        """
+
+        styles = self.style_pool
+        for ((kind, style), run) in itertools.groupby(ops,
+                                                      operator.itemgetter(0, 1)):
+            items = [item for (_, _, item) in run]
+            if kind == 'bitmap':
+                for (bmp, x, y, use_mask) in items:
+                    dc.DrawBitmap(bmp, x, y, use_mask)
+            elif kind == 'ellipse':
+                colour = styles[style][1]
+                dc.SetPen(styles.pen(colour))
+                dc.SetBrush(styles.brush(colour))
+                dc.DrawEllipseList(items)
+            else:
+                (_, _, textcolour, fontname, fontsize) = styles[style]
+                dc.SetFont(styles.font(fontname, fontsize))
+                dc.SetTextForeground(textcolour)
+                dc.DrawTextList([text for (text, _) in items],
+                                [posn for (_, posn) in items])
+
+    def _draw_lines_group(self, dc, lines, width):
+        """Draw a group of open polylines with the current pen.
+
+        dc     the device context to draw on
+        lines  list of lists of (x, y) view points
+        width  width of the current pen
+
+        Thin lines are drawn as one list of segments.  Wide lines are drawn
+        one polyline at a time, as separate segments would show gaps at
+        the joins.
+        """
+
+        if width > 1:
+            for line in lines:
+                dc.DrawLines(line)
+            return
+
+        segments = []
+        for line in lines:
+            segments.extend([start + stop
+                             for (start, stop) in zip(line[:-1], line[1:])])
+        dc.DrawLineList(segments)
+
+######
+# Positioning methods
+######
+
+    def GotoLevel(self, level):
+        """Use a new tile level.
+
+        level  the new tile level to use.
+
+        Returns True if all went well.
+        """
+
+        if not self.tile_src.UseLevel(level):
+            return False        # couldn't change level
+
+        self.level = level
+        self.map_width = self.tile_src.num_tiles_x * self.tile_src.tile_size_x
+        self.map_height = self.tile_src.num_tiles_y * self.tile_src.tile_size_y
+        (self.map_llon, self.map_rlon,
+         self.map_blat, self.map_tlat) = self.tile_src.extent
+
+        # to set some state variables
+        self.OnSize()
+
+        # raise level change event
+        self.RaiseEventLevel(level)
+
+        return True
+
+    def GotoPosition(self, geo):
+        """Set view to centre on a geo position in the current level.
+
+        geo  a tuple (xgeo,ygeo) to centre view on
+
+        Sets self.view_offset_x and self.view_offset_y and then calls
+        RecalcViewLimits(), redraws widget.
+        """
+
+        # get fractional tile coords of required centre of view
+        (xtile, ytile) = self.tile_src.Geo2Tile(geo)
+
+        # now calculate view offsets, top, left, bottom and right
+        half_width = self.view_width / 2
+        centre_pixels_from_map_left = int(xtile * self.tile_size_x)
+        self.view_offset_x = centre_pixels_from_map_left - half_width
+
+        half_height = self.view_height / 2
+        centre_pixels_from_map_top = int(ytile * self.tile_size_y)
+        self.view_offset_y = centre_pixels_from_map_top - half_height
+
+        # set the left/right/top/bottom lon/lat extents and redraw view
+        self.RecalcViewLimits()
+        self.ScheduleUpdate()
+
+    def GotoLevelAndPosition(self, level, geo):
+        """Goto a map level and set view to centre on a position.
+
+        level  the map level to use
+        geo    a tuple (xgeo,ygeo) to centre view on
+
+        Does nothing if we can't use desired level.
+        """
+
+        if self.GotoLevel(level):
+            self.GotoPosition(geo)
+
+    def ZoomToArea(self, geo, size):
+        """Set view to level and position to view an area.
+
+        geo   a tuple (xgeo,ygeo) to centre view on
+        size  a tuple (width,height) of area in degrees
+
+        Centre an area and zoom to view such that the area will fill
+        approximately 50% of width or height, whichever is greater.
+
+        Use the ppd_x and ppd_y values in the level 'tiles' file.
+        """
+
+        # unpack area width/height (degrees)
+        (awidth, aheight) = size
+
+        # step through levels (smallest first) and check view size (degrees)
+        for l in self.tile_src.levels:
+            level = l
+            (_, _, ppd_x, ppd_y) = self.tile_src.getInfo(l)
+            view_deg_width = self.view_width / ppd_x
+            view_deg_height = self.view_height / ppd_y
+
+            # if area >= 50% of view, finished
+            if awidth >= view_deg_width / 2 or aheight >= view_deg_height / 2:
+                break
+
+        self.GotoLevelAndPosition(level, geo)
+
+######
+# Get level and view data
+######
+
+    def GetLevelAndPosition(self, place='cc'):
+        """Get the level and geo position of a point within the view.
+
+        place  a placement string specifying the point in the view
+               for which we require the geo position
+
+        Returns a tuple (level, geo) where 'geo' is (geo_x, geo_y).
+        """
+
+        view_coords = self.point_placement(place, 0, 0, 0, 0,
+                                           self.view_width, self.view_height)
+        geo = self.View2Geo(view_coords)
+
+        return (self.level, geo)
+
+######
+# Convert between geo and view coordinates
+######
+
+    def Geo2View(self, geo):
+        """Convert a geo coord to view.
+
+        geo  tuple (xgeo, ygeo)
+
+        Return a tuple (xview, yview) in view coordinates.
+        Assume point is in view.
+        """
+
+        (tx, ty) = self.tile_src.Geo2Tile(geo)
+        return ((tx * self.tile_src.tile_size_x) - self.view_offset_x,
+                (ty * self.tile_src.tile_size_y) - self.view_offset_y)
+
+    def Geo2ViewArray(self, xgeo, ygeo):
+        """Convert arrays of geo coords to view.
+
+        xgeo, ygeo  numpy arrays of geo coordinates
+
+        Returns a tuple of numpy arrays (xview, yview) in view coordinates.
+        Needs numpy.
+        """
+
+        (xtile, ytile) = self._geo2tile_array(xgeo, ygeo)
+        return (xtile*self.tile_size_x - self.view_offset_x,
+                ytile*self.tile_size_y - self.view_offset_y)
+
+    def Geo2ViewMasked(self, geo):
+        """Convert a geo (lon+lat) position to view pixel coords.
+
+        geo  tuple (xgeo, ygeo)
+
+        Return a tuple (xview, yview) of point if on-view,or None
+        if point is off-view.
+        """
+
+        (xgeo, ygeo) = geo
+
+        if (self.view_llon <= xgeo <= self.view_rlon and
+                self.view_blat <= ygeo <= self.view_tlat):
+            return self.Geo2View(geo)
+
+        return None
+
+######
+# PEX - Point & EXtension.
+#
+# These functions encapsulate the code that finds the extent of an object.
+# They all return a tuple (point, extent) where 'point' is the placement
+# point of an object (or list of points for a polygon) and an 'extent'
+# tuple (lx, rx, ty, by) [left, right, top, bottom].
+######
+
+    def PexPoint(self, place, geo, x_off, y_off, radius):
+        """Given a point object (geo coords) get point/extent in view coords.
+
+        place         placement string
+        geo           point position tuple (xgeo, ygeo)
+        x_off, y_off  X and Y offsets
+
+        Return a tuple of point and extent origins (point, extent) where 'point'
+        is (px, py) and extent is (elx, erx, ety, eby) (both in view coords).
+        Return None for either or both if off-view.
+
+        The 'extent' here is the extent of the point+radius.
+        """
+
+        # get point view coords
+        (xview, yview) = self.Geo2View(geo)
+        point = self.point_placement(place, xview, yview, x_off, y_off)
+        (px, py) = point
+
+        # extent = (left, right, top, bottom) in view coords
+        elx = px - radius
+        erx = px + radius
+        ety = py - radius
+        eby = py + radius
+        extent = (elx, erx, ety, eby)
+
+        # decide if point and extent are off-view
+        if px < 0 or px > self.view_width or py < 0 or py > self.view_height:
+            point = None
+
+        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
+            # no extent if ALL of extent is off-view
+            extent = None
+
+        return (point, extent)
+
+    def PexPointView(self, place, view, x_off, y_off, radius):
+        """Given a point object (view coords) get point/extent in view coords.
+
+        place         placement string
+        view          point position tuple (xview, yview)
+        x_off, y_off  X and Y offsets
+
+        Return a tuple of point and extent origins (point, extent) where 'point'
+        is (px, py) and extent is (elx, erx, ety, eby) (both in view coords).
+        Return None for either or both if off-view.
+
+        The 'extent' here is the extent of the point+radius.
+        """
+
+        # get point view coords and perturb point to placement
+        (xview, yview) = view
+        point = self.point_placement(place, xview, yview, x_off, y_off,
+                                     self.view_width, self.view_height)
+        (px, py) = point
+
+        # extent = (left, right, top, bottom) in view coords
+        elx = px - radius
+        erx = px + radius
+        ety = py - radius
+        eby = py + radius
+        extent = (elx, erx, ety, eby)
+
+        # decide if point and extent are off-view
+        if (px < 0 or px > self.view_width
+                or py < 0 or py > self.view_height):
+            view = None
+
+        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
+            # no extent if ALL of extent is off-view
+            extent = None
+
+        return (point, extent)
+
+    def PexExtent(self, place, geo, x_off, y_off, w, h):
+        """Given an extent object convert point/extent coords to view coords.
+
+        place         placement string
+        geo           point position tuple (xgeo, ygeo)
+        x_off, y_off  X and Y offsets
+        w, h          width and height of extent in pixels
+
+        Return a tuple of point and extent origins (point, extent) where 'point'
+        is (px, py) and extent is (elx, erx, ety, eby) (both in view coords).
+        Return None if point is off-view.
+
+        An extent object can be either an image object or a text object.
+        """
+
+        # get point view coords
+        point = self.Geo2View(geo)
+        (px, py) = point
+
+        # extent = (left, right, top, bottom) in view coords
+        extent = self.ViewExtent(place, point, w, h, x_off, y_off)
+        (elx, erx, ety, eby) = extent
+
+        # decide if point and extent are off-view
+        if px < 0 or px > self.view_width or py < 0 or py > self.view_height:
+            point = None
+
+        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
+            # no extent if ALL of extent is off-view
+            extent = None
+
+        return (point, extent)
+
+    def PexExtentView(self, place, view, x_off, y_off, w, h):
+        """Given a view object convert point/extent coords to view coords.
+
+        place         placement string
+        view          point position tuple (xview, yview)
+        x_off, y_off  X and Y offsets
+        w, h          width and height of extent in pixels
+
+        Return a tuple of point and extent origins (point, extent) where 'point'
+        is (px, py) and extent is (elx, erx, ety, eby) (both in view coords).
+        Either point or extent is None if object off-view.
+
+        Takes size of extent object into consideration.
+        """
+
+        # get point view coords and perturb point to placement origin
+        (xview, yview) = view
+        point = self.point_placement(place, xview, yview, 0, 0,
+                                     self.view_width, self.view_height)
+
+        # get point view coords (X and Y)
+        (px, py) = view
+
+        # extent = (left, right, top, bottom) in view coords
+        extent = self.ViewExtent(place, view, w, h, x_off, y_off,
+                                 self.view_width, self.view_height)
+        (elx, erx, ety, eby) = extent
+
+        # decide if point and extent are off-view
+        if px < 0 or px > self.view_width or py < 0 or py > self.view_height:
+            view = None
+
+        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
+            # no extent if ALL of extent is off-view
+            extent = None
+
+        return (point, extent)
+
+    def PexPolygon(self, place, poly, x_off, y_off):
+        """Given a polygon/line obj (geo coords) get point/extent in view coords.
+
+        place         placement string
+        poly          list of point position tuples (xgeo, ygeo)
+        x_off, y_off  X and Y offsets
+
+        Return a tuple of point and extent origins (point, extent) where 'point'
+        is a list of (px, py) and extent is (elx, erx, ety, eby) (both in view
+        coords).  Return None for either or both if off-view.
+        """
+
+        # get polygon/line points in perturbed view coordinates
+        view = []
+        for geo in poly:
+            (xview, yview) = self.Geo2View(geo)
+            point = self.point_placement(place, xview, yview, x_off, y_off)
+            view.append(point)
+
+        # get extent - max/min x and y
+        # extent = (left, right, top, bottom) in view coords
+        elx = min(view, key=lambda x: x[0])[0]
+        erx = max(view, key=lambda x: x[0])[0]
+        ety = min(view, key=lambda x: x[1])[1]
+        eby = max(view, key=lambda x: x[1])[1]
+        extent = (elx, erx, ety, eby)
+
+        # decide if polygon or extent are off-view
+        # an edge may cross the view with no vertex inside it
+        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
+            return (None, None)
+
+        return (view, extent)
+
+    def PexPolygonView(self, place, poly, x_off, y_off):
+        """Given a polygon/line obj (view coords) get point/extent in view coords.
+
+        place         placement string
+        poly          list of point position tuples (xview, yview)
+        x_off, y_off  X and Y offsets
+
+        Return a tuple of point and extent origins (point, extent) where 'point'
+        is a list of (px, py) and extent is (elx, erx, ety, eby) (both in view
+        coords).  Return None for either or both if off-view.
+        """
+
+        # get polygon/line points in view coordinates
+        view = []
+        for (xview, yview) in poly:
+            point = self.point_placement(place, xview, yview, x_off, y_off,
+                                         self.view_width, self.view_height)
+            view.append(point)
+
+        # get extent - max/min x and y
+        # extent = (left, right, top, bottom) in view coords
+        elx = min(view, key=lambda x: x[0])[0]
+        erx = max(view, key=lambda x: x[0])[0]
+        ety = min(view, key=lambda x: x[1])[1]
+        eby = max(view, key=lambda x: x[1])[1]
+        extent = (elx, erx, ety, eby)
+
+        # decide if polygon/line or extent are off-view
+        # an edge may cross the view with no vertex inside it
+        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
+            return (None, None)
+
+        return (view, extent)
+
+######
+# GUI stuff
+######
+
+    def OnMove(self, event):
+        """Handle a mouse move (map drag or rectangle select).
+
+        event  the mouse move event
+
+        Motion events are coalesced: the mouse state is saved and handled
+        once the queued events are processed, so only the latest position
+        is acted on.
+        """
+
+        # for windows, set focus onto pyslip window
+        # linux seems to do this automatically
+        if sys.platform == 'win32' and self.FindFocus() != self:
+            self.SetFocus()
+
+        self.motion = (event.GetPositionTuple(), event.Dragging(),
+                       event.LeftIsDown())
+        if not self.motion_scheduled:
+            self.motion_scheduled = True
+            wx.CallAfter(self._handle_motion)
+
+    def _handle_motion(self):
+        """Handle the latest mouse move.
+
+        If SHIFT key is down, do rectangle select.
+        Otherwise pan the map if we are dragging.
+        """
+
+        # the widget may have been destroyed while we waited
+        if not self or not self.motion_scheduled:
+            return
+        self.motion_scheduled = False
+
+        # get current mouse position
+        (mouse_view, dragging, left_down) = self.motion
+        self._position_event(mouse_view)
+
+        if self.hover_event and not dragging:
+            self._schedule_hover(mouse_view)
+
+        if dragging and left_down:
+            (x, y) = mouse_view
+
+            # are we doing box select?
+            if self.is_box_select:
+                # set select box point 2 at mouse position
+                (self.sbox_w, self.sbox_h) = (x - self.sbox_1_x,
+                                              y - self.sbox_1_y)
+
+                # just draw the box over the rendered view
+                self._draw_select_frame()
+            elif not self.last_drag_x is None:
+                # no, just a map drag
+                self.was_dragging = True
+                dx = self.last_drag_x - x
+                dy = self.last_drag_y - y
+
+                # move the map in the view
+                self.view_offset_x += dx
+                self.view_offset_y += dy
+
+                # limit drag at edges of map
+                if self.map_width > self.view_width:
+                    # if map > view, don't allow edge to show background
+                    if self.view_offset_x < 0:
+                        self.view_offset_x = 0
+                    elif self.view_offset_x > self.max_x_offset:
+                        self.view_offset_x = self.max_x_offset
+                else:
+                    # else map < view, centre X
+                    self.view_offset_x = (self.map_width
+                                          - self.view_width) / 2
+
+                if self.map_height > self.view_height:
+                    # if map > view, don't allow edge to show background
+                    if self.view_offset_y < 0:
+                        self.view_offset_y = 0
+                    elif self.view_offset_y > self.max_y_offset:
+                        self.view_offset_y = self.max_y_offset
+                else:
+                    # else map < view, centre Y
+                    self.view_offset_y = (self.map_height
+                                          - self.view_height) / 2
+
+                # adjust remembered X,Y
+                self.last_drag_x = x
+                self.last_drag_y = y
+
+                self.RecalcViewLimits()
+
+                # redraw client area
+                self._start_draft()
+                self.ScheduleUpdate()
+
+    def _position_event(self, vposn):
+        """Raise a mouse position event, limited to .position_rate a second.
+
+        vposn  the mouse position in view coordinates
+
+        A limited event is delayed, not dropped, and reports the latest
+        position when it is raised.
+        """
+
+        self.position_posn = vposn
+        if self.position_scheduled:
+            return
+
+        delay = 0
+        if self.position_rate:
+            next_time = self.last_position_time + 1.0/self.position_rate
+            delay = next_time - time.time()
+        if delay > 0:
+            self.position_scheduled = True
+            wx.CallLater(int(delay*1000) + 1, self._raise_position)
+        else:
+            self._raise_position()
+
+    def _raise_position(self):
+        """Raise a position event for the latest mouse position."""
+
+        # the widget may have been destroyed while we waited
+        if not self:
+            return
+
+        self.position_scheduled = False
+        vposn = self.position_posn
+        if vposn is None:
+            return
+        self.last_position_time = time.time()
+        self.RaiseEventPosition(self.View2Geo(vposn), vposn)
+
+    def OnKeyDown(self, event):
+        """Handle pressing a key down.
+
+        Only look at the SHIFT key, for box select or zoom out.
+        """
+
+        if event.m_keyCode == wx.WXK_SHIFT:
+            self.shift_down = True
+            self.default_cursor = BoxSelectCursor
+            self.SetCursor(wx.StockCursor(BoxSelectCursor))
+
+    def OnKeyUp(self, event):
+        """Handle pressing a key down.
+
+        Only look at the SHIFT key, for box select or zoom out.
+        """
+        if event.m_keyCode == wx.WXK_SHIFT:
+            self.shift_down = False
+            self.default_cursor = DefaultCursor
+            self.SetCursor(wx.StockCursor(DefaultCursor))
+
+
+    def OnLeftDown(self, event):
+        """Left mouse button down. Prepare for possible drag."""
+
+        click_posn = event.GetPositionTuple()
+
+        if self.shift_down:
+            self.is_box_select = True
+            (self.sbox_w, self.sbox_h) = (0, 0)
+            (self.sbox_1_x, self.sbox_1_y) = click_posn
+            self.sbox_snapshot = self._snapshot_view(wx.MemoryDC(self.buffer))
+        else:
+            self.is_box_select = False
+            self.SetCursor(wx.StockCursor(wx.CURSOR_HAND))
+            (self.last_drag_x, self.last_drag_y) = click_posn
+        event.Skip()
+
+    def OnLeftUp(self, event):
+        """Left mouse button up.
+
+        Could be end of a drag or point or box selection.  If it's the end of
+        a drag we don't do a lot.  If a selection we process that.
+        """
+
+        # finish any drag or box select to the latest mouse position
+        self._handle_motion()
+
+        # turn off any dragging
+        self.last_drag_x = self.last_drag_y = None
+
+        # if required, ignore this event
+        if self.ignore_next_up:
+            self.ignore_next_up = False
+            return
+
+        # cursor back to normal
+        self.SetCursor(wx.StockCursor(self.default_cursor))
+
+        # we need a repaint to remove any selection box, but NOT YET!
+        delayed_paint = self.sbox_1_x       # True if box select active
+
+        # if any layers interested, inform of possible select
+        if not self.was_dragging:
+            if self.is_box_select:
+                # get canonical selection box in view coordinates
+                (ll_vx, ll_vy, tr_vx, tr_vy) = self.sel_box_canonical()
+
+                # selection box corners in tile coords
+                ll_tx = float(ll_vx+self.view_offset_x) / self.tile_size_x
+                ll_ty = float(ll_vy+self.view_offset_y) / self.tile_size_y
+                tr_tx = float(tr_vx+self.view_offset_x) / self.tile_size_x
+                tr_ty = float(tr_vy+self.view_offset_y) / self.tile_size_y
+
+                # selection box in geo coords
+                ll_g = self.tile_src.Tile2Geo((ll_tx, ll_ty))
+                tr_g = self.tile_src.Tile2Geo((tr_tx, tr_ty))
+
+                # check each layer for a box select event
+                # we work on a copy as user response could change order
+                for id in self.layer_z_order[:]:
+                    l = self.layer_mapping[id]
+                    # if layer visible and selectable
+                    if l.selectable and l.visible:
+                        if l.map_rel:
+                            # map-relative, get all points selected (if any)
+                            sel = self.layerBSelHandler[l.type](l, ll_g, tr_g)
+                        else:
+                            # view-relative
+                            sel = self.layerBSelHandler[l.type](l,
+                                                                (ll_vx, ll_vy),
+                                                                (tr_vx, tr_vy))
+                        self.RaiseEventBoxSelect(layer=l, selection=sel)
+
+                        # user code possibly updated screen
+                        delayed_paint = True
+                self.is_box_select = False
+            else:
+                # possible point selection, get click point in view coords
+                clickpt_v = event.GetPositionTuple()
+
+                # get click point in geo coords
+                clickpt_g = self.View2Geo(clickpt_v)
+
+                # check each layer for a point select handler
+                # we work on a copy as user code could change order
+                for id in self.layer_z_order[:]:
+                    l = self.layer_mapping[id]
+                    # if layer visible and selectable
+                    if l.selectable and l.visible:
+                        if l.map_rel:
+                            sel = self.layerPSelHandler[l.type](l, clickpt_g)
+                        else:
+                            sel = self.layerPSelHandler[l.type](l, clickpt_v)
+                        self.RaiseEventSelect(mposn=clickpt_g, vposn=clickpt_v,
+                                              layer=l, selection=sel)
+                        # user code possibly updated screen
+                        delayed_paint = True
+
+        # turn off drag
+        self.was_dragging = False
+
+        # turn off box selection mechanism
+        self.is_box_select = False
+        self.sbox_1_x = self.sbox_1_y = None
+        self.sbox_snapshot = None
+
+        # force PAINT event if required
+        if delayed_paint:
+            self.ScheduleUpdate()
+
+    def OnLeftDClick(self, event):
+        """Left mouse button double-click.
+
+        Zoom in (if possible).
+        Zoom out (if possible) if shift key is down.
+        """
+
+        # ignore next Left UP event
+        self.ignore_next_up = True
+
+        # FIXME: should ignore double-click off the map, but within view
+        # FIXME: a possible workaround is to limit minimum view level
+
+        # get view coords of mouse double click, want same centre afterwards
+        vposn = event.GetPositionTuple()
+        gposn = self.View2Geo(vposn)
+
+        if self.shift_down:
+            # zoom out if shift key also down
+            if self.GotoLevel(self.level - 1):
+                self.ZoomOut(gposn)
+        else:
+            # zoom in
+            if self.GotoLevel(self.level + 1):
+                self.ZoomIn(gposn)
+
+    def OnMiddleDown(self, event):
+        """Middle mouse button down.  Do nothing in this version."""
+
+        pass
+
+    def OnMiddleUp(self, event):
+        """Middle mouse button up.  Do nothing in this version."""
+
+        pass
+
+    def OnRightDown(self, event):
+        """Right mouse button down. Prepare for right select (no drag)."""
+
+        click_posn = event.GetPositionTuple()
+
+        if self.shift_down:
+            self.is_box_select = True
+            self.SetCursor(wx.StockCursor(BoxSelectCursor))
+            (self.sbox_w, self.sbox_h) = (0, 0)
+            (self.sbox_1_x, self.sbox_1_y) = click_posn
+            self.sbox_snapshot = self._snapshot_view(wx.MemoryDC(self.buffer))
+        event.Skip()
+
+    def OnRightUp(self, event):
+        """Right mouse button up.
+
+        Note that when we iterate through the layer_z_order list we must
+        iterate on a *copy* as the user select process can modify
+        self.layer_z_order.
+
+        THIS CODE HASN'T BEEN LOOKED AT IN A LONG, LONG TIME.
+        """
+
+        if self.ignore_next_right_up:
+            self.ignore_next_right_up = False
+            return
+
+        self.SetCursor(wx.StockCursor(DefaultCursor))
+
+        # we need a repaint to remove any selection box, but NOT YET!
+        delayed_paint = self.sbox_1_x       # True if box select active
+
+        # if any layers interested, inform of possible select
+        if self.is_box_select:
+            # possible box selection
+            ll_x = (self.sbox_1_x + self.view_offset_x) / self.tile_size_x
+            ll_y = (self.sbox_1_y + self.view_offset_y) / self.tile_size_y
+
+            ll_g = self.tile_src.Tile2Geo((ll_x, ll_y))
+            tr_g = self.tile_src.Tile2Geo((ll_x + self.sbox_w, ll_y + self.sbox_h))
+
+            # check each layer for a box select event
+            # we work on a copy as user response could change order
+            for id in self.layer_z_order[:]:
+                l = self.layer_mapping[id]
+                if l.selectable and l.visible:   # and l.event_box_select:
+                    if l.map_rel:
+                        # map-relative, get all points selected (if any)
+                        pts = self.layerBSelHandler[l.type](l, ll_g, tr_g)
+                    else:
+                        # view-relative
+                        pts = self.layerBSelHandler[l.type](l,
+                                                            (ll_x, ll_y),
+                                                            (ll_x+self.sbox_w,
+                                                             ll_y+self.sbox_h))
+                    self.RaiseEventSelect(EventRightBoxSelect, layer=l, selection=pts)
+
+                    # user code possibly updated screen
+                    delayed_paint = True
+            self.is_box_select = False
+        else:
+            # possible point selection, get tile coords
+            click_v = event.GetPositionTuple()
+            (click_vx, click_vy) = click_v
+            click_vx += self.view_offset_x
+            click_vy += self.view_offset_y
+            click_g = self.tile_src.Tile2Geo((click_vx, click_vy))
+            # FIXME: do we REALLY need tile coords?
+
+            # check each layer for a point select callback
+            # we work on a copy as user callback could change order
+            for id in self.layer_z_order[:]:
+                l = self.layer_mapping[id]
+                # if layer visible, selectable and there is a callback
+                if l.selectable and l.visible:
+                    if l.map_rel:
+                        pt = self.layerPSelHandler[l.type](l, click_g)
+                    else:
+                        pt = self.layerPSelHandler[l.type](l, click_v)
+                    self.RaiseEventSelect(EventRightSelect, layer=l, selection=pt,
+                                          mposn=click_g, vposn=click_v)
+
+                    # user code possibly updated screen
+                    delayed_paint = True
+
+        # turn off box selection mechanism
+        self.is_box_select = False
+        self.sbox_1_x = self.sbox_1_y = None
+        self.sbox_snapshot = None
+
+        # force PAINT event to remove selection box (if required)
+        if delayed_paint:
+            self.ScheduleUpdate()
+
+    def OnRightDClick(self, event):
+        """Right mouse button double-click."""
+
+        # ignore next RIGHT UP event
+        self.ignore_next_right_up = True
+
+    def OnMouseWheel(self, event):
+        """Mouse wheel event."""
+
+        # get centre of view in map coords, want same centre afterwards
+        x = self.view_width / 2
+        y = self.view_height / 2
+        gposn = self.View2Geo((x, y))
 
-        Does nothing if we can't use desired level.
-        """
+        self._start_draft()
 
-        if self.GotoLevel(level):
-            self.GotoPosition(geo)
+        # determine which way to zoom, & *can* we zoom?
+        if event.GetWheelRotation() > 0:
+            if self.GotoLevel(self.level + 1):
+                self.ZoomIn(gposn)
+        else:
+            if self.GotoLevel(self.level - 1):
+                self.ZoomOut(gposn)
 
-    def ZoomToArea(self, geo, size):
-        """Set view to level and position to view an area.
+######
+# Method that overrides _BufferedCanvas.Draw() method.
+# This code does the actual drawing of tiles, layers, etc.
+######
 
-        geo   a tuple (xgeo,ygeo) to centre view on
-        size  a tuple (width,height) of area in degrees
+    def Draw(self, dc):
+        """Do actual map tile and layers drawing.
+        Overrides the _BufferedCanvas.draw() method.
 
-        Centre an area and zoom to view such that the area will fill
-        approximately 50% of width or height, whichever is greater.
+        dc  device context to draw on
 
-        Use the ppd_x and ppd_y values in the level 'tiles' file.
+        The tiles to be drawn and where to draw them are decided by
+        _tile_grid().
         """
 
-        # unpack area width/height (degrees)
-        (awidth, aheight) = size
-
-        # step through levels (smallest first) and check view size (degrees)
-        for l in self.tile_src.levels:
-            level = l
-            (_, _, ppd_x, ppd_y) = self.tile_src.getInfo(l)
-            view_deg_width = self.view_width / ppd_x
-            view_deg_height = self.view_height / ppd_y
+        self._draw_tiles(dc)
 
-            # if area >= 50% of view, finished
-            if awidth >= view_deg_width / 2 or aheight >= view_deg_height / 2:
-                break
+        # draw layers now, or queue them for drawing in idle time
+        if self.progressive:
+            self.render_job = self._render_job()
+            if self.render_job:
+                return
+            # nothing to draw in idle time, the frame is done now
+            self.render_job = None
+        else:
+            # raster layers may be done in parallel, but are drawn in Z order
+            pixels = self._parallel_rasters()
 
-        self.GotoLevelAndPosition(level, geo)
+            for id in self.layer_z_order:
+                l = self.layer_mapping[id]
+                if l.visible and self.level in l.show_levels:
+                    if id in pixels:
+                        self._draw_raster_layer(dc, l, pixels[id])
+                    else:
+                        self._draw_layer(dc, l)
 
-######
-# Get level and view data
-######
+        self._finish_frame(dc)
 
-    def GetLevelAndPosition(self, place='cc'):
-        """Get the level and geo position of a point within the view.
+    def _finish_frame(self, dc):
+        """Draw what goes over the layers once they are all drawn.
 
-        place  a placement string specifying the point in the view
-               for which we require the geo position
+        dc  device context to draw on
 
-        Returns a tuple (level, geo) where 'geo' is (geo_x, geo_y).
+        Saves the view for box select redraws and draws the select box.
         """
 
-        view_coords = self.point_placement(place, 0, 0, 0, 0,
-                                           self.view_width, self.view_height)
-        geo = self.View2Geo(view_coords)
+        if self.is_box_select:
+            self.sbox_snapshot = self._snapshot_view(dc)
+        self._draw_select_box(dc)
 
-        return (self.level, geo)
+    def _draw_tiles(self, dc):
+        """Draw the map tiles in the view.
 
-######
-# Convert between geo and view coordinates
-######
+        dc  device context to draw on
+        """
 
-    def Geo2View(self, geo):
-        """Convert a geo coord to view.
+        # start pasting tiles onto the view
+        # use x_pix and y_pix to place tiles
+        (col_list, row_list, x_pix_start, y_pix_start) = self._tile_grid()
+        x_pix = x_pix_start
+        for x in col_list:
+            y_pix = y_pix_start
+            for y in row_list:
+                tile = self.tile_src.GetTile(x, y)
+                dc.DrawBitmap(tile, x_pix, y_pix, False)
+                y_pix += self.tile_size_y
+            x_pix += self.tile_size_x
 
-        geo  tuple (xgeo, ygeo)
+    def _render_job(self):
+        """Split the layer drawing for a progressive render.
 
-        Return a tuple (xview, yview) in view coordinates.
-        Assume point is in view.
+        Returns a queue of tuples (layer, chunk).  A chunk is drawn by
+        calling the layer painter with the 'chunk' list of draw data.  If
+        'chunk' is None the whole layer is drawn in one go, as is done for
+        cached layers and layers with unsliceable data.  Only the objects
+        that may be visible in the view are put into chunks.
         """
 
-        (tx, ty) = self.tile_src.Geo2Tile(geo)
-        return ((tx * self.tile_src.tile_size_x) - self.view_offset_x,
-                (ty * self.tile_src.tile_size_y) - self.view_offset_y)
-
+        job = collections.deque()
+        for id in self.layer_z_order:
+            l = self.layer_mapping[id]
+            if l.visible and self.level in l.show_levels:
+                if ((l.map_rel and (l.cached or l.tile_cached))
+                        or (not l.map_rel and self.ViewLayerCache)
+                        or l.raster
+                        or not isinstance(l.data, (list, _LayerColumns))):
+                    job.append((l, None))
+                else:
+                    data = self._visible_data(l)
+                    chunk = self.ProgressiveChunkSize
+                    for first in range(0, len(data), chunk):
+                        job.append((l, data[first:first+chunk]))
 
-    def Geo2ViewMasked(self, geo):
-        """Convert a geo (lon+lat) position to view pixel coords.
+        return job
 
-        geo  tuple (xgeo, ygeo)
+    def _draw_select_box(self, dc):
+        """Draw the selection rectangle, if any.
 
-        Return a tuple (xview, yview) of point if on-view,or None
-        if point is off-view.
+        dc  device context to draw on
         """
 
-        (xgeo, ygeo) = geo
+        if self.sbox_1_x:
+            penclr = wx.Colour(0, 0, 255)
+            pen = wx.Pen(penclr, 1, wx.USER_DASH)
+            pen.SetDashes([1, 1, 1, 1])
+            dc.SetPen(pen)
+            brushclr = wx.Colour(255, 255, 255)
+            dc.SetBrush(wx.Brush(brushclr, style=wx.TRANSPARENT))
+            dc.DrawRectangle(self.sbox_1_x, self.sbox_1_y,
+                             self.sbox_w, self.sbox_h)
 
-        if (self.view_llon <= xgeo <= self.view_rlon and
-                self.view_blat <= ygeo <= self.view_tlat):
-            return self.Geo2View(geo)
+    def _draw_select_frame(self):
+        """Draw the selection box over a snapshot of the rendered view.
 
-        return None
+        Used while the box is dragged out, so the tiles and layers are not
+        drawn again for every mouse move.  Does a full redraw if there is
+        no usable snapshot.
+        """
 
-######
-# PEX - Point & EXtension.
-#
-# These functions encapsulate the code that finds the extent of an object.
-# They all return a tuple (point, extent) where 'point' is the placement
-# point of an object (or list of points for a polygon) and an 'extent'
-# tuple (lx, rx, ty, by) [left, right, top, bottom].
-######
+        if (self.sbox_snapshot is None or self.update_pending
+                or self.render_job):
+            self.ScheduleUpdate()
+            return
 
-    def PexPoint(self, place, geo, x_off, y_off, radius):
-        """Given a point object (geo coords) get point/extent in view coords.
+        dc = wx.BufferedDC(wx.ClientDC(self), self.buffer)
+        dc.BeginDrawing()
+        dc.DrawBitmap(self.sbox_snapshot, 0, 0, False)
+        self._draw_select_box(dc)
+        dc.EndDrawing()
 
-        place         placement string
-        geo           point position tuple (xgeo, ygeo)
-        x_off, y_off  X and Y offsets
+    def _snapshot_view(self, dc):
+        """Copy the view drawn on a device context.
 
-        Return a tuple of point and extent origins (point, extent) where 'point'
-        is (px, py) and extent is (elx, erx, ety, eby) (both in view coords).
-        Return None for either or both if off-view.
+        dc  device context to copy from
 
-        The 'extent' here is the extent of the point+radius.
+        Returns a new view-sized bitmap.
         """
 
-        # get point view coords
-        (xview, yview) = self.Geo2View(geo)
-        point = self.point_placement(place, xview, yview, x_off, y_off)
-        (px, py) = point
-
-        # extent = (left, right, top, bottom) in view coords
-        elx = px - radius
-        erx = px + radius
-        ety = py - radius
-        eby = py + radius
-        extent = (elx, erx, ety, eby)
+        bmp = wx.EmptyBitmap(self.view_width, self.view_height)
+        mdc = wx.MemoryDC(bmp)
+        mdc.Blit(0, 0, self.view_width, self.view_height, dc, 0, 0)
+        mdc.SelectObject(wx.NullBitmap)
 
-        # decide if point and extent are off-view
-        if px < 0 or px > self.view_width or py < 0 or py > self.view_height:
-            point = None
+        return bmp
 
-        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
-            # no extent if ALL of extent is off-view
-            extent = None
+    def _tile_grid(self):
+        """Decide which tiles are in the view and where to draw them.
 
-        return (point, extent)
+        Returns a tuple (col_list, row_list, x_pix_start, y_pix_start):
+            col_list     list (left -> right) of tile columns
+            row_list     list (top -> bottom) of tile rows
+            x_pix_start  view pixel coord of left side of top-left tile
+            y_pix_start  view pixel coord of top side of top-left tile
 
-    def PexPointView(self, place, view, x_off, y_off, radius):
-        """Given a point object (view coords) get point/extent in view coords.
+        Note that (x_pix_start, y_pix_start) will typically be OUTSIDE the view
+        if the view is smaller than the map.
+        """
 
-        place         placement string
-        view          point position tuple (xview, yview)
-        x_off, y_off  X and Y offsets
+        # figure out how to draw tiles
+        if self.view_offset_x < 0:
+            # View > Map in X - centre in X direction
+            col_list = range(self.tile_src.num_tiles_x)
+            x_pix_start = -self.view_offset_x
+        else:
+            # Map > View - determine layout in X direction
+            start_x_tile = int(self.view_offset_x / self.tile_size_x)
+            stop_x_tile = int((self.view_offset_x + self.view_width
+                               + self.tile_size_x - 1) / self.tile_size_x)
+            stop_x_tile = min(self.tile_src.num_tiles_x-1, stop_x_tile) + 1
+            col_list = range(start_x_tile, stop_x_tile)
+            x_pix_start = start_x_tile * self.tile_size_x - self.view_offset_x
 
-        Return a tuple of point and extent origins (point, extent) where 'point'
-        is (px, py) and extent is (elx, erx, ety, eby) (both in view coords).
-        Return None for either or both if off-view.
+        if self.view_offset_y < 0:
+            # View > Map in Y - centre in Y direction
+            row_list = range(self.tile_src.num_tiles_y)
+            y_pix_start = -self.view_offset_y
+        else:
+            # Map > View - determine layout in Y direction
+            start_y_tile = int(self.view_offset_y / self.tile_size_y)
+            stop_y_tile = int((self.view_offset_y + self.view_height
+                               + self.tile_size_y - 1) / self.tile_size_y)
+            stop_y_tile = min(self.tile_src.num_tiles_y-1, stop_y_tile) + 1
+            row_list = range(start_y_tile, stop_y_tile)
+            y_pix_start = start_y_tile * self.tile_size_y - self.view_offset_y
 
-        The 'extent' here is the extent of the point+radius.
-        """
+        return (col_list, row_list, x_pix_start, y_pix_start)
 
-        # get point view coords and perturb point to placement
-        (xview, yview) = view
-        point = self.point_placement(place, xview, yview, x_off, y_off,
-                                     self.view_width, self.view_height)
-        (px, py) = point
+    def _draw_layer(self, dc, layer):
+        """Draw one layer, through its raster cache if it has one.
 
-        # extent = (left, right, top, bottom) in view coords
-        elx = px - radius
-        erx = px + radius
-        ety = py - radius
-        eby = py + radius
-        extent = (elx, erx, ety, eby)
+        dc     device context to draw on
+        layer  the layer object to draw
+        """
 
-        # decide if point and extent are off-view
-        if (px < 0 or px > self.view_width
-                or py < 0 or py > self.view_height):
-            view = None
+        if layer.tile_cached and layer.map_rel:
+            self._draw_tiled_layer(dc, layer)
+        elif layer.cached and layer.map_rel:
+            self._draw_cached_layer(dc, layer)
+        elif self.ViewLayerCache and not layer.map_rel:
+            dc.DrawBitmap(self._view_layer_bitmap(layer), 0, 0, True)
+        elif layer.raster:
+            self._draw_raster_layer(dc, layer)
+        elif self.drafting:
+            # leave out labels and thin out dense layers
+            if layer.type == self.TypeText:
+                return
+            data = self._visible_data(layer)
+            max_objects = self.DraftMaxObjects
+            if (isinstance(data, (list, _LayerColumns))
+                    and len(data) > max_objects):
+                step = (len(data) + max_objects - 1) // max_objects
+                data = data[::step]
+            layer.painter(dc, data, map_rel=layer.map_rel)
+        else:
+            layer.painter(dc, self._visible_data(layer), map_rel=layer.map_rel)
 
-        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
-            # no extent if ALL of extent is off-view
-            extent = None
+    def _paint_layer(self, dc, layer):
+        """Draw a layer with its painter, or the rasterizer for raster layers.
 
-        return (point, extent)
+        dc     device context to draw on
+        layer  the layer object to draw
+        """
 
-    def PexExtent(self, place, geo, x_off, y_off, w, h):
-        """Given an extent object convert point/extent coords to view coords.
+        if layer.raster:
+            self._draw_raster_layer(dc, layer)
+        else:
+            layer.painter(dc, self._visible_data(layer), map_rel=layer.map_rel)
 
-        place         placement string
-        geo           point position tuple (xgeo, ygeo)
-        x_off, y_off  X and Y offsets
-        w, h          width and height of extent in pixels
+    def _visible_data(self, layer):
+        """Get the draw data of a layer that may be visible in the view.
 
-        Return a tuple of point and extent origins (point, extent) where 'point'
-        is (px, py) and extent is (elx, erx, ety, eby) (both in view coords).
-        Return None if point is off-view.
+        layer  the layer object
 
-        An extent object can be either an image object or a text object.
+        See _view_candidates().
         """
 
-        # get point view coords
-        point = self.Geo2View(geo)
-        (px, py) = point
+        return self._view_candidates(layer, 0, self.view_width,
+                                     0, self.view_height)
 
-        # extent = (left, right, top, bottom) in view coords
-        extent = self.ViewExtent(place, point, w, h, x_off, y_off)
-        (elx, erx, ety, eby) = extent
+    def _view_candidates(self, layer, lx, rx, ty, by):
+        """Get the draw data of a layer that may be drawn in a view area.
 
-        # decide if point and extent are off-view
-        if px < 0 or px > self.view_width or py < 0 or py > self.view_height:
-            point = None
+        layer           the layer object
+        lx, rx, ty, by  limits of the area in view coordinates
 
-        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
-            # no extent if ALL of extent is off-view
-            extent = None
+        Map-relative layers with at least IndexMinObjects objects are culled
+        through the layer spatial index, querying the geo extent of the
+        area grown by the layer index margin.  The objects keep their order
+        in the layer data.  Other layers return all their data.
+        """
 
-        return (point, extent)
+        data = layer.data
+        if (not layer.map_rel or not isinstance(data, (list, _LayerColumns))
+                or len(data) < self.IndexMinObjects):
+            return data
 
-    def PexExtentView(self, place, view, x_off, y_off, w, h):
-        """Given a view object convert point/extent coords to view coords.
+        index = self._layer_index(layer)
+        margin = layer.index_margin
+        (llon, tlat) = self.View2Geo((lx - margin, ty - margin))
+        (rlon, blat) = self.View2Geo((rx + margin, by + margin))
+        hits = index.query(min(llon, rlon), max(llon, rlon),
+                           min(blat, tlat), max(blat, tlat))
 
-        place         placement string
-        view          point position tuple (xview, yview)
-        x_off, y_off  X and Y offsets
-        w, h          width and height of extent in pixels
+        if isinstance(data, _LayerColumns):
+            return data.take(hits)
+        return [data[i] for i in hits]
 
-        Return a tuple of point and extent origins (point, extent) where 'point'
-        is (px, py) and extent is (elx, erx, ety, eby) (both in view coords).
-        Either point or extent is None if object off-view.
+    def _layer_index(self, layer):
+        """Get the spatial index of a map-relative layer.
 
-        Takes size of extent object into consideration.
-        """
+        layer  the layer object
 
-        # get point view coords and perturb point to placement origin
-        (xview, yview) = view
-        point = self.point_placement(place, xview, yview, 0, 0,
-                                     self.view_width, self.view_height)
+        The index is built from the geo bounding boxes of the layer objects
+        the first time it is needed after the layer data changes.  Also sets
+        layer.index_margin, the most pixels any object may be drawn away
+        from its geo bounding box (offsets, radius, size and line width).
+        """
 
-        # get point view coords (X and Y)
-        (px, py) = view
+        if layer.index is not None:
+            return layer.index
+
+        data = layer.data
+        if isinstance(data, _PointColumns):
+            # worst case radius plus offsets over all points
+            xs = data.x.tolist()
+            ys = data.y.tolist()
+            radius = max([self.style_pool[style][0]
+                          for style in np.unique(data.style).tolist()] or [0])
+            margin = 0
+            if len(data):
+                margin = (radius + np.abs(data.x_off).max()
+                          + np.abs(data.y_off).max())
+            layer.index = spatial_index.GridIndex(zip(xs, xs, ys, ys))
+            layer.index_margin = int(margin) + 1
+            return layer.index
+
+        if isinstance(data, _ShapeColumns):
+            # worst case line width plus offsets over all shapes
+            width = max([self.style_pool[style][0]
+                         for style in np.unique(data.style).tolist()] or [0])
+            margin = 0
+            if len(data):
+                margin = (width + np.abs(data.x_off).max()
+                          + np.abs(data.y_off).max())
+            layer.index = spatial_index.GridIndex(map(tuple,
+                                                      data.bbox.tolist()))
+            layer.index_margin = int(margin) + 1
+            return layer.index
+
+        bboxes = []
+        margin = 0
+        for obj in data:
+            (bbox, obj_margin) = self._object_bbox(layer, obj)
+            bboxes.append(bbox)
+            margin = max(margin, obj_margin)
+
+        layer.index = spatial_index.GridIndex(bboxes)
+        layer.index_margin = int(margin) + 1
+
+        return layer.index
+
+    def _object_bbox(self, layer, obj):
+        """Get the geo bounding box of one draw data object of a layer.
+
+        layer  the layer object holding 'obj'
+        obj    a draw data tuple of the layer
+
+        Returns a tuple (bbox, margin) where 'bbox' is (minx, maxx, miny, maxy)
+        and 'margin' the most pixels the object may be drawn outside 'bbox'.
+        """
 
-        # extent = (left, right, top, bottom) in view coords
-        extent = self.ViewExtent(place, view, w, h, x_off, y_off,
-                                 self.view_width, self.view_height)
-        (elx, erx, ety, eby) = extent
+        styles = self.style_pool
+
+        if layer.type == self.TypePoint:
+            (x, y, _, style, x_off, y_off, _) = obj
+            return ((x, x, y, y), styles[style][0] + abs(x_off) + abs(y_off))
+
+        if layer.type in (self.TypePolygon, self.TypePolyline):
+            (p, _, style, x_off, y_off, _) = obj
+            if np and isinstance(p, np.ndarray):
+                ((minx, miny), (maxx, maxy)) = (p.min(axis=0).tolist(),
+                                                p.max(axis=0).tolist())
+                return ((minx, maxx, miny, maxy),
+                        styles[style][0] + abs(x_off) + abs(y_off))
+            xs = [pt[0] for pt in p]
+            ys = [pt[1] for pt in p]
+            return ((min(xs), max(xs), min(ys), max(ys)),
+                    styles[style][0] + abs(x_off) + abs(y_off))
+
+        if layer.type == self.TypeImage:
+            (x, y, _, w, h, _, x_off, y_off, style, _) = obj
+        else:
+            (x, y, _, _, style, x_off, y_off, w, h, _) = obj
+        return ((x, x, y, y),
+                max(w, h) + styles[style][0] + abs(x_off) + abs(y_off))
 
-        # decide if point and extent are off-view
-        if px < 0 or px > self.view_width or py < 0 or py > self.view_height:
-            view = None
+    def _update_index(self, layer, changed):
+        """Move changed objects of a layer in its spatial index.
 
-        if erx < 0 or elx > self.view_width or eby < 0 or ety > self.view_height:
-            # no extent if ALL of extent is off-view
-            extent = None
+        layer    the layer object, its data already replaced
+        changed  list of indices of the changed objects in layer.data
+        """
 
-        return (point, extent)
+        margin = layer.index_margin
+        for i in changed:
+            (bbox, obj_margin) = self._object_bbox(layer, layer.data[i])
+            layer.index.update(i, bbox)
+            margin = max(margin, int(obj_margin) + 1)
+        layer.index_margin = margin
 
-    def PexPolygon(self, place, poly, x_off, y_off):
-        """Given a polygon/line obj (geo coords) get point/extent in view coords.
+    def _point_columns(self, layer):
+        """Get the data of a point layer as numpy arrays.
 
-        place         placement string
-        poly          list of point position tuples (xgeo, ygeo)
-        x_off, y_off  X and Y offsets
+        layer  the point layer object
 
-        Return a tuple of point and extent origins (point, extent) where 'point'
-        is a list of (px, py) and extent is (elx, erx, ety, eby) (both in view
-        coords).  Return None for either or both if off-view.
+        Returns a dictionary of arrays, one element per point.  The arrays
+        are built when first needed and kept until the layer data changes.
         """
 
-        # get polygon/line points in perturbed view coordinates
-        view = []
-        for geo in poly:
-            (xview, yview) = self.Geo2View(geo)
-            point = self.point_placement(place, xview, yview, x_off, y_off)
-            view.append(point)
+        if layer.columns is None and isinstance(layer.data, _PointColumns):
+            data = layer.data
+            place = [self.RasterPlacement.get(p, (0, 0, 0, 0))
+                     for p in _PointColumns.Placements]
+            place = np.array(place, dtype=np.float64)[data.place]
+            layer.columns = {'x': data.x, 'y': data.y,
+                             'style': data.style,
+                             'x_off': data.x_off.astype(np.float64),
+                             'y_off': data.y_off.astype(np.float64),
+                             'cx': place[:,0], 'sx': place[:,1],
+                             'cy': place[:,2], 'sy': place[:,3],
+                             'tile': None}
+        elif layer.columns is None:
+            data = layer.data
+            place = [self.RasterPlacement.get(d[2], (0, 0, 0, 0)) for d in data]
+            place = np.array(place, dtype=np.float64).reshape(-1, 4)
+            layer.columns = {'x': np.array([d[0] for d in data], np.float64),
+                             'y': np.array([d[1] for d in data], np.float64),
+                             'style': np.array([d[3] for d in data], np.int32),
+                             'x_off': np.array([d[4] for d in data], np.float64),
+                             'y_off': np.array([d[5] for d in data], np.float64),
+                             'cx': place[:,0], 'sx': place[:,1],
+                             'cy': place[:,2], 'sy': place[:,3],
+                             'tile': None}
+
+        return layer.columns
+
+    def _shape_columns(self, layer):
+        """Get the vertices of a polygon or polyline layer as numpy arrays.
+
+        layer  the polygon or polyline layer object
+
+        Returns a dictionary {'x': xs, 'y': ys} where xs and ys are lists
+        holding an array of vertex coordinates per object.  The arrays are
+        built when first needed and kept until the layer data changes.
+        """
 
-        # get extent - max/min x and y
-        # extent = (left, right, top, bottom) in view coords
-        elx = min(view, key=lambda x: x[0])[0]
-        erx = max(view, key=lambda x: x[0])[0]
-        ety = min(view, key=lambda x: x[1])[1]
-        eby = max(view, key=lambda x: x[1])[1]
-        extent = (elx, erx, ety, eby)
+        if layer.columns is None and isinstance(layer.data, _ShapeColumns):
+            # views of the shared vertex array, no copies
+            data = layer.data
+            xs = []
+            ys = []
+            for (first, last) in zip(data.starts.tolist(), data.ends.tolist()):
+                xs.append(data.vertices[first:last,0])
+                ys.append(data.vertices[first:last,1])
+            layer.columns = {'x': xs, 'y': ys}
+        elif layer.columns is None:
+            xs = []
+            ys = []
+            for d in layer.data:
+                vertices = np.array(d[0], dtype=np.float64).reshape(-1, 2)
+                xs.append(vertices[:,0])
+                ys.append(vertices[:,1])
+            layer.columns = {'x': xs, 'y': ys}
+
+        return layer.columns
+
+    def _geo2tile_array(self, xgeo, ygeo):
+        """Convert arrays of geo coordinates to tile coordinates.
+
+        xgeo, ygeo  numpy arrays of geo coordinates
+
+        Returns a tuple of numpy arrays (xtile, ytile).  Uses the tile
+        source Geo2TileArray() method if it has one, else converts point
+        by point, for tile sources not based on tiles.BaseTiles.
+        """
 
-        # decide if polygon or extent are off-view
-        res_pt = None
-        res_ex = None
-        for (px, py) in view:
-            if ((px >= 0 and px < self.view_width)
-                    and (py >= 0 and py < self.view_height)):
-                res_pt = view
-                res_ex = extent
-                break
+        geo2tile = getattr(self.tile_src, 'Geo2TileArray', None)
+        if geo2tile:
+            return geo2tile(xgeo, ygeo)
 
-        return (res_pt, res_ex)
+        tiles = [self.tile_src.Geo2Tile(geo) for geo in zip(xgeo, ygeo)]
+        tiles = np.array(tiles, dtype=np.float64).reshape(-1, 2)
+        return (tiles[:,0], tiles[:,1])
 
-    def PexPolygonView(self, place, poly, x_off, y_off):
-        """Given a polygon/line obj (view coords) get point/extent in view coords.
+    def _draw_raster_layer(self, dc, layer, pixels=None):
+        """Draw a point layer with the numpy rasterizer.
 
-        place         placement string
-        poly          list of point position tuples (xview, yview)
-        x_off, y_off  X and Y offsets
+        dc      device context to draw on
+        layer   the point layer object to draw
+        pixels  the layer already rasterized by _rasterize_points(), if done
 
-        Return a tuple of point and extent origins (point, extent) where 'point'
-        is a list of (px, py) and extent is (elx, erx, ety, eby) (both in view
-        coords).  Return None for either or both if off-view.
+        All points are projected with numpy, stamped into one RGBA buffer
+        with alpha blending and the buffer drawn as a single bitmap.
         """
 
-        # get polygon/line points in view coordinates
-        view = []
-        for (xview, yview) in poly:
-            point = self.point_placement(place, xview, yview, x_off, y_off,
-                                         self.view_width, self.view_height)
-            view.append(point)
+        if pixels is None:
+            pixels = self._rasterize_points(self._raster_job(layer))
 
-        # get extent - max/min x and y
-        # extent = (left, right, top, bottom) in view coords
-        elx = min(view, key=lambda x: x[0])[0]
-        erx = max(view, key=lambda x: x[0])[0]
-        ety = min(view, key=lambda x: x[1])[1]
-        eby = max(view, key=lambda x: x[1])[1]
-        extent = (elx, erx, ety, eby)
+        bmp = wx.BitmapFromBufferRGBA(self.view_width, self.view_height,
+                                      pixels)
+        dc.DrawBitmap(bmp, 0, 0, True)
 
-        # decide if polygon/line or extent are off-view
-        res_pt = None
-        res_ex = None
-        for (px, py) in view:
-            if ((px >= 0 and px < self.view_width)
-                    and (py >= 0 and py < self.view_height)):
-                res_pt = view
-                res_ex = extent
-                break
+    def _raster_job(self, layer):
+        """Prepare a point layer for _rasterize_points().
 
-        return (res_pt, res_ex)
+        layer  the point layer object
 
-######
-# GUI stuff
-######
+        Projects the points into view pixel coordinates and looks up the
+        style radii and colours.  Geo points are converted to tile
+        coordinates once per level.  Must run in the GUI thread.
 
-    def OnMove(self, event):
-        """Handle a mouse move (map drag or rectangle select).
+        Returns a dictionary of the rasterizer inputs.
+        """
 
-        event  the mouse move event
+        cols = self._point_columns(layer)
+        width = self.view_width
+        height = self.view_height
 
-        If SHIFT key is down, do rectangle select.
-        Otherwise pan the map if we are dragging.
-        """
+        if layer.map_rel:
+            if cols['tile'] is None or cols['tile'][0] != self.level:
+                (xtile, ytile) = self._geo2tile_array(cols['x'], cols['y'])
+                cols['tile'] = (self.level, xtile, ytile)
+            (_, xtile, ytile) = cols['tile']
+            xview = xtile*self.tile_size_x - self.view_offset_x
+            yview = ytile*self.tile_size_y - self.view_offset_y
+        else:
+            xview = cols['x'] + np.floor(cols['cx']*width)
+            yview = cols['y'] + np.floor(cols['cy']*height)
 
-        # for windows, set focus onto pyslip window
-        # linux seems to do this automatically
-        if sys.platform == 'win32' and self.FindFocus() != self:
-            self.SetFocus()
+        xview = np.rint(xview + cols['sx']*cols['x_off']).astype(np.int64)
+        yview = np.rint(yview + cols['sy']*cols['y_off']).astype(np.int64)
 
-        # get current mouse position
-        mouse_view = event.GetPositionTuple()
-        mouse_map = self.View2Geo(mouse_view)
-        self.RaiseEventPosition(mouse_map, mouse_view)
+        styles = {}
+        for style in np.unique(cols['style']).tolist():
+            (radius, colour) = self.style_pool[style]
+            styles[style] = (radius, self.style_pool.rgba(colour))
 
-        if event.Dragging() and event.LeftIsDown():
-            (x, y) = mouse_view
+        return {'width': width, 'height': height,
+                'x': xview, 'y': yview,
+                'style': cols['style'], 'styles': styles}
 
-            # are we doing box select?
-            if self.is_box_select:
-                # set select box point 2 at mouse position
-                (self.sbox_w, self.sbox_h) = (x - self.sbox_1_x,
-                                              y - self.sbox_1_y)
-            elif not self.last_drag_x is None:
-                # no, just a map drag
-                self.was_dragging = True
-                dx = self.last_drag_x - x
-                dy = self.last_drag_y - y
+    @staticmethod
+    def _rasterize_points(job):
+        """Stamp projected points into an RGBA pixel buffer.
 
-                # move the map in the view
-                self.view_offset_x += dx
-                self.view_offset_y += dy
+        job  a dictionary of inputs from _raster_job()
 
-                # limit drag at edges of map
-                if self.map_width > self.view_width:
-                    # if map > view, don't allow edge to show background
-                    if self.view_offset_x < 0:
-                        self.view_offset_x = 0
-                    elif self.view_offset_x > self.max_x_offset:
-                        self.view_offset_x = self.max_x_offset
-                else:
-                    # else map < view, centre X
-                    self.view_offset_x = (self.map_width
-                                          - self.view_width) / 2
+        Only uses numpy, so may run outside the GUI thread.  Points of one
+        style blend over each other as if drawn one at a time, however many
+        cover a pixel.  The styles are done one after the other in order of
+        their first point, so where points of different styles overlap the
+        stacking can differ from the painter.
 
-                if self.map_height > self.view_height:
-                    # if map > view, don't allow edge to show background
-                    if self.view_offset_y < 0:
-                        self.view_offset_y = 0
-                    elif self.view_offset_y > self.max_y_offset:
-                        self.view_offset_y = self.max_y_offset
-                else:
-                    # else map < view, centre Y
-                    self.view_offset_y = (self.map_height
-                                          - self.view_height) / 2
+        Returns a (height, width, 4) numpy array of RGBA bytes.
+        """
 
-                # adjust remembered X,Y
-                self.last_drag_x = x
-                self.last_drag_y = y
+        width = job['width']
+        height = job['height']
+        xview = job['x']
+        yview = job['y']
+
+        # premultiplied RGBA accumulation buffer
+        buff = np.zeros((height, width, 4), dtype=np.float32)
+        flat = buff.reshape(-1, 4)
+
+        (order, first) = np.unique(job['style'], return_index=True)
+        for style in order[np.argsort(first)].tolist():
+            (radius, rgba) = job['styles'][style]
+            if radius <= 0 or rgba[3] == 0:
+                continue
+
+            # points of this style near enough to the view to show
+            x = xview[job['style'] == style]
+            y = yview[job['style'] == style]
+            on = ((x >= -radius) & (x < width + radius)
+                  & (y >= -radius) & (y < height + radius))
+            x = x[on]
+            y = y[on]
+            if not len(x):
+                continue
+
+            (r, g, b, a) = [v / 255.0 for v in rgba]
+            src = np.array([r*a, g*a, b*a, a], dtype=np.float32)
+
+            # stamp a disc of the point radius, one pixel offset at a time
+            for dy in range(-radius, radius+1):
+                for dx in range(-radius, radius+1):
+                    if dx*dx + dy*dy > radius*radius + radius:
+                        continue
+                    tx = x + dx
+                    ty = y + dy
+                    ok = (tx >= 0) & (tx < width) & (ty >= 0) & (ty < height)
+
+                    # 'n' copies of src over dst leave dst*(1-a)**n and
+                    # add src*(1 - (1-a)**n)/a
+                    (index, n) = np.unique(ty[ok]*width + tx[ok],
+                                           return_counts=True)
+                    keep = ((1.0 - a) ** n).astype(np.float32)[:,None]
+                    flat[index] = src*((1.0 - keep)/a) + flat[index]*keep
+
+        # back to straight alpha bytes for wx
+        alpha = buff[:,:,3:]
+        rgb = buff[:,:,:3] / np.maximum(alpha, 1.0e-6)
+        out = np.concatenate((rgb, alpha), axis=2)
+        return np.clip(out*255.0 + 0.5, 0, 255).astype(np.uint8)
+
+    def _parallel_rasters(self):
+        """Rasterize the visible map-relative raster layers in parallel.
+
+        Returns a dictionary mapping layer ID to the layer pixel buffer.
+        The dictionary is empty if parallel rasterizing is off or there
+        are fewer than two layers to do.
+        """
 
-                self.RecalcViewLimits()
+        if self.raster_pool is None:
+            return {}
 
-            # redraw client area
-            self.Update()
+        layers = []
+        for id in self.layer_z_order:
+            l = self.layer_mapping[id]
+            if (l.visible and self.level in l.show_levels and l.raster
+                    and l.map_rel and not (l.cached or l.tile_cached)):
+                layers.append(l)
 
-    def OnKeyDown(self, event):
-        """Handle pressing a key down.
+        if len(layers) < 2:
+            return {}
 
-        Only look at the SHIFT key, for box select or zoom out.
-        """
+        jobs = [self._raster_job(l) for l in layers]
+        pixels = self.raster_pool.map(self._rasterize_points, jobs)
+        return dict(zip([l.id for l in layers], pixels))
 
-        if event.m_keyCode == wx.WXK_SHIFT:
-            self.shift_down = True
-            self.default_cursor = BoxSelectCursor
-            self.SetCursor(wx.StockCursor(BoxSelectCursor))
+    def _draw_cached_layer(self, dc, layer):
+        """Draw a map-relative layer from its raster cache.
 
-    def OnKeyUp(self, event):
-        """Handle pressing a key down.
+        dc     device context to draw on
+        layer  the layer object to draw
 
-        Only look at the SHIFT key, for box select or zoom out.
+        The cache is (re)rendered if it is for another level or if the view
+        is no longer entirely inside the cached area.
         """
-        if event.m_keyCode == wx.WXK_SHIFT:
-            self.shift_down = False
-            self.default_cursor = DefaultCursor
-            self.SetCursor(wx.StockCursor(DefaultCursor))
 
+        view_x = self.view_offset_x
+        view_y = self.view_offset_y
 
-    def OnLeftDown(self, event):
-        """Left mouse button down. Prepare for possible drag."""
+        if not self._cache_covers_view(layer):
+            layer.cache = None
 
-        click_posn = event.GetPositionTuple()
+        if layer.cache is None:
+            margin = self.LayerCacheMargin
+            x = int(view_x) - margin
+            y = int(view_y) - margin
+            bmp = self._render_layer(layer, x, y,
+                                     self.view_width + 2*margin,
+                                     self.view_height + 2*margin)
+            layer.cache = (self.level, x, y, bmp)
 
-        if self.shift_down:
-            self.is_box_select = True
-            (self.sbox_w, self.sbox_h) = (0, 0)
-            (self.sbox_1_x, self.sbox_1_y) = click_posn
-        else:
-            self.is_box_select = False
-            self.SetCursor(wx.StockCursor(wx.CURSOR_HAND))
-            (self.last_drag_x, self.last_drag_y) = click_posn
-        event.Skip()
+        (_, x, y, bmp) = layer.cache
+        dc.DrawBitmap(bmp, int(x - view_x), int(y - view_y), True)
 
-    def OnLeftUp(self, event):
-        """Left mouse button up.
+    def _cache_covers_view(self, layer):
+        """Check if the raster cache of a layer can draw the whole view.
 
-        Could be end of a drag or point or box selection.  If it's the end of
-        a drag we don't do a lot.  If a selection we process that.
+        layer  the layer object
+
+        Returns True if the layer has a cache for the current level that
+        covers the view.
         """
 
-        # turn off any dragging
-        self.last_drag_x = self.last_drag_y = None
+        if not layer.cache:
+            return False
 
-        # if required, ignore this event
-        if self.ignore_next_up:
-            self.ignore_next_up = False
-            return
+        (level, x, y, bmp) = layer.cache
+        (w, h) = bmp.GetSize()
+        return (level == self.level
+                and x <= self.view_offset_x
+                and self.view_offset_x + self.view_width <= x + w
+                and y <= self.view_offset_y
+                and self.view_offset_y + self.view_height <= y + h)
 
-        # cursor back to normal
-        self.SetCursor(wx.StockCursor(self.default_cursor))
+    def _render_layer(self, layer, x, y, w, h, margin=0):
+        """Render a map-relative layer into a transparent bitmap.
 
-        # we need a repaint to remove any selection box, but NOT YET!
-        delayed_paint = self.sbox_1_x       # True if box select active
+        layer   the layer object to render
+        x, y    map pixel coordinates of the bitmap top-left corner
+        w, h    bitmap width and height in pixels
+        margin  pixels rendered around the bitmap area then cropped off
 
-        # if any layers interested, inform of possible select
-        if not self.was_dragging:
-            if self.is_box_select:
-                # get canonical selection box in view coordinates
-                (ll_vx, ll_vy, tr_vx, tr_vy) = self.sel_box_canonical()
+        Painters drop objects whose position is outside the view, so an
+        object near the bitmap edge is only drawn if the margin covers its
+        position.
 
-                # selection box corners in tile coords
-                ll_tx = float(ll_vx+self.view_offset_x) / self.tile_size_x
-                ll_ty = float(ll_vy+self.view_offset_y) / self.tile_size_y
-                tr_tx = float(tr_vx+self.view_offset_x) / self.tile_size_x
-                tr_ty = float(tr_vy+self.view_offset_y) / self.tile_size_y
+        Returns the new bitmap.
+        """
 
-                # selection box in geo coords
-                ll_g = self.tile_src.Tile2Geo((ll_tx, ll_ty))
-                tr_g = self.tile_src.Tile2Geo((tr_tx, tr_ty))
+        (x, y) = (x - margin, y - margin)
+        (w, h) = (w + 2*margin, h + 2*margin)
 
-                # check each layer for a box select event
-                # we work on a copy as user response could change order
-                for id in self.layer_z_order[:]:
-                    l = self.layer_mapping[id]
-                    # if layer visible and selectable
-                    if l.selectable and l.visible:
-                        if l.map_rel:
-                            # map-relative, get all points selected (if any)
-                            sel = self.layerBSelHandler[l.type](l, ll_g, tr_g)
-                        else:
-                            # view-relative
-                            sel = self.layerBSelHandler[l.type](l,
-                                                                (ll_vx, ll_vy),
-                                                                (tr_vx, tr_vy))
-                        self.RaiseEventBoxSelect(layer=l, selection=sel)
+        bmp = wx.EmptyBitmapRGBA(w, h, 0, 0, 0, 0)
+        dc = wx.MemoryDC(bmp)
 
-                        # user code possibly updated screen
-                        delayed_paint = True
-                self.is_box_select = False
-            else:
-                # possible point selection, get click point in view coords
-                clickpt_v = event.GetPositionTuple()
+        # painters draw relative to the view, so make the view the bitmap
+        # cached rasters are kept, so always draw them at full quality
+        drafting = self.drafting
+        self.drafting = False
+        self._push_view(x, y, w, h)
+        try:
+            self._paint_layer(dc, layer)
+        finally:
+            self._pop_view()
+            self.drafting = drafting
 
-                # get click point in geo coords
-                clickpt_g = self.View2Geo(clickpt_v)
+        dc.SelectObject(wx.NullBitmap)
 
-                # check each layer for a point select handler
-                # we work on a copy as user code could change order
-                for id in self.layer_z_order[:]:
-                    l = self.layer_mapping[id]
-                    # if layer visible and selectable
-                    if l.selectable and l.visible:
-                        if l.map_rel:
-                            sel = self.layerPSelHandler[l.type](l, clickpt_g)
-                        else:
-                            sel = self.layerPSelHandler[l.type](l, clickpt_v)
-                        self.RaiseEventSelect(mposn=clickpt_g, vposn=clickpt_v,
-                                              layer=l, selection=sel)
-                        # user code possibly updated screen
-                        delayed_paint = True
+        if margin:
+            bmp = bmp.GetSubBitmap(wx.Rect(margin, margin,
+                                           w - 2*margin, h - 2*margin))
+        return bmp
 
-        # turn off drag
-        self.was_dragging = False
+    def _draw_tiled_layer(self, dc, layer):
+        """Draw a map-relative layer from its overlay tiles.
 
-        # turn off box selection mechanism
-        self.is_box_select = False
-        self.sbox_1_x = self.sbox_1_y = None
+        dc     device context to draw on
+        layer  the layer object to draw
 
-        # force PAINT event if required
-        if delayed_paint:
-            self.Update()
+        Uses the same tile grid as the map tiles.  Missing overlay tiles are
+        rendered and put into the overlay cache.  Tiles are rendered with
+        the layer index margin around them, so objects across a tile edge
+        are drawn in every tile they cover.
+        """
 
-    def OnLeftDClick(self, event):
-        """Left mouse button double-click.
+        (col_list, row_list, x_pix_start, y_pix_start) = self._tile_grid()
+        margin = None
+        x_pix = x_pix_start
+        for x in col_list:
+            y_pix = y_pix_start
+            for y in row_list:
+                key = (layer.id, self.level, x, y)
+                try:
+                    bmp = self.overlay_cache[key]
+                except KeyError:
+                    if margin is None:
+                        self._layer_index(layer)
+                        margin = layer.index_margin
+                    bmp = self._render_layer(layer,
+                                             x * self.tile_size_x,
+                                             y * self.tile_size_y,
+                                             self.tile_size_x,
+                                             self.tile_size_y,
+                                             margin)
+                    self.overlay_cache[key] = bmp
+                dc.DrawBitmap(bmp, x_pix, y_pix, True)
+                y_pix += self.tile_size_y
+            x_pix += self.tile_size_x
 
-        Zoom in (if possible).
-        Zoom out (if possible) if shift key is down.
+    def _invalidate_layer(self, layer, disk=False):
+        """Discard all cached rasters of a layer.
+
+        layer  the layer object
+        disk   if True also remove the layer's on-disk overlay tiles, only
+               done when the layer data changes
         """
 
-        # ignore next Left UP event
-        self.ignore_next_up = True
+        layer.invalidate()
+        if layer.tile_cached:
+            self.overlay_cache.forget_layer(layer.id, disk=disk)
 
-        # FIXME: should ignore double-click off the map, but within view
-        # FIXME: a possible workaround is to limit minimum view level
+    def _push_view(self, offset_x, offset_y, width, height):
+        """Temporarily change the view to another area of the map.
 
-        # get view coords of mouse double click, want same centre afterwards
-        vposn = event.GetPositionTuple()
-        gposn = self.View2Geo(vposn)
+        offset_x, offset_y  map pixel offsets of the new view top-left
+        width, height       size of the new view in pixels
 
-        if self.shift_down:
-            # zoom out if shift key also down
-            if self.GotoLevel(self.level - 1):
-                self.ZoomOut(gposn)
-        else:
-            # zoom in
-            if self.GotoLevel(self.level + 1):
-                self.ZoomIn(gposn)
+        Must be paired with a call to _pop_view().
+        """
 
-    def OnMiddleDown(self, event):
-        """Middle mouse button down.  Do nothing in this version."""
+        self.view_stack.append((self.view_offset_x, self.view_offset_y,
+                                self.view_width, self.view_height,
+                                self.view_llon, self.view_rlon,
+                                self.view_tlat, self.view_blat))
 
-        pass
+        self.view_offset_x = offset_x
+        self.view_offset_y = offset_y
+        self.view_width = width
+        self.view_height = height
+        self.RecalcViewLimits()
 
-    def OnMiddleUp(self, event):
-        """Middle mouse button up.  Do nothing in this version."""
+    def _pop_view(self):
+        """Restore the view saved by the matching _push_view()."""
 
-        pass
+        (self.view_offset_x, self.view_offset_y,
+         self.view_width, self.view_height,
+         self.view_llon, self.view_rlon,
+         self.view_tlat, self.view_blat) = self.view_stack.pop()
 
-    def OnRightDown(self, event):
-        """Right mouse button down. Prepare for right select (no drag)."""
+    def _object_extent(self, layer, obj):
+        """Get the view extent of one draw data object of a layer.
 
-        click_posn = event.GetPositionTuple()
+        layer  the layer object holding 'obj'
+        obj    a draw data tuple of the layer
 
-        if self.shift_down:
-            self.is_box_select = True
-            self.SetCursor(wx.StockCursor(BoxSelectCursor))
-            (self.sbox_w, self.sbox_h) = (0, 0)
-            (self.sbox_1_x, self.sbox_1_y) = click_posn
-        event.Skip()
+        Returns an extent tuple (elx, erx, ety, eby) in view coordinates
+        including the line width or point radius, or None if off-view.
+        """
 
-    def OnRightUp(self, event):
-        """Right mouse button up.
+        styles = self.style_pool
 
-        Note that when we iterate through the layer_z_order list we must
-        iterate on a *copy* as the user select process can modify
-        self.layer_z_order.
+        if layer.type == self.TypePoint:
+            pex = self.PexPointView
+            if layer.map_rel:
+                pex = self.PexPoint
+            (x, y, place, style, x_off, y_off, _) = obj
+            radius = styles[style][0]
+            (_, extent) = pex(place, (x, y), x_off, y_off, radius)
+            return extent
 
-        THIS CODE HASN'T BEEN LOOKED AT IN A LONG, LONG TIME.
-        """
+        if layer.type in (self.TypeImage, self.TypeText):
+            pex = self.PexExtentView
+            if layer.map_rel:
+                pex = self.PexExtent
 
-        if self.ignore_next_right_up:
-            self.ignore_next_right_up = False
-            return
+            if layer.type == self.TypeImage:
+                (x, y, _, w, h, place, x_off, y_off, style, _) = obj
+            else:
+                (x, y, _, place, style, x_off, y_off, w, h, _) = obj
+            radius = styles[style][0]
 
-        self.SetCursor(wx.StockCursor(DefaultCursor))
+            (pt, extent) = pex(place, (x, y), x_off, y_off, w, h)
+            if pt and radius:
+                # include the hotspot marker
+                (px, py) = pt
+                marker = (px-radius, px+radius, py-radius, py+radius)
+                if extent:
+                    extent = (min(extent[0], marker[0]),
+                              max(extent[1], marker[1]),
+                              min(extent[2], marker[2]),
+                              max(extent[3], marker[3]))
+                else:
+                    extent = marker
+            return extent
 
-        # we need a repaint to remove any selection box, but NOT YET!
-        delayed_paint = self.sbox_1_x       # True if box select active
+        # polygon or polyline
+        pex = self.PexPolygonView
+        if layer.map_rel:
+            pex = self.PexPolygon
+        (p, place, style, x_off, y_off, _) = obj
+        width = styles[style][0]
+        (_, extent) = pex(place, p, x_off, y_off)
+        if extent:
+            (elx, erx, ety, eby) = extent
+            extent = (elx-width, erx+width, ety-width, eby+width)
+        return extent
 
-        # if any layers interested, inform of possible select
-        if self.is_box_select:
-            # possible box selection
-            ll_x = (self.sbox_1_x + self.view_offset_x) / self.tile_size_x
-            ll_y = (self.sbox_1_y + self.view_offset_y) / self.tile_size_y
+    def _redraw_rects(self, extents):
+        """Redraw the parts of the view covered by a list of extents.
 
-            ll_g = self.tile_src.Tile2Geo((ll_x, ll_y))
-            tr_g = self.tile_src.Tile2Geo((ll_x + self.sbox_w, ll_y + self.sbox_h))
+        extents  list of view extents (elx, erx, ety, eby)
 
-            # check each layer for a box select event
-            # we work on a copy as user response could change order
-            for id in self.layer_z_order[:]:
-                l = self.layer_mapping[id]
-                if l.selectable and l.visible:   # and l.event_box_select:
-                    if l.map_rel:
-                        # map-relative, get all points selected (if any)
-                        pts = self.layerBSelHandler[l.type](l, ll_g, tr_g)
-                    else:
-                        # view-relative
-                        pts = self.layerBSelHandler[l.type](l,
-                                                            (ll_x, ll_y),
-                                                            (ll_x+self.sbox_w,
-                                                             ll_y+self.sbox_h))
-                    self.RaiseEventSelect(EventRightBoxSelect, layer=l, selection=pts)
+        Overlapping areas are merged.  If the total area is more than
+        DirtyRectMaxFraction of the view a full redraw is scheduled instead.
+        """
 
-                    # user code possibly updated screen
-                    delayed_paint = True
-            self.is_box_select = False
-        else:
-            # possible point selection, get tile coords
-            click_v = event.GetPositionTuple()
-            (click_vx, click_vy) = click_v
-            click_vx += self.view_offset_x
-            click_vy += self.view_offset_y
-            click_g = self.tile_src.Tile2Geo((click_vx, click_vy))
-            # FIXME: do we REALLY need tile coords?
+        if not extents:
+            return
 
-            # check each layer for a point select callback
-            # we work on a copy as user callback could change order
-            for id in self.layer_z_order[:]:
-                l = self.layer_mapping[id]
-                # if layer visible, selectable and there is a callback
-                if l.selectable and l.visible:
-                    if l.map_rel:
-                        pt = self.layerPSelHandler[l.type](l, click_g)
-                    else:
-                        pt = self.layerPSelHandler[l.type](l, click_v)
-                    self.RaiseEventSelect(EventRightSelect, layer=l, selection=pt,
-                                          mposn=click_g, vposn=click_v)
+        # a full redraw is coming anyway, or the box select snapshot is stale
+        if self.update_pending or self.render_job or self.is_box_select:
+            self.ScheduleUpdate()
+            return
 
-                    # user code possibly updated screen
-                    delayed_paint = True
+        # convert to integer rectangles clipped to the view
+        margin = self.DirtyRectMargin
+        rects = []
+        for (elx, erx, ety, eby) in extents:
+            lx = max(0, int(elx) - margin)
+            rx = min(self.view_width, int(erx) + margin + 1)
+            ty = max(0, int(ety) - margin)
+            by = min(self.view_height, int(eby) + margin + 1)
+            if lx < rx and ty < by:
+                rects.append((lx, rx, ty, by))
+
+        # merge overlapping rectangles until none overlap
+        merged = True
+        while merged:
+            merged = False
+            result = []
+            for r in rects:
+                for (i, m) in enumerate(result):
+                    if (r[0] <= m[1] and m[0] <= r[1]
+                            and r[2] <= m[3] and m[2] <= r[3]):
+                        result[i] = (min(r[0], m[0]), max(r[1], m[1]),
+                                     min(r[2], m[2]), max(r[3], m[3]))
+                        merged = True
+                        break
+                else:
+                    result.append(r)
+            rects = result
 
-        # turn off box selection mechanism
-        self.is_box_select = False
-        self.sbox_1_x = self.sbox_1_y = None
+        area = sum([(rx-lx)*(by-ty) for (lx, rx, ty, by) in rects])
+        if area > self.DirtyRectMaxFraction*self.view_width*self.view_height:
+            self.ScheduleUpdate()
+            return
 
-        # force PAINT event to remove selection box (if required)
-        if delayed_paint:
-            self.Update()
+        for (lx, rx, ty, by) in rects:
+            self._redraw_rect(lx, ty, rx-lx, by-ty)
+            self.RefreshRect(wx.Rect(lx, ty, rx-lx, by-ty), False)
 
-    def OnRightDClick(self, event):
-        """Right mouse button double-click."""
+    def _redraw_rect(self, x, y, w, h):
+        """Redraw one rectangle of the view buffer.
 
-        # ignore next RIGHT UP event
-        self.ignore_next_right_up = True
+        x, y  view coordinates of the rectangle top-left corner
+        w, h  rectangle width and height in pixels
 
-    def OnMouseWheel(self, event):
-        """Mouse wheel event."""
+        Tiles and map-relative layers are drawn with the view temporarily
+        set to the rectangle.  View-relative layers are drawn full view and
+        the rectangle copied out.  Cached layers are drawn from their cache
+        if it is valid, otherwise painted directly so the full view cache
+        isn't replaced by one the size of the rectangle.
+        """
 
-        # get centre of view in map coords, want same centre afterwards
-        x = self.view_width / 2
-        y = self.view_height / 2
-        gposn = self.View2Geo((x, y))
+        bmp = wx.EmptyBitmap(w, h)
+        dc = wx.MemoryDC(bmp)
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        dc.Clear()
 
-        # determine which way to zoom, & *can* we zoom?
-        if event.GetWheelRotation() > 0:
-            if self.GotoLevel(self.level + 1):
-                self.ZoomIn(gposn)
-        else:
-            if self.GotoLevel(self.level - 1):
-                self.ZoomOut(gposn)
+        # draw view-relative layers before the view changes
+        view_bmps = {}
+        for id in self.layer_z_order:
+            l = self.layer_mapping[id]
+            if l.visible and self.level in l.show_levels and not l.map_rel:
+                view_bmps[id] = self._view_layer_bitmap(l)
 
-######
-# Method that overrides _BufferedCanvas.Draw() method.
-# This code does the actual drawing of tiles, layers, etc.
-######
+        self._push_view(self.view_offset_x + x, self.view_offset_y + y, w, h)
+        try:
+            self._draw_tiles(dc)
+            for id in self.layer_z_order:
+                l = self.layer_mapping[id]
+                if l.visible and self.level in l.show_levels:
+                    if (l.map_rel and l.cached and not l.tile_cached
+                            and not self._cache_covers_view(l)):
+                        self._paint_layer(dc, l)
+                    elif l.map_rel:
+                        self._draw_layer(dc, l)
+                    else:
+                        sub = view_bmps[id].GetSubBitmap(wx.Rect(x, y, w, h))
+                        dc.DrawBitmap(sub, 0, 0, True)
+        finally:
+            self._pop_view()
+        dc.SelectObject(wx.NullBitmap)
 
-    def Draw(self, dc):
-        """Do actual map tile and layers drawing.
-        Overrides the _BufferedCanvas.draw() method.
+        dc = wx.MemoryDC(self.buffer)
+        dc.DrawBitmap(bmp, x, y, False)
+        dc.SelectObject(wx.NullBitmap)
 
-        dc  device context to draw on
+    def _view_layer_bitmap(self, layer):
+        """Get a view-relative layer as a transparent view-sized bitmap.
 
-        The idea is to create 4 things that define the tiles to be drawn and
-        where to draw them:
-            x_pix_start  view pixel coord of left side of top-left tile
-            y_pix_start  view pixel coord of top side of top-left tole
-            row_list     list (top -> bottom) of tile rows
-            col_list     list (left -> right) of tile columns
+        layer  the layer object to render
 
-        Note that (x_pix_start, y_pix_start) will typically be OUTSIDE the view
-        if the view is smaller than the map.
-        """
+        If ViewLayerCache is True the bitmap is kept in the layer and only
+        rendered again after a change of view size or layer data.
 
-        # figure out how to draw tiles
-        if self.view_offset_x < 0:
-            # View > Map in X - centre in X direction
-            col_list = range(self.tile_src.num_tiles_x)
-            x_pix_start = -self.view_offset_x
-        else:
-            # Map > View - determine layout in X direction
-            start_x_tile = int(self.view_offset_x / self.tile_size_x)
-            stop_x_tile = int((self.view_offset_x + self.view_width
-                               + self.tile_size_x - 1) / self.tile_size_x)
-            stop_x_tile = min(self.tile_src.num_tiles_x-1, stop_x_tile) + 1
-            col_list = range(start_x_tile, stop_x_tile)
-            x_pix_start = start_x_tile * self.tile_size_y - self.view_offset_x
+        Returns the bitmap.
+        """
 
-        if self.view_offset_y < 0:
-            # View > Map in Y - centre in Y direction
-            row_list = range(self.tile_src.num_tiles_y)
-            y_pix_start = -self.view_offset_y
-        else:
-            # Map > View - determine layout in Y direction
-            start_y_tile = int(self.view_offset_y / self.tile_size_y)
-            stop_y_tile = int((self.view_offset_y + self.view_height
-                               + self.tile_size_y - 1) / self.tile_size_y)
-            stop_y_tile = min(self.tile_src.num_tiles_y-1, stop_y_tile) + 1
-            row_list = range(start_y_tile, stop_y_tile)
-            y_pix_start = start_y_tile * self.tile_size_y - self.view_offset_y
+        size = (self.view_width, self.view_height)
+        if (self.ViewLayerCache and layer.view_cache
+                and layer.view_cache.GetSize() == size):
+            return layer.view_cache
 
-        # start pasting tiles onto the view
-        # use x_pix and y_pix to place tiles
-        x_pix = x_pix_start
-        for x in col_list:
-            y_pix = y_pix_start
-            for y in row_list:
-                tile = self.tile_src.GetTile(x, y)
-                dc.DrawBitmap(tile, x_pix, y_pix, False)
-                y_pix += self.tile_size_y
-            x_pix += self.tile_size_x
+        # the bitmap may be kept, so always draw it at full quality
+        drafting = self.drafting
+        self.drafting = False
+        bmp = wx.EmptyBitmapRGBA(self.view_width, self.view_height, 0, 0, 0, 0)
+        dc = wx.MemoryDC(bmp)
+        try:
+            self._paint_layer(dc, layer)
+        finally:
+            self.drafting = drafting
+        dc.SelectObject(wx.NullBitmap)
 
-        # draw layers
-        for id in self.layer_z_order:
-            l = self.layer_mapping[id]
-            if l.visible and self.level in l.show_levels:
-                l.painter(dc, l.data, map_rel=l.map_rel)
+        if self.ViewLayerCache:
+            layer.view_cache = bmp
 
-        # draw selection rectangle, if any
-        if self.sbox_1_x:
-            penclr = wx.Colour(0, 0, 255)
-            pen = wx.Pen(penclr, 1, wx.USER_DASH)
-            pen.SetDashes([1, 1, 1, 1])
-            dc.SetPen(pen)
-            brushclr = wx.Colour(255, 255, 255)
-            dc.SetBrush(wx.Brush(brushclr, style=wx.TRANSPARENT))
-            dc.DrawRectangle(self.sbox_1_x, self.sbox_1_y,
-                             self.sbox_w, self.sbox_h)
+        return bmp
 
 ######
 # Miscellaneous
@@ -2198,6 +4837,27 @@ class PySlip(_BufferedCanvas):
 
         return self.tile_src.Tile2Geo((xtile, ytile))
 
+    def View2GeoArray(self, xview, yview):
+        """Convert arrays of view coords to geo coords.
+
+        xview, yview  numpy arrays of view coordinates
+
+        Returns a tuple of numpy arrays (xgeo, ygeo).  Needs numpy.
+        """
+
+        xtile = (np.asarray(xview, dtype=np.float64)
+                 + self.view_offset_x) / self.tile_size_x
+        ytile = (np.asarray(yview, dtype=np.float64)
+                 + self.view_offset_y) / self.tile_size_y
+
+        tile2geo = getattr(self.tile_src, 'Tile2GeoArray', None)
+        if tile2geo:
+            return tile2geo(xtile, ytile)
+
+        geos = [self.tile_src.Tile2Geo(tile) for tile in zip(xtile, ytile)]
+        geos = np.array(geos, dtype=np.float64).reshape(-1, 2)
+        return (geos[:,0], geos[:,1])
+
     def ResizeCallback(self, event=None):
         """Handle a window resize.
 
@@ -2290,10 +4950,6 @@ class PySlip(_BufferedCanvas):
         selection point, which is meaningless for point selection.
         """
 
-        # TODO: speed this up?  Do we need to??
-        # http://en.wikipedia.org/wiki/Kd-tree
-        # would need to create kd-tree in AddLayer()
-
         result = None
         delta = layer.delta
         dist = 9999999.0        # more than possible
@@ -2305,9 +4961,13 @@ class PySlip(_BufferedCanvas):
             pex = self.PexPoint
             clickpt = self.Geo2View(pt)
 
-        # get selected point on map/view
+        # get selected point on map/view, only looking at points near click
         (xclick, yclick) = clickpt
-        for (x, y, place, radius, colour, x_off, y_off, udata) in layer.data:
+        near = math.sqrt(delta)
+        candidates = self._view_candidates(layer, xclick - near, xclick + near,
+                                           yclick - near, yclick + near)
+        for (x, y, place, style, x_off, y_off, udata) in candidates:
+            (radius, colour) = self.style_pool[style]
             (vp, _) = pex(place, (x,y), x_off, y_off, radius)
             if vp:
                 (vx, vy) = vp
@@ -2321,7 +4981,7 @@ class PySlip(_BufferedCanvas):
                     result = ([rpt], udata, None)
                     dist = d
 
-        if dist <= layer.delta:
+        if dist <= delta:
             return result
         return None
 
@@ -2352,8 +5012,10 @@ class PySlip(_BufferedCanvas):
             (blx, bby) = self.Geo2View(ll)
             (brx, bty) = self.Geo2View(ur)
 
-        # get points selection
-        for (x, y, place, radius, colour, x_off, y_off, udata) in layer.data:
+        # get points selection, only looking at points near the box
+        candidates = self._view_candidates(layer, blx, brx, bty, bby)
+        for (x, y, place, style, x_off, y_off, udata) in candidates:
+            (radius, colour) = self.style_pool[style]
             (vp, _) = pex(place, (x,y), x_off, y_off, radius)
             if vp:
                 (vpx, vpy) = vp
@@ -2396,11 +5058,14 @@ class PySlip(_BufferedCanvas):
             pex = self.PexExtent
         (xclick, yclick) = clickpt
 
-        # select image
+        # select image, only looking at images near click
+        candidates = self._view_candidates(layer, xclick, xclick,
+                                           yclick, yclick)
         for (x, y, bmp, w, h, place,
-                x_off, y_off, radius, colour, udata) in layer.data:
+                x_off, y_off, style, udata) in candidates:
             (_, e) = pex(place, (x,y), x_off, y_off, w, h)
             if e:
+                (radius, colour) = self.style_pool[style]
                 (lx, rx, ty, by) = e
                 if lx <= xclick <= rx and ty <= yclick <= by:
                     selection = [(x, y, bmp, {'placement': place,
@@ -2437,13 +5102,16 @@ class PySlip(_BufferedCanvas):
         (vboxlx, vboxby) = ll
         (vboxrx, vboxty) = ur
 
-        # select images in map/view
+        # select images in map/view, only looking at images near the box
         selection = []
         data = []
+        candidates = self._view_candidates(layer, vboxlx, vboxrx,
+                                           vboxty, vboxby)
         for (x, y, bmp, w, h, place,
-                x_off, y_off, radius, colour, udata) in layer.data:
+                x_off, y_off, style, udata) in candidates:
             (_, e) = pex(place, (x,y), x_off, y_off, w, h)
             if e:
+                (radius, colour) = self.style_pool[style]
                 (li, ri, ti, bi) = e    # image extents (view coords)
                 if (vboxlx <= li and ri <= vboxrx
                         and vboxty <= ti and bi <= vboxby):
@@ -2483,9 +5151,12 @@ class PySlip(_BufferedCanvas):
             clickpt = self.Geo2View(point)
         (xclick, yclick) = clickpt
 
-        # select text in map/view layer
-        for (x, y, text, place, radius, colour,
-                 tcolour, fname, fsize, x_off, y_off, data) in layer.data:
+        # select text in map/view layer, only looking at texts near click
+        near = math.sqrt(delta)
+        candidates = self._view_candidates(layer, xclick - near, xclick + near,
+                                           yclick - near, yclick + near)
+        for (x, y, text, place, style, x_off, y_off, _, _, data) in candidates:
+            (radius, colour, tcolour, fname, fsize) = self.style_pool[style]
             (vp, ex) = pex(place, (x,y), 0, 0, radius)
             if vp:
                 (px, py) = vp
@@ -2537,9 +5208,10 @@ class PySlip(_BufferedCanvas):
         (lx, by) = ll
         (rx, ty) = ur
 
-        # get texts inside box
-        for (x, y, text, place, radius, colour,
-                tcolour, fname, fsize, x_off, y_off, udata) in layer.data:
+        # get texts inside box, only looking at texts near the box
+        candidates = self._view_candidates(layer, lx, rx, ty, by)
+        for (x, y, text, place, style, x_off, y_off, _, _, udata) in candidates:
+            (radius, colour, tcolour, fname, fsize) = self.style_pool[style]
             (vp, ex) = pex(place, (x,y), x_off, y_off, radius)
             if vp:
                 (px, py) = vp
@@ -2569,24 +5241,87 @@ class PySlip(_BufferedCanvas):
         Returns None if no polygon selected.
         """
 
-        result = None
+        for i in self._polygon_hits(layer, point):
+            (poly, place, style, x_off, y_off, udata) = layer.data[i]
+            sel = (poly, {'placement': place,
+                          'offset_x': x_off,
+                          'offset_y': y_off})
+            return ([sel], udata, None)
 
-        # get correct 'point in polygon' routine
-        pip = self.point_in_polygon_view
-        if layer.map_rel:
-            pip = self.point_in_polygon_geo
-
-        # check polyons in layer, choose first point is inside
-        for (poly, place, width, colour, close,
-                 filled, fcolour, x_off, y_off, udata) in layer.data:
-            if pip(poly, point, place, x_off, y_off):
-                sel = (poly, {'placement': place,
-                              'offset_x': x_off,
-                              'offset_y': y_off})
-                result = ([sel], udata, None)
-                break
+        return None
 
-        return result
+    def GetPolygonsInLayer(self, layer, point):
+        """Get all polygon objects clicked in layer data.
+
+        layer  layer object we are looking in
+        point  tuple of click position (xgeo,ygeo) or (xview,yview)
+
+        Returns a tuple (selection, data, None) where 'selection' is a list
+        of (poly, attrib) tuples and 'data' is a list of the userdata of the
+        selected polygons.  The polygons are ordered topmost first, that is
+        in the reverse of their draw order.  Returns None if no polygon
+        selected.
+        """
+
+        selection = []
+        data = []
+        for i in reversed(self._polygon_hits(layer, point)):
+            (poly, place, style, x_off, y_off, udata) = layer.data[i]
+            selection.append((poly, {'placement': place,
+                                     'offset_x': x_off,
+                                     'offset_y': y_off}))
+            data.append(udata)
+
+        if not selection:
+            return None
+        return (selection, data, None)
+
+    def _polygon_hits(self, layer, point):
+        """Find the polygons of a layer containing a point.
+
+        layer  the polygon layer object
+        point  tuple of click position (xgeo,ygeo) or (xview,yview)
+
+        Map-relative candidates come from the layer spatial index.  With
+        numpy each candidate is tested in one pass over its vertex arrays,
+        view-relative polygons by moving the click point rather than every
+        vertex.
+
+        Returns a list of indices into layer.data, in draw order.
+        """
+
+        if layer.map_rel:
+            (x, y) = point
+            candidates = self._layer_index(layer).query(x, x, y, y)
+        else:
+            candidates = range(len(layer.data))
+
+        if geometry is None:
+            pip = self.point_in_polygon_view
+            if layer.map_rel:
+                pip = self.point_in_polygon_geo
+            hits = []
+            for i in candidates:
+                (poly, place, _, x_off, y_off, _) = layer.data[i]
+                if pip(poly, point, place, x_off, y_off):
+                    hits.append(i)
+            return hits
+
+        cols = self._shape_columns(layer)
+        hits = []
+        (xclick, yclick) = point
+        for i in candidates:
+            (x, y) = (xclick, yclick)
+            if not layer.map_rel:
+                (_, place, _, x_off, y_off, _) = layer.data[i]
+                (dx, dy) = self.point_placement(place, 0, 0, x_off, y_off,
+                                                self.view_width,
+                                                self.view_height)
+                (x, y) = (x - dx, y - dy)
+            if geometry.point_in_polygon(x, y, cols['x'][i], cols['y'][i]):
+                hits.append(i)
+
+        return hits
 
     def GetBoxSelPolygonsInLayer(self, layer, p1, p2):
         """Get list of polygons inside box p1-p2 in given layer.
@@ -2613,8 +5348,7 @@ class PySlip(_BufferedCanvas):
         (rx, ty) = p2
 
         # check polygons in layer
-        for (poly, place, width, colour, close,
-                filled, fcolour, x_off, y_off, udata) in layer.data:
+        for (poly, place, style, x_off, y_off, udata) in layer.data:
             (pt, ex) = pex(place, poly, x_off, y_off)
             if ex:
                 (plx, prx, pty, pby) = ex
@@ -2644,13 +5378,25 @@ class PySlip(_BufferedCanvas):
         result = None
         delta = layer.delta
 
+        if geometry is not None:
+            hit = self._polyline_hit(layer, point)
+            if hit:
+                (i, v) = hit
+                (polyline, place, style, x_off, y_off, udata) = layer.data[i]
+                sel = (polyline, {'placement': place,
+                                  'offset_x': x_off,
+                                  'offset_y': y_off})
+                seg = (tuple(polyline[v]), tuple(polyline[v+1]))
+                result = ([sel], udata, seg)
+            return result
+
         # get correct 'point in polyline' routine
         pip = self.point_near_polyline_view
         if layer.map_rel:
             pip = self.point_near_polyline_geo
 
         # check polyons in layer, choose first where point is close enough
-        for (polyline, place, width, colour, x_off, y_off, udata) in layer.data:
+        for (polyline, place, style, x_off, y_off, udata) in layer.data:
             seg = pip(point, polyline, place, x_off, y_off, delta=delta)
             if seg:
                 sel = (polyline, {'placement': place,
@@ -2661,6 +5407,117 @@ class PySlip(_BufferedCanvas):
 
         return result
 
+    def _polyline_hit(self, layer, point):
+        """Find the first polyline of a layer near a point, using numpy.
+
+        layer  the polyline layer object
+        point  tuple of click position (xgeo,ygeo) or (xview,yview)
+
+        Map-relative segments near the point come from the layer segment
+        index and their distances are computed in one pass.  View-relative
+        polylines are done one pass per polyline, moving the click point by
+        the placement rather than every vertex.
+
+        Returns a tuple (i, v) where layer.data[i] is the first polyline
+        with a segment within layer.delta (distance squared) and v is the
+        index of the first vertex of its nearest segment, or None.
+        """
+
+        delta = layer.delta
+        (xclick, yclick) = point
+
+        if layer.map_rel:
+            segs = self._segment_columns(layer)
+            near = math.sqrt(delta)
+            ids = segs['index'].query(xclick - near, xclick + near,
+                                      yclick - near, yclick + near)
+            if not ids:
+                return None
+            ids = np.array(ids, dtype=np.int64)
+            dist = geometry.point_segment_distances(xclick, yclick,
+                                                    segs['x1'][ids],
+                                                    segs['y1'][ids],
+                                                    segs['x2'][ids],
+                                                    segs['y2'][ids])
+            close = ids[dist <= delta]
+            if not len(close):
+                return None
+
+            # nearest segment of the first polyline with a close segment
+            owner = segs['owner'][close].min()
+            mine = segs['owner'][ids] == owner
+            best = ids[mine][np.argmin(dist[mine])]
+            return (int(owner), int(segs['vertex'][best]))
+
+        cols = self._shape_columns(layer)
+        for (i, (_, place, _, x_off, y_off, _)) in enumerate(layer.data):
+            (dx, dy) = self.point_placement(place, 0, 0, x_off, y_off,
+                                            self.view_width, self.view_height)
+            xs = cols['x'][i]
+            ys = cols['y'][i]
+            dist = geometry.point_segment_distances(xclick - dx, yclick - dy,
+                                                    xs[:-1], ys[:-1],
+                                                    xs[1:], ys[1:])
+            if len(dist):
+                v = int(np.argmin(dist))
+                if dist[v] <= delta:
+                    return (i, v)
+
+        return None
+
+    def _segment_columns(self, layer):
+        """Get the segments of a polyline layer as numpy arrays.
+
+        layer  the polyline layer object
+
+        Returns a dictionary of arrays, one element per segment: endpoints
+        'x1', 'y1', 'x2', 'y2', the polyline index 'owner' and the segment
+        first vertex index 'vertex'.  'index' is a spatial index of the
+        segment bounding boxes.  Kept until the layer data changes.
+        """
+
+        cols = self._shape_columns(layer)
+        if 'segments' not in cols and isinstance(layer.data, _ShapeColumns):
+            # every vertex but the last of each polyline starts a segment
+            data = layer.data
+            lengths = data.ends - data.starts
+            owner = np.repeat(np.arange(len(data)), lengths)
+            vertex = (np.arange(len(data.vertices))
+                      - np.repeat(data.starts, lengths))
+            first = np.nonzero(vertex < np.repeat(lengths - 1, lengths))[0]
+            (xs, ys) = (data.vertices[:,0], data.vertices[:,1])
+            segs = {'x1': xs[first], 'y1': ys[first],
+                    'x2': xs[first+1], 'y2': ys[first+1],
+                    'owner': owner[first].astype(np.int64),
+                    'vertex': vertex[first].astype(np.int64)}
+        elif 'segments' not in cols:
+            empty = np.zeros(0)
+            (x1, y1, x2, y2) = ([empty], [empty], [empty], [empty])
+            (owner, vertex) = ([empty], [empty])
+            for (i, (xs, ys)) in enumerate(zip(cols['x'], cols['y'])):
+                num = max(len(xs) - 1, 0)
+                x1.append(xs[:-1])
+                y1.append(ys[:-1])
+                x2.append(xs[1:])
+                y2.append(ys[1:])
+                owner.append(np.repeat(i, num))
+                vertex.append(np.arange(num))
+
+            segs = {'x1': np.concatenate(x1), 'y1': np.concatenate(y1),
+                    'x2': np.concatenate(x2), 'y2': np.concatenate(y2),
+                    'owner': np.concatenate(owner).astype(np.int64),
+                    'vertex': np.concatenate(vertex).astype(np.int64)}
+
+        if 'segments' not in cols:
+            bboxes = zip(np.minimum(segs['x1'], segs['x2']),
+                         np.maximum(segs['x1'], segs['x2']),
+                         np.minimum(segs['y1'], segs['y2']),
+                         np.maximum(segs['y1'], segs['y2']))
+            segs['index'] = spatial_index.GridIndex(bboxes)
+            cols['segments'] = segs
+
+        return cols['segments']
+
     def GetBoxSelPolylinesInLayer(self, layer, p1, p2):
         """Get list of polylines inside box p1-p2 in given layer.
 
@@ -2688,7 +5545,7 @@ class PySlip(_BufferedCanvas):
         (rx, ty) = p2
 
         # check polygons in layer
-        for (poly, place, width, colour, x_off, y_off, udata) in layer.data:
+        for (poly, place, style, x_off, y_off, udata) in layer.data:
             (pt, ex) = pex(place, poly, x_off, y_off)
             if ex:
                 (plx, prx, pty, pby) = ex
@@ -2729,7 +5586,7 @@ class PySlip(_BufferedCanvas):
         self.ResizeCallback()
 
         # redraw the map
-        self.Update()
+        self.ScheduleUpdate()
 
     def ZoomOut(self, gposn):
         """Zoom map out to the previous level.
@@ -2746,7 +5603,7 @@ class PySlip(_BufferedCanvas):
         self.ResizeCallback()
 
         # redraw the map
-        self.Update()
+        self.ScheduleUpdate()
 
 ######
 # Routines for pySlip events
@@ -2779,6 +5636,30 @@ class PySlip(_BufferedCanvas):
 
         self.mouse_position_event = event
 
+    def SetHoverEvent(self, event):
+        """Set hover events on or off.
+
+        event  True if event is to be raised when the object under the mouse
+               changes
+
+        Hover testing is done on selectable layers, at most .max_fps times
+        per second.
+        """
+
+        self.hover_event = event
+        self.hover_hit = None
+
+    def SetMousePositionRate(self, rate):
+        """Limit the rate of mouse position events.
+
+        rate  maximum number of position events per second, None if no limit
+
+        Mouse moves between events are not reported, but the final position
+        always is.
+        """
+
+        self.position_rate = rate
+
     def RaiseEventPosition(self, mposn, vposn):
         """Raise a mouse position event.
 
@@ -2906,6 +5787,35 @@ class PySlip(_BufferedCanvas):
 
         self.GetEventHandler().ProcessEvent(event)
 
+    def RaiseEventHover(self, mposn, vposn, layer=None, selection=None):
+        """Raise a HOVER event.
+
+        mposn      map coordinates of the mouse
+        vposn      view coordinates of the mouse
+        layer      layer of the object under the mouse, or None
+        selection  None if no object under the mouse or a tuple
+                   (point, data, relsel) as for a SELECT event
+
+        Raised when the object under the mouse changes, including to no
+        object.  In that case event.layer_id, .selection and .data are None.
+        """
+
+        event = _PySlipEvent(_myEVT_PYSLIP_HOVER, self.GetId())
+
+        event.type = EventHover
+        event.mposn = mposn
+        event.vposn = vposn
+        event.layer_id = None
+        event.selection = None
+        event.data = None
+        event.relsel = None
+        if layer:
+            event.layer_id = layer.id
+        if selection:
+            (event.selection, event.data, event.relsel) = selection
+
+        self.GetEventHandler().ProcessEvent(event)
+
 ######
 # Various pySlip utility routines
 ######
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A simple spatial index for pySlip layer objects.
+
+The index is a uniform grid of cells over the bounding boxes of the indexed
+items.  Each cell holds the IDs of the items whose bounding box overlaps the
+cell.  Items covering very many cells are kept in a separate list that is
+checked on every query.  Items may be moved after the index is built, the
+grid cell size is not changed.
+
+A bounding box is a tuple (minx, maxx, miny, maxy).
+"""
+
+import math
+
+
+class GridIndex(object):
+    """A uniform grid index over item bounding boxes."""
+
+    # average number of items per grid cell
+    ItemsPerCell = 8
+
+    # items covering more cells than this are not put into cells
+    MaxCellsPerItem = 64
+
+    def __init__(self, bboxes):
+        """Build the index.
+
+        bboxes  sequence of bounding boxes (minx, maxx, miny, maxy)
+
+        The ID of an item is the index of its bounding box in 'bboxes'.
+        """
+
+        self.bboxes = list(bboxes)
+        self.cells = {}         # maps (col, row) to list of item IDs
+        self.big = set()        # IDs of items in too many cells
+
+        if not self.bboxes:
+            (self.minx, self.maxx, self.miny, self.maxy) = (0.0, -1.0, 0.0, -1.0)
+            (self.origin_x, self.origin_y) = (0.0, 0.0)
+            (self.cell_w, self.cell_h) = (1.0, 1.0)
+            return
+
+        # grid covers the extent of all items
+        self.minx = min([b[0] for b in self.bboxes])
+        self.maxx = max([b[1] for b in self.bboxes])
+        self.miny = min([b[2] for b in self.bboxes])
+        self.maxy = max([b[3] for b in self.bboxes])
+
+        # roughly square cells, ItemsPerCell items per cell
+        width = max(self.maxx - self.minx, 1.0e-9)
+        height = max(self.maxy - self.miny, 1.0e-9)
+        num_cells = max(1.0, float(len(self.bboxes)) / self.ItemsPerCell)
+        side = math.sqrt(width * height / num_cells)
+        self.cell_w = max(side, width / num_cells)
+        self.cell_h = max(side, height / num_cells)
+        (self.origin_x, self.origin_y) = (self.minx, self.miny)
+
+        for (item, bbox) in enumerate(self.bboxes):
+            self._add(item, bbox)
+
+    def _cell_range(self, minx, maxx, miny, maxy):
+        """Get the cell column and row ranges covering a bounding box.
+
+        Returns a tuple (col_range, row_range).
+        """
+
+        first_col = int(math.floor((minx - self.origin_x) / self.cell_w))
+        last_col = int(math.floor((maxx - self.origin_x) / self.cell_w))
+        first_row = int(math.floor((miny - self.origin_y) / self.cell_h))
+        last_row = int(math.floor((maxy - self.origin_y) / self.cell_h))
+
+        return (range(first_col, last_col+1), range(first_row, last_row+1))
+
+    def _add(self, item, bbox):
+        """Put an item into the cells its bounding box overlaps."""
+
+        (cols, rows) = self._cell_range(*bbox)
+        if len(cols) * len(rows) > self.MaxCellsPerItem:
+            self.big.add(item)
+            return
+
+        for col in cols:
+            for row in rows:
+                self.cells.setdefault((col, row), []).append(item)
+
+    def _remove(self, item, bbox):
+        """Take an item out of the cells its bounding box overlaps."""
+
+        if item in self.big:
+            self.big.remove(item)
+            return
+
+        (cols, rows) = self._cell_range(*bbox)
+        for col in cols:
+            for row in rows:
+                items = self.cells[(col, row)]
+                items.remove(item)
+                if not items:
+                    del self.cells[(col, row)]
+
+    def update(self, item, bbox):
+        """Change the bounding box of an item.
+
+        item  ID of the item to move
+        bbox  the new bounding box (minx, maxx, miny, maxy)
+        """
+
+        self._remove(item, self.bboxes[item])
+        self.bboxes[item] = bbox
+        self._add(item, bbox)
+
+        # the grid grows to cover the moved item
+        (minx, maxx, miny, maxy) = bbox
+        self.minx = min(self.minx, minx)
+        self.maxx = max(self.maxx, maxx)
+        self.miny = min(self.miny, miny)
+        self.maxy = max(self.maxy, maxy)
+
+    def query(self, minx, maxx, miny, maxy):
+        """Find the items whose bounding box overlaps a box.
+
+        minx, maxx, miny, maxy  limits of the query box
+
+        Returns a sorted list of item IDs.
+        """
+
+        # only look at cells inside the grid
+        minx = max(minx, self.minx)
+        maxx = min(maxx, self.maxx)
+        miny = max(miny, self.miny)
+        maxy = min(maxy, self.maxy)
+        if minx > maxx or miny > maxy:
+            return []
+
+        candidates = set(self.big)
+        (cols, rows) = self._cell_range(minx, maxx, miny, maxy)
+        if len(cols) * len(rows) > len(self.cells):
+            # query box covers most of the grid, look at all cells
+            for items in self.cells.values():
+                candidates.update(items)
+        else:
+            for col in cols:
+                for row in rows:
+                    items = self.cells.get((col, row), None)
+                    if items:
+                        candidates.update(items)
+
+        result = []
+        for item in candidates:
+            (bminx, bmaxx, bminy, bmaxy) = self.bboxes[item]
+            if bminx <= maxx and minx <= bmaxx and bminy <= maxy and miny <= bmaxy:
+                result.append(item)
+        result.sort()
+
+        return result
+
+    def __len__(self):
+        return len(self.bboxes)
@@ -23,6 +23,11 @@ import traceback
 import urllib2
 import Queue
 import wx
+try:
+    import numpy as np
+except ImportError:
+    # numpy is only needed for the array conversions
+    np = None
 
 import pycacheback
 import sys_tile_data as std
@@ -554,3 +559,39 @@ class BaseTiles(object):
         """
 
         raise Exception('You must override Tiles.Tile2Geo()')
+
+    def Geo2TileArray(self, xgeo, ygeo):
+        """Convert arrays of geo to tile fractional coordinates for level in use.
+
+        xgeo  numpy array of geo X coordinates
+        ygeo  numpy array of geo Y coordinates
+
+        Returns a tuple of numpy arrays (xtile, ytile).  Converts point by
+        point with Geo2Tile(), tile sources should override this with a
+        vectorized version.
+        """
+
+        tiles = [self.Geo2Tile(geo)
+                 for geo in zip(np.asarray(xgeo).tolist(),
+                                np.asarray(ygeo).tolist())]
+        tiles = np.array(tiles, dtype=np.float64).reshape(-1, 2)
+
+        return (tiles[:,0], tiles[:,1])
+
+    def Tile2GeoArray(self, xtile, ytile):
+        """Convert arrays of tile fractional coordinates to geo for level in use.
+
+        xtile  numpy array of tile fractional X coordinates
+        ytile  numpy array of tile fractional Y coordinates
+
+        Returns a tuple of numpy arrays (xgeo, ygeo).  Converts point by
+        point with Tile2Geo(), tile sources should override this with a
+        vectorized version.
+        """
+
+        geos = [self.Tile2Geo(tile)
+                for tile in zip(np.asarray(xtile).tolist(),
+                                np.asarray(ytile).tolist())]
+        geos = np.array(geos, dtype=np.float64).reshape(-1, 2)
+
+        return (geos[:,0], geos[:,1])